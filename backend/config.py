@@ -6,3 +6,96 @@ load_dotenv()
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY", SUPABASE_KEY) # Fallback to KEY if not set, though unlikely to work for admin
+
+# In-memory Supabase stand-in for load tests and local runs (nothing is persisted)
+SUPABASE_FAKE = os.getenv("SUPABASE_FAKE", "false").lower() in ("1", "true", "yes")
+SUPABASE_FAKE_LATENCY_MS = float(os.getenv("SUPABASE_FAKE_LATENCY_MS", "0"))  # simulated round trip per call
+
+# JD similarity: document-frequency (IDF) weighting over hashed features
+IDF_SCOPE = os.getenv("IDF_SCOPE", "hr")  # "hr" (per HR) or "global"
+IDF_MIN_DOCS = int(os.getenv("IDF_MIN_DOCS", "10"))
+IDF_SEED_LIMIT = int(os.getenv("IDF_SEED_LIMIT", "2000"))
+
+# Local store for persisted resume feature vectors
+VECTOR_STORE_DIR = os.getenv("VECTOR_STORE_DIR", "vector_store")
+
+# Scoring weights (final_score = skills * W_SKILLS + jd * W_JD + experience * W_EXPERIENCE)
+SCORE_WEIGHT_SKILLS = float(os.getenv("SCORE_WEIGHT_SKILLS", "0.4"))
+SCORE_WEIGHT_JD = float(os.getenv("SCORE_WEIGHT_JD", "0.4"))
+SCORE_WEIGHT_EXPERIENCE = float(os.getenv("SCORE_WEIGHT_EXPERIENCE", "0.2"))
+
+# Optional LSA semantic similarity (0 = off); share of the JD score taken from it
+SEMANTIC_MODEL_PATH = os.getenv("SEMANTIC_MODEL_PATH", "")
+SEMANTIC_BLEND = float(os.getenv("SEMANTIC_BLEND", "0"))
+
+# Dashboard response cache
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "2000"))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+DATA_VERSION_TTL = float(os.getenv("DATA_VERSION_TTL", "5"))  # seconds between shared version checks
+
+# Bulk ZIP exports: storage downloads kept in flight while streaming
+EXPORT_PREFETCH_WINDOW = int(os.getenv("EXPORT_PREFETCH_WINDOW", "8"))
+
+# On-disk LRU cache for downloaded storage objects (0 disables)
+BLOB_CACHE_DIR = os.getenv("BLOB_CACHE_DIR", "blob_cache")
+BLOB_CACHE_MAX_BYTES = int(os.getenv("BLOB_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+
+# Signed resume download links (issued on read, cached per process)
+SIGNED_URL_TTL = int(os.getenv("SIGNED_URL_TTL", str(24 * 3600)))
+
+# Resume object storage: "supabase" (bucket) or "local" (files served by /files)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "supabase").lower()
+LOCAL_STORAGE_DIR = os.getenv("LOCAL_STORAGE_DIR", "local_storage")
+STORAGE_SIGNING_KEY = os.getenv("STORAGE_SIGNING_KEY", "")  # HMAC key for local file links
+
+# Thread pool for blocking Supabase/Storage calls made from async routes
+IO_POOL_SIZE = int(os.getenv("IO_POOL_SIZE", "32"))
+LOOP_LAG_INTERVAL = float(os.getenv("LOOP_LAG_INTERVAL", "0.1"))  # seconds between event-loop lag probes
+
+# Auth user directory cache (seconds); unknown emails are cached more briefly
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "300"))
+USER_NEGATIVE_TTL = float(os.getenv("USER_NEGATIVE_TTL", "30"))
+
+# SMTP delivery (OTP + candidate notifications)
+SMTP_HOST = os.getenv("SMTP_HOST", "smtp-relay.brevo.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "true").lower() in ("1", "true", "yes")
+SMTP_USERNAME = os.getenv("SMTP_USERNAME")
+SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
+SENDER_EMAIL = os.getenv("SENDER_EMAIL")
+SENDER_NAME = os.getenv("SENDER_NAME", "HireLens AI")
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", "2"))  # persistent connections / sender threads
+SMTP_BATCH_SIZE = int(os.getenv("SMTP_BATCH_SIZE", "50"))  # messages per connection checkout
+SMTP_RATE_LIMIT = float(os.getenv("SMTP_RATE_LIMIT", "5"))  # messages per second, 0 = unlimited
+SMTP_MAX_RETRIES = int(os.getenv("SMTP_MAX_RETRIES", "3"))
+
+# Frontend pages are preloaded into memory; set true in development to reload edited files
+STATIC_PAGES_WATCH = os.getenv("STATIC_PAGES_WATCH", "false").lower() in ("1", "true", "yes")
+
+# Load the NLP/extraction libraries in a background thread once the app is up
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "true").lower() in ("1", "true", "yes")
+
+# Pre-fork production server (python -m backend.server)
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", "8000"))
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", str(os.cpu_count() or 1)))  # worker processes
+WORKER_MAX_REQUESTS = int(os.getenv("WORKER_MAX_REQUESTS", "1000"))  # recycle a worker after this many, 0 = never
+WORKER_MAX_REQUESTS_JITTER = int(os.getenv("WORKER_MAX_REQUESTS_JITTER", "100"))
+GRACEFUL_TIMEOUT = float(os.getenv("GRACEFUL_TIMEOUT", "30"))  # seconds for in-flight requests on shutdown/recycle
+
+# Prometheus metrics (/metrics): seconds between per-worker snapshots under the pre-fork server
+METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", "5"))
+METRICS_DIR = os.getenv("METRICS_DIR", "")  # default: a fresh temp dir per server start
+
+# On-demand request profiling (/debug/profiling); the debug routes are disabled unless DEBUG_TOKEN is set
+DEBUG_TOKEN = os.getenv("DEBUG_TOKEN", "")
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "50"))
+PROFILER_INTERVAL_MS = float(os.getenv("PROFILER_INTERVAL_MS", "10"))
+
+# Trace spans for requests and pipeline stages: TRACE_EXPORT is "jsonl", "otlp" or empty (off)
+TRACE_EXPORT = os.getenv("TRACE_EXPORT", "").lower()
+TRACE_FILE = os.getenv("TRACE_FILE", "traces.jsonl")
+TRACE_OTLP_ENDPOINT = os.getenv("TRACE_OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "1.0"))  # fraction of requests traced
+TRACE_SERVICE_NAME = os.getenv("TRACE_SERVICE_NAME", "hirelens")
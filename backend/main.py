@@ -1,15 +1,44 @@
+import time
+_IMPORT_STARTED = time.perf_counter()
+
 from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
+from contextlib import asynccontextmanager
 from pathlib import Path
 import os
 import logging
 
+from backend.config import STATIC_PAGES_WATCH, WARMUP_ON_STARTUP
+from backend.utils.async_io import loop_lag, io_pool_stats, run_io
+from backend.utils import metrics, tracing
+from backend.utils.profiler import ProfilerMiddleware
+from backend.utils.static_pages import StaticPages
+from backend.utils.notification_queue import notifications
+from backend.utils.storage_backends import get_storage
+from backend.utils.warmup import record, start_background_warmup, startup_report, warm_up
+
 # -------------------------------
 # App Initialization
 # -------------------------------
-app = FastAPI(title="HireLens Resume Screener")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    pages.load()
+    get_storage()  # fails fast on a misconfigured storage backend
+    loop_lag.start()
+    record("ready", _IMPORT_STARTED)
+    if WARMUP_ON_STARTUP:
+        start_background_warmup()
+    metrics.start_flusher()
+    yield
+    await loop_lag.stop()
+    # Releases the claims of unsent status emails, so the next call sends them
+    notifications.abandon()
+    metrics.flush()
+    tracing.flush()
+
+app = FastAPI(title="HireLens Resume Screener", lifespan=lifespan)
 
 # -------------------------------
 # CORS (Required for frontend ↔ backend)
@@ -24,6 +53,9 @@ if allowed_origins_env:
 if not allowed_origins:
     allowed_origins = ["*"]
 app.add_middleware(CORSMiddleware, allow_origins=allowed_origins, allow_credentials=True, allow_methods=["*"], allow_headers=["*"])
+app.add_middleware(metrics.MetricsMiddleware)
+app.add_middleware(ProfilerMiddleware)
+app.add_middleware(tracing.TracingMiddleware)  # outermost: the root span covers the whole request
 
 # -------------------------------
 # Base & Frontend Directory
@@ -35,7 +67,9 @@ FRONTEND_DIR = BASE_DIR / "frontend"
 # Static Files
 # -------------------------------
 # Logging
-logging.basicConfig(level=logging.INFO)
+logging.basicConfig(level=logging.INFO, format="%(levelname)s:%(name)s:[%(trace_id)s] %(message)s")
+for _handler in logging.getLogger().handlers:
+    _handler.addFilter(tracing.TraceIdFilter())
 logger = logging.getLogger("hirelens")
 
 # Static mounts: support case-sensitive deployments and absolute paths
@@ -64,73 +98,69 @@ if scripts_path.exists():
     app.mount("/scripts", StaticFiles(directory=scripts_path), name="scripts")
 
 # -------------------------------
-# HTML Loader Helper
+# HTML Pages (served from memory)
 # -------------------------------
-def load_html(filename: str):
-    path = FRONTEND_DIR / filename
-    if path.exists():
-        return HTMLResponse(path.read_text(encoding="utf-8"))
-    return HTMLResponse("<h2>Page not found</h2>", status_code=404)
+pages = StaticPages(FRONTEND_DIR, watch=STATIC_PAGES_WATCH)
+
+def load_html(request: Request, filename: str):
+    return pages.response(request, filename)
 
 # -------------------------------
-# HTML Routes
+# HTML Routes (no I/O, answered on the event loop)
 # -------------------------------
 @app.get("/")
-def home():
-    return load_html("index.html")
+async def home(request: Request):
+    return load_html(request, "index.html")
 
 @app.get("/login")
-def login():
-    return load_html("login.html")
+async def login(request: Request):
+    return load_html(request, "login.html")
 
 @app.get("/signup")
-def signup():
-    return load_html("signup.html")
+async def signup(request: Request):
+    return load_html(request, "signup.html")
 
 @app.get("/otp")
-def otp():
-    return load_html("otp.html")
+async def otp(request: Request):
+    return load_html(request, "otp.html")
 
 @app.get("/input")
-def input_page():
-    return load_html("input.html")
+async def input_page(request: Request):
+    return load_html(request, "input.html")
 
 @app.get("/upload")
-def upload_page():
-    return load_html("upload.html")
+async def upload_page(request: Request):
+    return load_html(request, "upload.html")
 
 @app.get("/dashboard")
-def dashboard():
-    return load_html("dashboard.html")
+async def dashboard(request: Request):
+    return load_html(request, "dashboard.html")
 
 @app.get("/dashboard.html")
-def dashboard_html():
-    return load_html("dashboard.html")
+async def dashboard_html(request: Request):
+    return load_html(request, "dashboard.html")
 
 @app.get("/forgot-password")
-def forgot_password():
-    return load_html("forgot_password.html")
+async def forgot_password(request: Request):
+    return load_html(request, "forgot_password.html")
 
 @app.get("/reset_password.html")
-def reset_password(email: str = ""):
-    path = FRONTEND_DIR / "reset_password.html"
-    if path.exists():
-        html = path.read_text(encoding="utf-8")
-        return HTMLResponse(html.replace("{{email}}", email))
-    return HTMLResponse("<h2>Page not found</h2>", status_code=404)
+async def reset_password(request: Request, email: str = ""):
+    # {{email}} in the page, if present, is filled in (escaped) per request
+    return pages.response(request, "reset_password.html", {"email": email})
 
 # Optional routes for direct file access
 @app.get("/index.html")
-def index_html():
-    return load_html("index.html")
+async def index_html(request: Request):
+    return load_html(request, "index.html")
 
 @app.get("/upload.html")
-def upload_html():
-    return load_html("upload.html")
+async def upload_html(request: Request):
+    return load_html(request, "upload.html")
 
 @app.get("/input.html")
-def input_html():
-    return load_html("input.html")
+async def input_html(request: Request):
+    return load_html(request, "input.html")
 
 # -------------------------------
 # API Health & Root
@@ -140,8 +170,22 @@ def api_root():
     return {"message": "HireLens API is running 🚀"}
 
 @app.get("/health")
-def health():
-    return {"status": "ok"}
+async def health():
+    # Answered on the event loop itself, so it reflects loop responsiveness
+    return {
+        "status": "ok",
+        "pid": os.getpid(),
+        "event_loop_lag": loop_lag.stats(),
+        "io_pool": io_pool_stats(),
+        "pages": pages.stats(),
+        "startup": startup_report(),
+        "tracing": tracing.trace_stats(),
+    }
+
+@app.post("/warmup")
+async def warmup():
+    # Loads sklearn and the document parsers now instead of on the first upload
+    return await run_io(warm_up)
 
 # -------------------------------
 # Routers (Backend APIs)
@@ -150,11 +194,23 @@ from backend.routes.auth_routes import router as auth_router
 from backend.routes.criteria_routes import router as criteria_router
 from backend.routes.upload_routes import router as upload_router
 from backend.routes.dashboard_routes import router as dashboard_router
+from backend.routes.search_routes import router as search_router
+from backend.routes.file_routes import router as file_router
+from backend.routes.notification_routes import router as notification_router
+from backend.routes.metrics_routes import router as metrics_router
+from backend.routes.debug_routes import router as debug_router
 
 app.include_router(auth_router)
 app.include_router(criteria_router)
 app.include_router(upload_router)
 app.include_router(dashboard_router)
+app.include_router(search_router)
+app.include_router(file_router)
+app.include_router(notification_router)
+app.include_router(metrics_router)
+app.include_router(debug_router)
+
+record("import", _IMPORT_STARTED)
 
 # -------------------------------
 # Global Exception Handler
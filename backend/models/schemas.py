@@ -13,6 +13,7 @@ class ResumeRecord(BaseModel):
     hr_id: str
     resume_file: Optional[str]
     resume_storage_path: Optional[str]
+    file_name: Optional[str] = None
     extracted_text: Optional[str]
     experience: float
     skills_score: float
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, Form, HTTPException, BackgroundTasks, Response
 from fastapi.responses import RedirectResponse, HTMLResponse, JSONResponse
-from backend.supabase_client import supabase, supabase_admin
+from backend.supabase_client import supabase
+from backend.utils.user_directory import user_directory, set_auth_password
+from backend.utils.async_io import offload
 import re
 import logging
 
@@ -17,19 +19,20 @@ def is_valid_email(email: str) -> bool:
 # SIGNUP (No OTP, Check Existing)
 # ------------------------------------
 @router.post("/signup")
+@offload
 def signup(email: str = Form(...), password: str = Form(...)):
     try:
         if not is_valid_email(email):
              return HTMLResponse("<script>alert('Invalid email format'); window.location='/signup';</script>")
 
         # 1. Check if user exists in public.users table (Sync with Auth)
-        existing = supabase.table("users").select("id").eq("email", email).execute()
-        if existing.data:
+        if user_directory.lookup(email, fresh=True):
             return HTMLResponse(
                 "<script>alert('Account already exists. Please login.'); window.location='/login';</script>"
             )
 
         # 2. Create user in Supabase Auth
+        auth_id = None
         try:
             auth_res = supabase.auth.sign_up({
                 "email": email,
@@ -40,6 +43,8 @@ def signup(email: str = Form(...), password: str = Form(...)):
                  # Depending on config, sign_up might return user: None if confirmation needed
                  # But we assume auto-confirm or "No Email Verification"
                  pass
+            else:
+                 auth_id = auth_res.user.id
 
         except Exception as e:
             # Handle Supabase Auth errors (e.g., rate limit, existing user in Auth but not DB?)
@@ -50,11 +55,15 @@ def signup(email: str = Form(...), password: str = Form(...)):
         # Note: If you have a Trigger in Supabase to create public.users row from auth.users, this might fail or duplicate.
         # Assuming NO trigger based on existing code which did manual insert.
         try:
-            supabase.table("users").insert({
+            inserted = supabase.table("users").insert({
                 "email": email,
-                "password": password # Storing plain password is bad practice, but follows existing logic.
+                "password": password, # Storing plain password is bad practice, but follows existing logic.
+                "auth_id": auth_id # Lets password resets update Auth by id
             }).execute()
+            row = (inserted.data or [{}])[0]
+            user_directory.remember(email, {"id": row.get("id"), "auth_id": auth_id})
         except Exception as e:
+            user_directory.forget(email)
             logger.error(f"DB Insert Signup Error: {e}")
             # If DB insert fails, we might want to clean up Auth user, but for now just error.
 
@@ -71,18 +80,19 @@ def signup(email: str = Form(...), password: str = Form(...)):
 # LOGIN (Supabase Auth)
 # ------------------------------------
 @router.post("/login")
+@offload
 def login(email: str = Form(...), password: str = Form(...)):
     try:
         # 1. Fetch user data from Supabase user table by email
-        user_res = supabase.table("users").select("*").eq("email", email).execute()
+        # (unknown emails are answered from the directory's negative cache)
+        user = user_directory.credentials(email)
         
         # 2. Check existence
-        if not user_res.data:
+        if not user:
              return HTMLResponse(
                 "<script>alert('Signup first'); window.location='/signup';</script>"
             )
         
-        user = user_res.data[0]
         stored_password = user.get("password")
 
         # 3. Compare Password (Exact match as requested)
@@ -110,6 +120,7 @@ def login(email: str = Form(...), password: str = Form(...)):
 # LOGOUT
 # ------------------------------------
 @router.get("/logout")
+@offload
 def logout():
     try:
         supabase.auth.sign_out()
@@ -128,11 +139,11 @@ def logout():
 
 # Step 1: Check Email (Called by frontend before showing password fields)
 @router.post("/check-email")
+@offload
 def check_email(email: str = Form(...)):
     # Used by /reset_password.html page to verify account existence
     try:
-        res = supabase.table("users").select("id").eq("email", email).execute()
-        if not res.data:
+        if not user_directory.lookup(email):
             return JSONResponse(status_code=404, content={"message": "No account found. Please signup first."})
         return JSONResponse(status_code=200, content={"message": "Account exists"})
     except Exception as e:
@@ -140,6 +151,7 @@ def check_email(email: str = Form(...)):
 
 # Step 2: Forgot Password Form Handler (Redirects to reset page)
 @router.post("/forgot-password")
+@offload
 def forgot_password_action(email: str = Form(...)):
     # User Request: "If email EXISTS > Redirect user to forgot-password page"
     # Actually, the user flow says:
@@ -148,8 +160,7 @@ def forgot_password_action(email: str = Form(...)):
     
     # If this is the form submission from /forgot-password page:
     try:
-        res = supabase.table("users").select("id").eq("email", email).execute()
-        if not res.data:
+        if not user_directory.lookup(email):
              return HTMLResponse(
                 "<script>alert('No account found. Please signup first.'); window.location='/signup';</script>"
             )
@@ -168,6 +179,7 @@ def forgot_password_action(email: str = Form(...)):
 
 # Step 3: Reset Password Finish (Update Password)
 @router.post("/reset-password-finish")
+@offload
 def reset_password_finish(
     email: str = Form(...),
     new_password: str = Form(...),
@@ -178,21 +190,18 @@ def reset_password_finish(
              return JSONResponse(status_code=400, content={"error": "Passwords do not match"})
             
         # 1. Check existence in public.users
-        users_res = supabase.table("users").select("id").eq("email", email).execute()
+        user = user_directory.lookup(email)
         
-        if not users_res.data:
+        if not user:
             return JSONResponse(status_code=400, content={"error": "Signup first"})
             
-        # 2. Update Password in public.users (Validation: Exact column name match)
-        supabase.table("users").update({"password": new_password}).eq("email", email).execute()
+        # 2. Update Password in public.users (by primary key)
+        supabase.table("users").update({"password": new_password}).eq("id", user["id"]).execute()
 
-        # 3. Update Auth (Best Effort - for Admin sync)
+        # 3. Update Auth (Best Effort - for Admin sync), directly by Auth user id
         try:
-             # Try to find user in Auth to update
-             users_list = supabase_admin.auth.admin.list_users(per_page=1000)
-             target_user = next((u for u in users_list if u.email == email), None)
-             if target_user:
-                 supabase_admin.auth.admin.update_user_by_id(target_user.id, {"password": new_password})
+             if not set_auth_password(user.get("auth_id"), new_password):
+                 logger.warning(f"No auth_id stored for {email}; run user_directory backfill-auth-ids")
         except Exception as e:
              logger.warning(f"Auth password update failed: {e}")
              # Non-blocking
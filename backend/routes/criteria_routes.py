@@ -1,12 +1,14 @@
 from fastapi import APIRouter, Form, HTTPException
 from datetime import datetime
 from backend.supabase_client import supabase
+from backend.utils.async_io import offload
 import logging
 
 router = APIRouter(prefix="/criteria", tags=["Job Criteria"])
 logger = logging.getLogger("hirelens")
 
 @router.post("/save")
+@offload
 def save_criteria(
     hr_id: str = Form(...),
     job_desc: str = Form(...),
@@ -1,43 +1,53 @@
-from fastapi import APIRouter, Query, HTTPException
+from fastapi import APIRouter, Query, HTTPException, Request
 from fastapi.responses import StreamingResponse
 from backend.supabase_client import supabase
-from backend.utils.supabase_storage import get_signed_url, download_bytes
-from zipfile import ZipFile
-from collections import Counter
-import tempfile
-import requests
+from backend.utils.supabase_storage import download_bytes
+from backend.utils.signed_urls import attach_signed_urls, url_epoch
+from backend.utils.dashboard_stats import get_stats, top_skills
+from backend.utils.response_cache import cached_json, cache_stats
+from backend.utils.zip_stream import stream_zip
+from backend.utils.blob_cache import blob_cache
+from backend.config import EXPORT_PREFETCH_WINDOW
+from backend.utils.async_io import offload
+from backend.utils.metrics import stage, timed
+from typing import Optional
+import base64
+import itertools
+import json
+import math
 import os
-from io import BytesIO
+import uuid
 import logging
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 logger = logging.getLogger("hirelens")
 
 @router.get("/analytics")
-def dashboard_analytics(hr_id: str = Query(...)):
+@offload
+def dashboard_analytics(request: Request, hr_id: str = Query(...)):
     """
     Fetch comprehensive analytics for a specific HR.
+    Reads the incrementally maintained aggregates row (see dashboard_stats).
     """
+    return cached_json(request, hr_id, lambda: _build_analytics(hr_id))
+
+@timed("dashboard_analytics")
+def _build_analytics(hr_id: str) -> dict:
     try:
-        # Fetch all resumes for this HR
-        res = (
-            supabase
-            .table("resumes")
-            .select("status,final_score,jd_similarity_score,matched_skills")
-            .eq("hr_id", hr_id)
-            .execute()
-        )
-        
-        data = res.data or []
-        total = len(data)
-        
+        stats = get_stats(hr_id)
+        total = int(stats.get("total") or 0)
+        selected_count = int(stats.get("selected") or 0)
+        rejected_count = int(stats.get("rejected") or 0)
+        duplicate_count = int(stats.get("duplicates") or 0)
+
         if total == 0:
             return {
                 "summary": {
                     "total": 0,
                     "selected": 0,
                     "rejected": 0,
-                    "avg_score": 0
+                    "avg_score": 0,
+                    "duplicates": duplicate_count
                 },
                 "charts": {
                     "status_distribution": {"selected": 0, "rejected": 0, "pending": 0},
@@ -46,37 +56,17 @@ def dashboard_analytics(hr_id: str = Query(...)):
                 }
             }
 
-        # Calculate Status Counts
-        statuses = [str(r.get("status", "")).lower() for r in data]
-        selected_count = statuses.count("selected")
-        rejected_count = statuses.count("rejected")
         pending_count = total - selected_count - rejected_count
-
-        # Calculate Averages
-        total_score = sum([float(r.get("final_score", 0) or 0) for r in data])
-        avg_score = round(total_score / total, 1) if total > 0 else 0
-
-        total_jd_match = sum([float(r.get("jd_similarity_score", 0) or 0) for r in data])
-        avg_jd_match = round(total_jd_match / total, 1) if total > 0 else 0
-
-        # Skill Distribution
-        all_skills = []
-        for r in data:
-            skills = r.get("matched_skills", [])
-            if isinstance(skills, list):
-                all_skills.extend(skills)
-            elif isinstance(skills, str):
-                all_skills.extend([s.strip() for s in skills.split(",") if s.strip()])
-        
-        skill_counts = Counter(all_skills).most_common(5)
-        top_skills = [{"skill": s, "count": c} for s, c in skill_counts]
+        avg_score = round(float(stats.get("score_sum") or 0) / total, 1)
+        avg_jd_match = round(float(stats.get("jd_sum") or 0) / total, 1)
 
         return {
             "summary": {
                 "total": total,
                 "selected": selected_count,
                 "rejected": rejected_count,
-                "avg_score": avg_score
+                "avg_score": avg_score,
+                "duplicates": duplicate_count
             },
             "charts": {
                 "status_distribution": {
@@ -85,7 +75,7 @@ def dashboard_analytics(hr_id: str = Query(...)):
                     "pending": pending_count
                 },
                 "avg_jd_match": avg_jd_match,
-                "top_skills": top_skills
+                "top_skills": top_skills(stats)
             }
         }
 
@@ -94,124 +84,181 @@ def dashboard_analytics(hr_id: str = Query(...)):
         raise HTTPException(status_code=500, detail="Failed to fetch analytics")
 
 @router.get("/summary")
-def dashboard_summary(hr_id: str = Query(...)):
-    res = (
-        supabase
-        .table("resumes")
-        .select("status")
-        .eq("hr_id", hr_id)
-        .execute()
-    )
-    if not res.data:
-        return {"total_resumes": 0, "selected_resumes": 0, "rejected_resumes": 0, "pending_resumes": 0}
-    total = len(res.data)
-    selected = len([r for r in res.data if str(r.get("status", "")).lower() == "selected"])
-    rejected = len([r for r in res.data if str(r.get("status", "")).lower() == "rejected"])
-    pending = len([r for r in res.data if str(r.get("status", "")).lower() == "pending"])
+@offload
+def dashboard_summary(request: Request, hr_id: str = Query(...)):
+    return cached_json(request, hr_id, lambda: _build_summary(hr_id))
+
+@timed("dashboard_summary")
+def _build_summary(hr_id: str) -> dict:
+    stats = get_stats(hr_id)
     return {
-        "total_resumes": total,
-        "selected_resumes": selected,
-        "rejected_resumes": rejected,
-        "pending_resumes": pending
+        "total_resumes": int(stats.get("total") or 0),
+        "selected_resumes": int(stats.get("selected") or 0),
+        "rejected_resumes": int(stats.get("rejected") or 0),
+        "pending_resumes": int(stats.get("pending") or 0),
+        "duplicate_resumes": int(stats.get("duplicates") or 0)
     }
 
+TOP_RESUME_FIELDS = (
+    "id", "file_name", "resume_file", "experience", "skills_score", "jd_similarity_score",
+    "final_score", "matched_skills", "missing_skills", "status",
+)
+DEFAULT_TOP_FIELDS = "file_name,resume_file,experience,skills_score,jd_similarity_score,final_score,matched_skills,missing_skills,status"
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 100
+
+def _encode_cursor(row: dict) -> str:
+    raw = json.dumps([row.get("final_score"), row.get("id")], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def _decode_cursor(cursor: str):
+    # Both values end up in a PostgREST or_() filter string, so anything that
+    # is not a finite number and an integer/UUID id is rejected outright
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        score, resume_id = json.loads(raw)
+        if isinstance(score, bool) or not isinstance(score, (int, float)) or not math.isfinite(score):
+            raise ValueError("score")
+        if isinstance(resume_id, int) and not isinstance(resume_id, bool):
+            return float(score), resume_id
+        return float(score), str(uuid.UUID(str(resume_id)))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def _projection(fields: str) -> str:
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in TOP_RESUME_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    # The cursor is built from (final_score, id), so both are always returned
+    columns = ["id", "final_score"] + [f for f in requested if f not in ("id", "final_score")]
+    if "resume_file" in columns:
+        # resume_file is a signed link generated from the storage path on read
+        columns.append("resume_storage_path")
+    return ",".join(columns)
+
 @router.get("/top-resumes")
-def top_resumes(hr_id: str = Query(...)):
-    res = (
+@offload
+def top_resumes(
+    request: Request,
+    hr_id: str = Query(...),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    fields: str = Query(DEFAULT_TOP_FIELDS),
+):
+    """
+    One page of the HR's Selected resumes, best first.
+    Keyset-paginated on (final_score, id): pass the returned `next_cursor`
+    back as `cursor` for the following page (null on the last page).
+    """
+    columns = _projection(fields)
+    after = _decode_cursor(cursor) if cursor else None
+    # Pages embed signed links, so cached copies roll over with url_epoch()
+    return cached_json(
+        request, hr_id, lambda: _build_top_resumes(hr_id, columns, limit, after), variant=url_epoch()
+    )
+
+@timed("dashboard_top_resumes")
+def _build_top_resumes(hr_id: str, columns: str, limit: int, after=None) -> dict:
+    query = (
         supabase
         .table("resumes")
-        .select("resume_file,experience,skills_score,jd_similarity_score,final_score,matched_skills,missing_skills,status")
+        .select(columns)
         .eq("hr_id", hr_id)
         .in_("status", ["Selected", "SELECTED"])
+        .is_("duplicate_of", "null")
+    )
+    if after is not None:
+        score, resume_id = after
+        query = query.or_(f"final_score.lt.{score},and(final_score.eq.{score},id.lt.{resume_id})")
+    res = (
+        query
         .order("final_score", desc=True)
+        .order("id", desc=True)
+        .limit(limit + 1)
         .execute()
     )
-    return res.data or []
+    rows = res.data or []
+    items = rows[:limit]
+    next_cursor = _encode_cursor(items[-1]) if len(rows) > limit else None
+    if "resume_storage_path" in columns:
+        attach_signed_urls(items)
+        for item in items:
+            item.pop("resume_storage_path", None)
+    return {"items": items, "next_cursor": next_cursor}
+
+@router.get("/cache-stats")
+def dashboard_cache_stats():
+    return {"responses": cache_stats(), "blobs": blob_cache.stats()}
+
+EXPORT_STATUSES = {
+    # status -> (stored status values, archive entry prefix, archive name)
+    "selected": (["Selected", "SELECTED"], "resume", "selected_resumes.zip"),
+    "rejected": (["Rejected", "REJECTED"], "rejected", "rejected_resumes.zip"),
+    "pending": (["PENDING", "Pending"], "pending", "pending_resumes.zip"),
+}
+EXPORT_PAGE = 1000
+
+def _export_paths(hr_id: str, statuses: list):
+    start = 0
+    while True:
+        with stage("export_query"):
+            res = (
+                supabase
+                .table("resumes")
+                .select("resume_storage_path")
+                .eq("hr_id", hr_id)
+                .in_("status", statuses)
+                .order("id")
+                .range(start, start + EXPORT_PAGE - 1)
+                .execute()
+            )
+        rows = res.data or []
+        for row in rows:
+            if row.get("resume_storage_path"):
+                yield row["resume_storage_path"]
+        if len(rows) < EXPORT_PAGE:
+            return
+        start += EXPORT_PAGE
+
+@router.get("/download")
+@offload
+def download_resumes(hr_id: str = Query(...), status: str = Query(..., pattern="^(selected|rejected|pending)$")):
+    """
+    Streams a ZIP of the HR's resumes with the given status. Entries are
+    sent as they download; storage objects are prefetched concurrently.
+    """
+    return _zip_export(hr_id, status)
+
+def _zip_export(hr_id: str, status: str) -> StreamingResponse:
+    statuses, prefix, archive = EXPORT_STATUSES[status]
+    paths = _export_paths(hr_id, statuses)
+    first = next(paths, None)
+    if first is None:
+        raise HTTPException(status_code=404, detail=f"No {status} resumes available for download.")
+
+    def entries():
+        for idx, path in enumerate(itertools.chain([first], paths)):
+            yield path, f"{prefix}_{idx+1}{os.path.splitext(path)[1]}"
+
+    return StreamingResponse(
+        stream_zip(entries(), download_bytes, window=EXPORT_PREFETCH_WINDOW),
+        media_type="application/zip",
+        headers={"Content-Disposition": f"attachment; filename={archive}"},
+    )
 
+# Older per-status URLs used by existing links/bookmarks
 @router.get("/download-pending")
+@offload
 def download_pending_resumes(hr_id: str = Query(...)):
-    res = (
-        supabase
-        .table("resumes")
-        .select("resume_storage_path")
-        .eq("hr_id", hr_id)
-        .eq("status", "PENDING")
-        .execute()
-    )
-    if not res.data:
-        raise HTTPException(status_code=404, detail="No pending resumes")
-
-    mem_zip = BytesIO()
-    with ZipFile(mem_zip, "w") as zipf:
-        for idx, item in enumerate(res.data):
-            path = item.get("resume_storage_path")
-            if not path:
-                continue
-            file_data = download_bytes(path)
-            if not file_data:
-                logger.warning(f"Download failed for path: {path}")
-                continue
-            zipf.writestr(f"pending_{idx+1}{os.path.splitext(path)[1]}", file_data)
-    mem_zip.seek(0)
-    return StreamingResponse(mem_zip, media_type="application/zip", headers={
-        "Content-Disposition": "attachment; filename=pending_resumes.zip"
-    })
+    return _zip_export(hr_id, "pending")
 
 @router.get("/download-selected")
+@offload
 def download_selected_resumes(hr_id: str = Query(...)):
-    res = (
-        supabase
-        .table("resumes")
-        .select("resume_storage_path")
-        .eq("hr_id", hr_id)
-        .eq("status", "Selected")
-        .execute()
-    )
-    if not res.data:
-        raise HTTPException(status_code=404, detail="No selected resumes")
-
-    mem_zip = BytesIO()
-    with ZipFile(mem_zip, "w") as zipf:
-        for idx, item in enumerate(res.data):
-            path = item.get("resume_storage_path")
-            if not path:
-                continue
-            file_data = download_bytes(path)
-            if not file_data:
-                logger.warning(f"Download failed for path: {path}")
-                continue
-            zipf.writestr(f"resume_{idx+1}{os.path.splitext(path)[1]}", file_data)
-    mem_zip.seek(0)
-    return StreamingResponse(mem_zip, media_type="application/zip", headers={
-        "Content-Disposition": "attachment; filename=selected_resumes.zip"
-    })
+    return _zip_export(hr_id, "selected")
 
 @router.get("/download-rejected")
+@offload
 def download_rejected_resumes(hr_id: str = Query(...)):
-    res = (
-        supabase
-        .table("resumes")
-        .select("resume_storage_path")
-        .eq("hr_id", hr_id)
-        .eq("status", "Rejected")
-        .execute()
-    )
-    if not res.data:
-        raise HTTPException(status_code=404, detail="No rejected resumes available for download.")
-
-    mem_zip = BytesIO()
-    with ZipFile(mem_zip, "w") as zipf:
-        for idx, item in enumerate(res.data):
-            path = item.get("resume_storage_path")
-            if not path:
-                continue
-            file_data = download_bytes(path)
-            if not file_data:
-                logger.warning(f"Download failed for path: {path}")
-                continue
-            ext = os.path.splitext(path)[1]
-            zipf.writestr(f"rejected_{idx+1}{ext}", file_data)
-    mem_zip.seek(0)
-    return StreamingResponse(mem_zip, media_type="application/zip", headers={
-        "Content-Disposition": "attachment; filename=rejected_resumes.zip"
-    })
+    return _zip_export(hr_id, "rejected")
@@ -0,0 +1,58 @@
+from fastapi import APIRouter, Depends, Form, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from typing import Optional
+import hmac
+import logging
+
+from backend.config import DEBUG_TOKEN
+from backend.utils.profiler import configure, get_settings, list_profiles, load_profile, folded_text
+
+logger = logging.getLogger("hirelens")
+
+def require_debug_token(x_debug_token: Optional[str] = Header(None)):
+    """Debug routes need DEBUG_TOKEN configured and sent as X-Debug-Token."""
+    if not DEBUG_TOKEN:
+        raise HTTPException(status_code=404, detail="Not found")
+    if not hmac.compare_digest(x_debug_token or "", DEBUG_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid debug token")
+
+router = APIRouter(prefix="/debug", tags=["Debug"], dependencies=[Depends(require_debug_token)])
+
+@router.get("/profiling")
+def profiling_settings():
+    return get_settings()
+
+@router.post("/profiling")
+def update_profiling(
+    sample_rate: float = Form(0.0),
+    hr_ids: str = Form(""),
+    threshold_ms: float = Form(1000.0),
+    duration_s: float = Form(900.0),
+):
+    """
+    Profiles `sample_rate` of all requests plus every request for the
+    comma-separated `hr_ids`, for `duration_s` seconds; profiles of requests
+    slower than `threshold_ms` are kept. Send sample_rate=0 and no hr_ids to
+    switch off.
+    """
+    targets = [h.strip() for h in hr_ids.split(",") if h.strip()]
+    settings = configure(sample_rate, targets, threshold_ms, duration_s)
+    logger.info(f"Profiling updated: {settings}")
+    return settings
+
+@router.get("/profiles")
+def profiles():
+    return {"profiles": list_profiles()}
+
+@router.get("/profiles/{profile_id}")
+def profile(profile_id: str, format: str = Query("json", pattern="^(json|folded)$")):
+    """A saved profile; format=folded returns the stacks for flame graph tools."""
+    data = load_profile(profile_id)
+    if data is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if format == "folded":
+        return PlainTextResponse(
+            folded_text(data),
+            headers={"Content-Disposition": f"attachment; filename=profile_{profile_id}.folded"},
+        )
+    return data
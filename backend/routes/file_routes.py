@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Query, HTTPException
+from fastapi.responses import FileResponse
+import logging
+import os
+
+from backend.utils.storage_backends import get_storage, LocalStorageBackend
+from backend.utils.async_io import offload
+
+router = APIRouter(prefix="/files", tags=["Files"])
+logger = logging.getLogger("hirelens")
+
+@router.get("/{path:path}")
+@offload
+def serve_file(path: str, expires: int = Query(...), signature: str = Query(...)):
+    """
+    Serves an object from the local storage backend through a signed link
+    (see LocalStorageBackend.signed_urls).
+    """
+    storage = get_storage()
+    if not isinstance(storage, LocalStorageBackend):
+        raise HTTPException(status_code=404, detail="Not found")
+    if not storage.verify_signature(path, expires, signature):
+        raise HTTPException(status_code=403, detail="Invalid or expired link")
+
+    try:
+        target = storage.resolve(path)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Not found")
+    if not target.is_file():
+        raise HTTPException(status_code=404, detail="Not found")
+
+    return FileResponse(target, filename=os.path.basename(path), headers={"Cache-Control": "private, max-age=3600"})
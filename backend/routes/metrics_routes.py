@@ -0,0 +1,49 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from backend.utils.async_io import io_pool_stats, loop_lag
+from backend.utils.blob_cache import blob_cache
+from backend.utils.metrics import register_collector, render
+from backend.utils.notification_queue import notifications
+from backend.utils.response_cache import cache_stats
+from backend.utils.signed_urls import signed_url_stats
+from backend.utils.user_directory import user_directory
+
+router = APIRouter(tags=["Metrics"])
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _runtime_samples():
+    """Counters the caches and pools already keep, read at scrape time."""
+    caches = {
+        "response": cache_stats(),
+        "blob": blob_cache.stats(),
+        "signed_url": signed_url_stats(),
+        "user": user_directory.stats(),
+    }
+    for cache, stats in caches.items():
+        yield "hirelens_cache_hits_total", "counter", "Cache hits", {"cache": cache}, stats["hits"]
+        yield "hirelens_cache_misses_total", "counter", "Cache misses", {"cache": cache}, stats["misses"]
+
+    pool = io_pool_stats()
+    for state in ("active", "queued"):
+        yield "hirelens_io_pool_tasks", "gauge", "Tasks on the blocking I/O pool", {"state": state}, pool[state]
+
+    lag = loop_lag.stats()
+    if lag.get("samples"):
+        yield "hirelens_event_loop_lag_p99_seconds", "gauge", "Event-loop lag, 99th percentile", {}, lag["p99_ms"] / 1000
+
+    mail = notifications.stats()
+    yield "hirelens_notifications_queued", "gauge", "Notification emails waiting to be sent", {}, mail["queued"]
+    for outcome in ("sent", "failed", "retried"):
+        yield "hirelens_notifications_total", "counter", "Notification email outcomes", {"outcome": outcome}, mail[outcome]
+
+
+register_collector(_runtime_samples)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    # Sync route: in multi-process mode rendering reads the workers' snapshot files
+    return PlainTextResponse(render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,145 @@
+from fastapi import APIRouter, Form, HTTPException
+from datetime import datetime, timedelta
+from functools import partial
+import logging
+import re
+
+from backend.supabase_client import supabase
+from backend.config import SENDER_EMAIL
+from backend.utils.notification_queue import notifications, build_message
+from backend.utils.async_io import offload
+
+router = APIRouter(prefix="/notifications", tags=["Notifications"])
+logger = logging.getLogger("hirelens")
+
+EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+CLAIM_PAGE = 200  # ids per claiming update (they go into the query string)
+# A claim whose email was neither sent nor given up on within this long
+# (the worker died with it queued) is released to the next call
+CLAIM_LEASE = timedelta(hours=2)
+
+TEMPLATES = {
+    "selected": (
+        "Your application has been shortlisted",
+        "Hello,\n\n"
+        "Thank you for your application. We are pleased to let you know that your "
+        "profile has been shortlisted for the next stage. Our team will contact you "
+        "shortly with details.\n\n"
+        "Best regards,\nThe Hiring Team"
+    ),
+    "rejected": (
+        "Update on your application",
+        "Hello,\n\n"
+        "Thank you for your interest and the time you put into your application. "
+        "After careful review, we will not be moving forward with your profile for "
+        "this role. We wish you the best in your search.\n\n"
+        "Best regards,\nThe Hiring Team"
+    ),
+}
+STATUS_VALUES = {"selected": ["Selected", "SELECTED"], "rejected": ["Rejected", "REJECTED"]}
+
+def _candidate_email(text: str):
+    """First email address in the resume text (the candidate's contact)."""
+    match = EMAIL_RE.search(text or "")
+    return match.group(0).lower() if match else None
+
+def _pending(status: str) -> str:
+    return f"{status}-pending"
+
+def _claim_unnotified(hr_id: str, status: str):
+    """
+    Yields the HR's resumes with `status` that have not been sent that
+    status email yet, marking them `<status>-pending`. The marking update
+    only matches rows that are still unclaimed, so overlapping calls never
+    claim the same resume twice; `_record_delivery` settles the claim.
+    """
+    pending = _pending(status)
+    expired = (datetime.utcnow() - CLAIM_LEASE).isoformat()
+    unnotified = (
+        f"notified_status.is.null,"
+        f"and(notified_status.neq.{status},notified_status.neq.{pending}),"
+        f'and(notified_status.eq.{pending},notified_at.lt."{expired}")'
+    )
+    last_id = None
+    while True:
+        query = (
+            supabase
+            .table("resumes")
+            .select("id")
+            .eq("hr_id", hr_id)
+            .in_("status", STATUS_VALUES[status])
+            .is_("duplicate_of", "null")
+            .or_(unnotified)
+        )
+        if last_id is not None:
+            query = query.gt("id", last_id)
+        rows = query.order("id").limit(CLAIM_PAGE).execute().data or []
+        if not rows:
+            return
+        last_id = rows[-1]["id"]
+        claimed = (
+            supabase
+            .table("resumes")
+            .update({"notified_status": pending, "notified_at": datetime.utcnow().isoformat()})
+            .in_("id", [row["id"] for row in rows])
+            .or_(unnotified)
+            .execute()
+        )
+        yield from claimed.data or []
+        if len(rows) < CLAIM_PAGE:
+            return
+
+def _record_delivery(resume_ids: list, status: str, sent: bool) -> None:
+    """Marks claimed resumes as notified once their email went out, or releases them."""
+    if sent:
+        update = {"notified_status": status, "notified_at": datetime.utcnow().isoformat()}
+    else:
+        update = {"notified_status": None, "notified_at": None}
+    (
+        supabase
+        .table("resumes")
+        .update(update)
+        .in_("id", resume_ids)
+        .eq("notified_status", _pending(status))
+        .execute()
+    )
+
+@router.post("/status-emails")
+@offload
+def send_status_emails(hr_id: str = Form(...), status: str = Form(...)):
+    """
+    Queues a status email (selected/rejected) to the HR's candidates with
+    that status who have not been sent it yet, so it can be called after
+    every batch. Delivery happens in the background over pooled SMTP; a
+    resume counts as notified only once its email was sent, so failed or
+    dropped sends go out on a later call.
+    """
+    status = status.strip().lower()
+    if status not in TEMPLATES:
+        raise HTTPException(status_code=400, detail="status must be 'selected' or 'rejected'")
+    if not SENDER_EMAIL:
+        raise HTTPException(status_code=503, detail="Email sending is not configured")
+
+    subject, body = TEMPLATES[status]
+    recipients = {}  # email -> resume ids
+    no_email = []
+    for row in _claim_unnotified(hr_id, status):
+        email = _candidate_email(row.get("extracted_text"))
+        if email:
+            recipients.setdefault(email, []).append(row["id"])
+        else:
+            no_email.append(row["id"])
+    skipped = len(no_email)
+    if no_email:
+        # Nothing to send to them, on this call or any later one
+        _record_delivery(no_email, status, True)
+
+    for email, resume_ids in sorted(recipients.items()):
+        notifications.enqueue(build_message(email, subject, body), on_done=partial(_record_delivery, resume_ids, status))
+
+    logger.info(f"Queued {len(recipients)} {status} emails for {hr_id}")
+    return {"queued": len(recipients), "skipped_no_email": skipped}
+
+@router.get("/stats")
+def notification_stats():
+    return notifications.stats()
@@ -0,0 +1,81 @@
+from fastapi import APIRouter, Form, HTTPException
+import logging
+
+from backend.supabase_client import supabase
+from backend.utils.nlp_similarity import query_vector
+from backend.utils.doc_frequency import get_df_table
+from backend.utils.resume_index import get_index
+from backend.utils.feature_loaders import df_seed_loader, index_loader, sync_features
+from backend.utils.signed_urls import attach_signed_urls
+from backend.utils.async_io import offload
+from backend.utils.metrics import stage
+from backend.utils.profiler import tag_hr
+
+router = APIRouter(prefix="/search", tags=["Resume Search"])
+logger = logging.getLogger("hirelens")
+
+MAX_TOP_K = 100
+
+RESULT_FIELDS = "id,file_name,resume_storage_path,experience,skills_score,jd_similarity_score,final_score,matched_skills,missing_skills,status"
+
+@router.post("/resumes")
+@offload
+def search_resumes(
+    hr_id: str = Form(...),
+    job_desc: str = Form(...),
+    top_k: int = Form(20),
+):
+    """
+    Returns the HR's stored resumes that best match a job description,
+    ranked by hashed-feature similarity over the in-memory inverted index.
+    """
+    if not hr_id or not hr_id.strip():
+        raise HTTPException(status_code=400, detail="Missing hr_id")
+    tag_hr(hr_id)
+
+    try:
+        # Adds resumes other workers stored since this one last looked
+        sync_features(hr_id)
+    except Exception as e:
+        logger.warning(f"Feature catch-up failed for {hr_id}: {e}")
+    try:
+        get_df_table(hr_id, loader=df_seed_loader(hr_id))
+    except Exception as e:
+        logger.warning(f"DF table seeding failed for {hr_id}: {e}")
+
+    q_vec = query_vector(job_desc, hr_id)
+    if q_vec is None:
+        raise HTTPException(status_code=400, detail="Job description is too short")
+
+    top_k = max(1, min(int(top_k), MAX_TOP_K))
+
+    try:
+        with stage("search_index"):
+            index = get_index(hr_id, loader=index_loader(hr_id))
+            hits = index.search(q_vec.indices, q_vec.data, top_k)
+    except Exception as e:
+        logger.error(f"Resume search failed for {hr_id}: {e}")
+        raise HTTPException(status_code=500, detail="Search failed")
+
+    if not hits:
+        return {"total_indexed": len(index), "results": []}
+
+    with stage("search_fetch"):
+        res = (
+            supabase
+            .table("resumes")
+            .select(RESULT_FIELDS)
+            .in_("id", [resume_id for resume_id, _ in hits])
+            .execute()
+        )
+    rows = {str(r.get("id")): r for r in attach_signed_urls(res.data or [])}
+
+    results = []
+    for resume_id, score in hits:
+        row = rows.get(resume_id)
+        if row is None:
+            continue
+        row.pop("resume_storage_path", None)
+        results.append({**row, "match_score": round(score * 100, 2)})
+
+    return {"total_indexed": len(index), "results": results}
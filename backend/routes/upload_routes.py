@@ -2,6 +2,7 @@ from fastapi import APIRouter, UploadFile, File, Form, HTTPException
 from typing import List, Optional
 from datetime import datetime
 import os
+import shutil
 import tempfile
 import logging
 
@@ -9,9 +10,23 @@ from backend.supabase_client import supabase
 from backend.utils.extract_text import extract_text
 from backend.utils.experience_extractor import extract_experience
 from backend.utils.skill_matcher import calculate_skill_score
-from backend.utils.file_handler import extract_zip, ZipValidationError
-from backend.utils.supabase_storage import upload_resume, get_signed_url
-from backend.utils.nlp_similarity import jd_resume_similarity
+from backend.utils.file_handler import extract_zip, ZipValidationError, TEMP_FOLDER
+from backend.utils.supabase_storage import upload_resume
+from backend.utils.signed_urls import signed_urls_for
+from backend.utils.nlp_similarity import hash_features, vector_similarity
+from backend.utils.doc_frequency import get_df_table, observe_document
+from backend.utils.vector_store import save_vector, load_vector
+from backend.utils.resume_index import index_if_loaded
+from backend.utils.near_duplicates import get_duplicate_index, minhash_signature
+from backend.utils.feature_loaders import df_seed_loader, duplicate_loader, sync_features
+from backend.utils.semantic_model import semantic_scores, blend_jd_score
+from backend.utils.dashboard_stats import empty_stats, add_row, apply_delta
+from backend.utils.response_cache import bump_version
+from backend.utils.async_io import run_io, offload
+from backend.utils.metrics import stage, IN_FLIGHT, UPLOAD_FILES, DUPLICATES
+from backend.utils.profiler import tag_hr
+from backend.utils.tracing import span
+from backend.config import SCORE_WEIGHT_SKILLS, SCORE_WEIGHT_JD, SCORE_WEIGHT_EXPERIENCE
 
 router = APIRouter(prefix="/upload", tags=["Resume Upload"])
 logger = logging.getLogger("hirelens")
@@ -26,16 +41,31 @@ def _parse_skills(skills_str: str) -> List[str]:
         return []
     return [s.strip() for s in skills_str.split(",") if s.strip()]
 
-@router.post("/resumes")
-async def upload_resumes(
-    hr_id: str = Form(...),
-    zip_file: Optional[UploadFile] = File(None),
-    files: Optional[List[UploadFile]] = File(None),
-):
-    if not hr_id or not hr_id.strip():
-        raise HTTPException(status_code=400, detail="Missing hr_id")
-    if not hr_id or not hr_id.strip():
-        raise HTTPException(status_code=400, detail="Missing hr_id")
+def _score_resume(experience: float, skills_score: float, jd_similarity_score: float,
+                  min_exp: int, min_match_score: int):
+    """Returns (final_score, status) for one resume against the criteria."""
+    if min_exp > 0:
+        experience_score = min((experience / min_exp) * 100.0, 100.0)
+    else:
+        experience_score = 0.0
+
+    final_score = round(
+        (skills_score * SCORE_WEIGHT_SKILLS) +
+        (jd_similarity_score * SCORE_WEIGHT_JD) +
+        (experience_score * SCORE_WEIGHT_EXPERIENCE),
+        2
+    )
+
+    selected = (
+        (experience >= min_exp) and
+        (final_score >= min_match_score) and
+        (skills_score > 30) and
+        (jd_similarity_score >= 5)
+    )
+
+    return final_score, ("Selected" if selected else "Rejected")
+
+def _locked_criteria(hr_id: str) -> dict:
     criteria_q = (
         supabase
         .table("job_criteria")
@@ -48,28 +78,114 @@ async def upload_resumes(
     )
     if not criteria_q.data or len(criteria_q.data) == 0:
         raise HTTPException(status_code=404, detail="Locked job criteria not found")
+    return criteria_q.data[0]
 
-    criteria = criteria_q.data[0]
-    min_exp = int(criteria.get("min_exp", 0))
-    required_skills = _parse_skills(criteria.get("skills", ""))
-    min_match_score = int(criteria.get("min_score", 0))
-    job_description = criteria.get("job_desc", "")
+def _extraction_root(path: str) -> str:
+    """The per-upload folder extract_zip created for an extracted file."""
+    relative = os.path.relpath(path, TEMP_FOLDER)
+    return os.path.join(TEMP_FOLDER, relative.split(os.sep)[0])
 
-    processed = []
-    total_files = 0
-    success_count = 0
-    pending_count = 0
+def _insert_pending(hr_id: str, storage_path, error: Exception, original_name: str, stats_delta: dict) -> bool:
+    """Fallback insert for a resume that failed processing."""
+    try:
+        row = {
+            "hr_id": hr_id,
+            "resume_storage_path": storage_path, # Might be None if upload failed
+            "file_name": original_name,
+            "extracted_text": f"PROCESSING ERROR: {str(error)}", # Store error for visibility
+            "experience": 0,
+            "skills_score": 0,
+            "jd_similarity_score": 0,
+            "final_score": 0,
+            "status": "PENDING", # Crucial
+            "matched_skills": [],
+            "missing_skills": [],
+            "created_at": datetime.utcnow().isoformat()
+        }
+        with stage("db_insert_pending"):
+            supabase.table("resumes").insert(row).execute()
+        add_row(stats_delta, row)
+        UPLOAD_FILES.inc(status="PENDING")
+        return True
+    except Exception as db_err:
+        # If even the fallback insert fails (e.g. DB down), we log and skip.
+        logger.error(f"DB Pending Insert failed for {original_name}: {db_err}")
+        return False
+
+@router.post("/resumes")
+async def upload_resumes(
+    hr_id: str = Form(...),
+    zip_file: Optional[UploadFile] = File(None),
+    files: Optional[List[UploadFile]] = File(None),
+):
+    if not hr_id or not hr_id.strip():
+        raise HTTPException(status_code=400, detail="Missing hr_id")
+    tag_hr(hr_id)
 
     file_inputs: List[UploadFile] = []
     if zip_file:
         file_inputs.append(zip_file)
     if files:
         file_inputs.extend(files)
-    if not file_inputs:
+
+    uploads = [(file.filename, await file.read()) for file in file_inputs]
+
+    # Storage, parsing, scoring and DB writes all block: run them off the event loop
+    with IN_FLIGHT.track(kind="uploads"):
+        return await run_io(_process_uploads, hr_id, uploads)
+
+def _sync_features(hr_id: str) -> None:
+    # Other workers may have stored resumes since this one last looked
+    try:
+        with stage("feature_sync"):
+            sync_features(hr_id)
+    except Exception as e:
+        logger.warning(f"Feature catch-up failed for {hr_id}: {e}")
+
+def _process_uploads(hr_id: str, uploads: List[tuple]) -> dict:
+    """Synchronous body of upload_resumes; runs on the I/O pool."""
+    with stage("load_criteria"):
+        criteria = _locked_criteria(hr_id)
+        job_vec = hash_features(criteria.get("job_desc", ""))
+
+    _sync_features(hr_id)
+    try:
+        get_df_table(hr_id, loader=df_seed_loader(hr_id))
+    except Exception as e:
+        logger.warning(f"DF table seeding failed for {hr_id}: {e}")
+
+    try:
+        dup_index = get_duplicate_index(hr_id, loader=duplicate_loader(hr_id))
+    except Exception as e:
+        logger.warning(f"Duplicate index load failed for {hr_id}: {e}")
+        dup_index = None
+
+    if not uploads:
         raise HTTPException(status_code=400, detail="No files uploaded")
 
-    for file in file_inputs:
-        if not is_valid_file(file.filename):
+    work_dir = tempfile.mkdtemp(prefix="upload_")
+    try:
+        return _process_files(hr_id, uploads, work_dir, criteria, job_vec, dup_index)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+def _process_files(hr_id: str, uploads: List[tuple], work_dir: str, criteria: dict, job_vec, dup_index) -> dict:
+    min_exp = int(criteria.get("min_exp", 0))
+    required_skills = _parse_skills(criteria.get("skills", ""))
+    min_match_score = int(criteria.get("min_score", 0))
+
+    processed = []
+    uploaded = []  # (entry, storage_path), signed in one batch at the end
+    analyzed = []
+    stats_delta = empty_stats()
+    total_files = 0
+    success_count = 0
+    pending_count = 0
+    duplicate_count = 0
+    zip_dirs = []
+
+    for filename, input_bytes in uploads:
+        if not is_valid_file(filename):
              # Skip invalid files or log them? For now, we skip or could insert as Failed.
              # Prompt says "Resumes that fail processing appear as pending".
              # Let's insert as pending if valid file type check fails?
@@ -79,12 +195,12 @@ async def upload_resumes(
              # but catch PROCESSING errors for valid files.
              continue
 
-        input_bytes = await file.read()
-
         resume_paths = []
-        if file.filename.lower().endswith(".zip"):
+        if filename.lower().endswith(".zip"):
             try:
-                resume_paths = extract_zip(input_bytes)
+                with stage("zip_extract"):
+                    resume_paths = extract_zip(input_bytes)
+                zip_dirs.append(_extraction_root(resume_paths[0]))
             except Exception as e:
                  # If ZIP fails, we can't process files inside.
                  # We can't really insert "each file" as pending because we don't know them.
@@ -97,11 +213,12 @@ async def upload_resumes(
                  # We continue to next file input if any
                  continue
         else:
-            with tempfile.TemporaryDirectory() as temp_dir:
-                fp = os.path.join(temp_dir, file.filename)
-                with open(fp, "wb") as f:
-                    f.write(input_bytes)
-                resume_paths = [fp]
+            # Kept until the request finishes (the caller removes work_dir)
+            file_dir = tempfile.mkdtemp(dir=work_dir)
+            fp = os.path.join(file_dir, os.path.basename(filename))
+            with open(fp, "wb") as f:
+                f.write(input_bytes)
+            resume_paths = [fp]
 
         if len(resume_paths) > 50:
             # We enforce limit but should we fail all?
@@ -113,123 +230,248 @@ async def upload_resumes(
             resume_paths = resume_paths[:50] 
 
         for resume_path in resume_paths:
+            file_index = total_files
             total_files += 1
             original_name = os.path.basename(resume_path)
+
+            with span("resume.file", file_index=file_index, file_name=original_name) as file_span:
+                # Init variables for this file
+                storage_path = None
+                text = None
+                status = "PENDING" # Default start status
+                entry = {"file": original_name, "status": status, "resume_url": None, "duplicate_of": None}
             
-            # Init variables for this file
-            storage_path = None
-            resume_url = None
-            text = None
-            experience = 0.0
-            skills_score = 0.0
-            jd_similarity_score = 0.0
-            final_score = 0.0
-            matched_skills = []
-            missing_skills = []
-            status = "PENDING" # Default start status
-            
-            try:
-                # 1. Upload to Storage (First step, need URL for DB)
-                with open(resume_path, "rb") as rf:
-                    file_bytes = rf.read()
-                storage_path = upload_resume(file_bytes, original_name)
-                
-                if storage_path:
-                    resume_url = get_signed_url(storage_path, expires_in=24 * 3600)
+                try:
+                    # 1. Upload to Storage (links are signed when results are read)
+                    with open(resume_path, "rb") as rf:
+                        file_bytes = rf.read()
+                    file_span.set(bytes=len(file_bytes))
+                    with stage("storage_upload", bytes=len(file_bytes)):
+                        storage_path = upload_resume(file_bytes, original_name)
+                    if storage_path:
+                        uploaded.append((entry, storage_path))
 
-                # 2. Extract Text
-                text = extract_text(resume_path)
+                    # 2. Extract Text
+                    with stage("extract_text") as extract_span:
+                        text = extract_text(resume_path)
+                        extract_span.set(chars=len(text or ""))
                 
-                if not text:
-                     raise ValueError("Empty text extracted")
+                    if not text:
+                         raise ValueError("Empty text extracted")
 
-                # 3. Analyze
-                experience = extract_experience(text)
-                
-                skill_result = calculate_skill_score(text, required_skills)
-                skills_score = float(skill_result["score"])
-                matched_skills = skill_result["matched_skills"]
-                missing_skills = skill_result.get("missing_skills", [])
-
-                _, jd_similarity_score = jd_resume_similarity(job_description, text)
-
-                # 4. Score
-                if min_exp > 0:
-                    experience_score = min((experience / min_exp) * 100.0, 100.0)
-                else:
-                    experience_score = 0.0
-
-                final_score = round(
-                    (skills_score * 0.4) +
-                    (jd_similarity_score * 0.4) +
-                    (experience_score * 0.2),
-                    2
-                )
+                    # 3. Analyze
+                    with stage("skills"):
+                        skill_result = calculate_skill_score(text, required_skills)
+                    with stage("jd_similarity"):
+                        resume_vec = hash_features(text)
+                        _, jd_similarity_score = vector_similarity(job_vec, resume_vec, hr_id=hr_id)
+                    with stage("experience"):
+                        experience = extract_experience(text)
+                    with stage("minhash"):
+                        signature = minhash_signature(text)
+
+                    analyzed.append({
+                        "entry": entry,
+                        "file_index": file_index,
+                        "storage_path": storage_path,
+                        "text": text,
+                        "experience": experience,
+                        "skills_score": float(skill_result["score"]),
+                        "matched_skills": skill_result["matched_skills"],
+                        "missing_skills": skill_result.get("missing_skills", []),
+                        "jd_similarity_score": jd_similarity_score,
+                        "resume_vec": resume_vec,
+                        "signature": signature,
+                    })
+
+                except Exception as e:
+                    # Catch ALL processing errors (Extraction, NLP, Storage, Calc)
+                    logger.error(f"Processing failed for {original_name}: {e}")
+                    if _insert_pending(hr_id, storage_path, e, original_name, stats_delta):
+                        pending_count += 1
 
-                # 5. Determine Selection
-                selected = (
-                    (experience >= min_exp) and
-                    (final_score >= min_match_score) and
-                    (skills_score > 30) and
-                    (jd_similarity_score >= 5)
+                # Append to response list regardless of status
+                processed.append(entry)
+
+    # 4. Semantic similarity, projected in one batch for the whole upload
+    with stage("semantic"):
+        semantic = semantic_scores(job_vec, [a["resume_vec"] for a in analyzed])
+
+    for item, semantic_score in zip(analyzed, semantic):
+        entry = item["entry"]
+        with span("resume.insert", file_index=item["file_index"], file_name=entry["file"]):
+            try:
+                # 5. Score + Determine Selection
+                jd_similarity_score = blend_jd_score(item["jd_similarity_score"], semantic_score)
+                final_score, status = _score_resume(
+                    item["experience"], item["skills_score"], jd_similarity_score, min_exp, min_match_score
                 )
-                
-                status = "Selected" if selected else "Rejected"
-                
+
+                duplicate_of = None
+                if dup_index is not None:
+                    with stage("dedup_lookup"):
+                        duplicate_of = dup_index.find_duplicate(item["signature"])
+
                 # 6. Success Insert
-                supabase.table("resumes").insert({
+                row = {
                     "hr_id": hr_id,
-                    "resume_file": resume_url,
-                    "resume_storage_path": storage_path,
-                    "extracted_text": text,
-                    "experience": experience,
-                    "skills_score": skills_score,
+                    "resume_storage_path": item["storage_path"],
+                    "file_name": entry["file"],
+                    "extracted_text": item["text"],
+                    "experience": item["experience"],
+                    "skills_score": item["skills_score"],
                     "jd_similarity_score": jd_similarity_score,
                     "final_score": final_score,
                     "status": status,
-                    "matched_skills": matched_skills,
-                    "missing_skills": missing_skills,
+                    "matched_skills": item["matched_skills"],
+                    "missing_skills": item["missing_skills"],
+                    "duplicate_of": duplicate_of,
                     "created_at": datetime.utcnow().isoformat()
-                }).execute()
-                
+                }
+                with stage("db_insert"):
+                    inserted = supabase.table("resumes").insert(row).execute()
+                add_row(stats_delta, row)
+
+                resume_id = (inserted.data or [{}])[0].get("id")
+                resume_vec = item["resume_vec"]
+                with stage("index_update"):
+                    if dup_index is not None:
+                        dup_index.add(resume_id, item["signature"], duplicate_of)
+                    if resume_vec is not None:
+                        observe_document(hr_id, resume_vec.indices, resume_id)
+                        save_vector(hr_id, resume_id, resume_vec, minhash=item["signature"])
+                        index_if_loaded(hr_id, resume_id, resume_vec)
+
+                entry["status"] = status
+                entry["duplicate_of"] = duplicate_of
                 success_count += 1
+                UPLOAD_FILES.inc(status=status)
+                if duplicate_of:
+                    duplicate_count += 1
+                    DUPLICATES.inc()
 
             except Exception as e:
-                # Catch ALL processing errors (Extraction, NLP, Storage, Calc)
-                logger.error(f"Processing failed for {original_name}: {e}")
-                
-                # Fallback Insert as PENDING
-                try:
-                    supabase.table("resumes").insert({
-                        "hr_id": hr_id,
-                        "resume_file": resume_url, # Might be None if upload failed
-                        "resume_storage_path": storage_path,
-                        "extracted_text": f"PROCESSING ERROR: {str(e)}", # Store error for visibility
-                        "experience": 0,
-                        "skills_score": 0,
-                        "jd_similarity_score": 0,
-                        "final_score": 0,
-                        "status": "PENDING", # Crucial
-                        "matched_skills": [],
-                        "missing_skills": [],
-                        "created_at": datetime.utcnow().isoformat()
-                    }).execute()
+                logger.error(f"Processing failed for {entry['file']}: {e}")
+                if _insert_pending(hr_id, item["storage_path"], e, entry["file"], stats_delta):
                     pending_count += 1
-                except Exception as db_err:
-                     # If even the fallback insert fails (e.g. DB down), we log and skip.
-                     logger.error(f"DB Pending Insert failed for {original_name}: {db_err}")
 
-            # Append to response list regardless of status
-            processed.append({
-                "file": original_name,
-                "status": status,
-                "resume_url": resume_url
-            })
+    for folder in zip_dirs:
+        shutil.rmtree(folder, ignore_errors=True)
+
+    if total_files:
+        with stage("stats_update"):
+            apply_delta(hr_id, stats_delta)
+        bump_version(hr_id)
+
+    with stage("sign_urls"):
+        urls = signed_urls_for(path for _, path in uploaded)
+    for entry, path in uploaded:
+        entry["resume_url"] = urls.get(path)
 
     return {
         "message": "Resumes processed",
         "total_files": total_files,
         "success_count": success_count,
         "pending_count": pending_count,
+        "duplicate_count": duplicate_count,
         "results": processed
     }
+
+@router.post("/rescore")
+@offload
+def rescore_resumes(hr_id: str = Form(...)):
+    """
+    Re-scores an HR's processed resumes against the latest locked criteria.
+    JD similarity uses persisted feature vectors; a resume without one is
+    hashed once and its vector stored for next time.
+    """
+    with IN_FLIGHT.track(kind="rescores"), stage("rescore"):
+        return _rescore(hr_id)
+
+RESCORE_PAGE = 1000  # PostgREST returns at most 1000 rows per request
+
+def _scored_pages(hr_id: str):
+    """The HR's scored resumes, one page of rows at a time."""
+    start = 0
+    while True:
+        res = (
+            supabase
+            .table("resumes")
+            .select("id,extracted_text,experience,status,final_score,jd_similarity_score,matched_skills,duplicate_of")
+            .eq("hr_id", hr_id)
+            .in_("status", ["Selected", "Rejected"])
+            .order("id")
+            .range(start, start + RESCORE_PAGE - 1)
+            .execute()
+        )
+        rows = res.data or []
+        if rows:
+            yield rows
+        if len(rows) < RESCORE_PAGE:
+            return
+        start += RESCORE_PAGE
+
+def _rescore(hr_id: str) -> dict:
+    if not hr_id or not hr_id.strip():
+        raise HTTPException(status_code=400, detail="Missing hr_id")
+    tag_hr(hr_id)
+
+    criteria = _locked_criteria(hr_id)
+    min_exp = int(criteria.get("min_exp", 0))
+    required_skills = _parse_skills(criteria.get("skills", ""))
+    min_match_score = int(criteria.get("min_score", 0))
+    job_vec = hash_features(criteria.get("job_desc", ""))
+
+    _sync_features(hr_id)
+    try:
+        get_df_table(hr_id, loader=df_seed_loader(hr_id))
+    except Exception as e:
+        logger.warning(f"DF table seeding failed for {hr_id}: {e}")
+
+    stats_delta = empty_stats()
+    updated = 0
+    for rows in _scored_pages(hr_id):
+        vectors = []
+        for row in rows:
+            resume_vec = load_vector(hr_id, row.get("id"))
+            if resume_vec is None:
+                text = row.get("extracted_text") or ""
+                resume_vec = hash_features(text)
+                save_vector(hr_id, row.get("id"), resume_vec, minhash=minhash_signature(text))
+            vectors.append(resume_vec)
+
+        semantic = semantic_scores(job_vec, vectors)
+
+        for row, resume_vec, semantic_score in zip(rows, vectors, semantic):
+            resume_id = row.get("id")
+            text = row.get("extracted_text") or ""
+            try:
+                experience = float(row.get("experience") or 0)
+                skill_result = calculate_skill_score(text, required_skills)
+                skills_score = float(skill_result["score"])
+                _, jd_similarity_score = vector_similarity(job_vec, resume_vec, hr_id=hr_id)
+                jd_similarity_score = blend_jd_score(jd_similarity_score, semantic_score)
+                final_score, status = _score_resume(
+                    experience, skills_score, jd_similarity_score, min_exp, min_match_score
+                )
+
+                changes = {
+                    "skills_score": skills_score,
+                    "jd_similarity_score": jd_similarity_score,
+                    "final_score": final_score,
+                    "status": status,
+                    "matched_skills": skill_result["matched_skills"],
+                    "missing_skills": skill_result.get("missing_skills", []),
+                }
+                supabase.table("resumes").update(changes).eq("id", resume_id).execute()
+                add_row(stats_delta, row, sign=-1)
+                add_row(stats_delta, {**row, **changes})
+                updated += 1
+            except Exception as e:
+                logger.error(f"Rescore failed for resume {resume_id}: {e}")
+
+    if updated:
+        apply_delta(hr_id, stats_delta)
+        bump_version(hr_id)
+
+    return {"message": "Resumes rescored", "updated": updated}
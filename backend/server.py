@@ -0,0 +1,215 @@
+# backend/server.py
+
+"""
+Production entry point: a pre-fork server running one uvicorn worker per
+core on a shared listening socket.
+
+    python -m backend.server
+
+The master imports the app and loads the read-only state that workers
+would otherwise each build: the HashingVectorizer and sklearn, the document
+parsers, the skill tables, the memory-mapped semantic model, the HTML pages
+and the storage backend (so every worker signs local file links with the
+same key). It then runs a full collection and `gc.freeze()`s the heap, so
+the collector in the workers never touches, and therefore never copies,
+those pages. Workers are forked afterwards and share that memory
+copy-on-write.
+
+Per-HR state built after the fork (DF tables, search and duplicate
+indexes) is private to each worker. A worker only adds its own uploads to
+it directly; `feature_loaders.sync_features` adds the ones other workers
+stored once the HR's data version moves (within DATA_VERSION_TTL).
+
+Each worker serves at most WORKER_MAX_REQUESTS requests (plus up to
+WORKER_MAX_REQUESTS_JITTER, so workers do not all restart together), then
+finishes its in-flight requests and exits; the master forks a fresh one
+from the preloaded image. This bounds heap growth from fragmentation in
+long OCR/PDF runs. SIGTERM/SIGINT stop the workers gracefully (SIGKILL
+after GRACEFUL_TIMEOUT seconds); SIGHUP recycles all workers.
+"""
+
+import gc
+import logging
+import os
+import random
+import shutil
+import signal
+import socket
+import tempfile
+import time
+
+import uvicorn
+
+from backend.config import (
+    HOST, PORT, WEB_CONCURRENCY, WORKER_MAX_REQUESTS, WORKER_MAX_REQUESTS_JITTER,
+    GRACEFUL_TIMEOUT, METRICS_DIR, SUPABASE_FAKE,
+)
+from backend.utils import metrics
+
+logger = logging.getLogger("hirelens")
+
+CRASH_BACKOFF_SECONDS = 1.0
+POLL_SECONDS = 0.5
+
+
+def preload(metrics_dir: str):
+    """Imports the app and loads shared read-only state in the master."""
+    from backend.main import app, pages
+    from backend.utils.storage_backends import get_storage
+    from backend.utils.warmup import warm_up
+
+    report = warm_up()
+    if report["warmup"]["state"] != "warm":
+        logger.warning(f"Preload warm-up incomplete: {report['warmup']['error']}")
+    pages.load()
+    get_storage()
+    # /metrics on any worker reports totals for all of them
+    metrics.enable_multiprocess(metrics_dir)
+    gc.collect()
+    gc.freeze()
+    logger.info(f"Preloaded app; {gc.get_freeze_count()} objects frozen")
+    return app
+
+
+class PreforkServer:
+    def __init__(self, app, host: str, port: int, workers: int, max_requests: int,
+                 max_requests_jitter: int, graceful_timeout: float):
+        self.app = app
+        self.host = host
+        self.port = port
+        self.workers = max(1, workers)
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.graceful_timeout = graceful_timeout
+        self.children = {}  # pid -> start time
+        self.stopping = False
+        self.sock = None
+
+    def _bind(self) -> socket.socket:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(2048)
+        sock.set_inheritable(True)
+        return sock
+
+    def _worker_limit(self):
+        if self.max_requests <= 0:
+            return None
+        return self.max_requests + random.randint(0, max(0, self.max_requests_jitter))
+
+    def _run_worker(self) -> None:
+        for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+            signal.signal(sig, signal.SIG_DFL)
+        config = uvicorn.Config(
+            self.app,
+            limit_max_requests=self._worker_limit(),
+            timeout_graceful_shutdown=self.graceful_timeout,
+        )
+        # Installs its own SIGTERM/SIGINT handlers for a graceful stop
+        uvicorn.Server(config).run(sockets=[self.sock])
+
+    def _spawn(self) -> None:
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                self._run_worker()
+            except BaseException:
+                logger.exception("Worker crashed")
+                code = 1
+            finally:
+                os._exit(code)
+        self.children[pid] = time.monotonic()
+        logger.info(f"Started worker {pid}")
+
+    def _signal(self, sig: int, pids=None) -> None:
+        for pid in list(pids if pids is not None else self.children):
+            try:
+                os.kill(pid, sig)
+            except ProcessLookupError:
+                self.children.pop(pid, None)
+
+    def _on_stop(self, signum, frame) -> None:
+        self.stopping = True
+
+    def _on_hup(self, signum, frame) -> None:
+        logger.info("Recycling all workers")
+        self._signal(signal.SIGTERM)
+
+    def _reap(self) -> None:
+        while self.children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self.children.clear()
+                return
+            if pid == 0:
+                return
+            started = self.children.pop(pid, None)
+            code = os.waitstatus_to_exitcode(status)
+            metrics.retire(pid)
+            if self.stopping:
+                continue
+            if code != 0:
+                logger.warning(f"Worker {pid} exited with {code}")
+                if started is not None and time.monotonic() - started < CRASH_BACKOFF_SECONDS:
+                    time.sleep(CRASH_BACKOFF_SECONDS)
+            else:
+                logger.info(f"Worker {pid} recycled")
+            self._spawn()
+
+    def _shutdown(self) -> None:
+        logger.info(f"Stopping {len(self.children)} workers")
+        self._signal(signal.SIGTERM)
+        deadline = time.monotonic() + self.graceful_timeout
+        while self.children and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(0.1)
+        if self.children:
+            logger.warning(f"Killing {len(self.children)} workers after graceful timeout")
+            self._signal(signal.SIGKILL)
+            while self.children:
+                self._reap()
+                time.sleep(0.05)
+
+    def run(self) -> None:
+        self.sock = self._bind()
+        logger.info(f"Listening on {self.host}:{self.port} with {self.workers} workers")
+        signal.signal(signal.SIGTERM, self._on_stop)
+        signal.signal(signal.SIGINT, self._on_stop)
+        signal.signal(signal.SIGHUP, self._on_hup)
+        for _ in range(self.workers):
+            self._spawn()
+        try:
+            while not self.stopping:
+                self._reap()
+                time.sleep(POLL_SECONDS)
+        finally:
+            self._shutdown()
+            self.sock.close()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    if SUPABASE_FAKE and WEB_CONCURRENCY > 1:
+        # Each worker would get its own copy of the in-memory data
+        logger.warning("SUPABASE_FAKE is set: running a single worker process")
+    if not hasattr(os, "fork") or WEB_CONCURRENCY <= 1 or SUPABASE_FAKE:
+        # Single process (also the only option on platforms without fork)
+        uvicorn.run("backend.main:app", host=HOST, port=PORT)
+        return
+    metrics_dir = METRICS_DIR or tempfile.mkdtemp(prefix="hirelens-metrics-")
+    app = preload(metrics_dir)
+    try:
+        PreforkServer(
+            app, HOST, PORT, WEB_CONCURRENCY, WORKER_MAX_REQUESTS,
+            WORKER_MAX_REQUESTS_JITTER, GRACEFUL_TIMEOUT,
+        ).run()
+    finally:
+        if not METRICS_DIR:
+            shutil.rmtree(metrics_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# backend/utils/async_io.py
+
+"""
+Non-blocking access to the synchronous Supabase client from async code.
+
+Every PostgREST/Storage call (and the CPU-heavy parsing around uploads)
+runs on one dedicated, bounded thread pool, sized by IO_POOL_SIZE, so the
+event loop only ever awaits. Context variables (request-scoped state such
+as trace/span ids) are copied into the worker thread for each call.
+
+`offload` turns a plain `def` route into an `async def` one that runs its
+body on the pool; FastAPI still reads parameters from the original
+signature.
+
+`LoopLagMonitor` measures event-loop responsiveness: it repeatedly sleeps
+for a short interval and records how late it wakes up. Reported in /health.
+"""
+
+import asyncio
+import contextvars
+import functools
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from backend.config import IO_POOL_SIZE, LOOP_LAG_INTERVAL
+from backend.utils.profiler import current_session, register_thread, unregister_thread
+
+logger = logging.getLogger("hirelens")
+
+_POOL = ThreadPoolExecutor(max_workers=IO_POOL_SIZE, thread_name_prefix="io")
+_stats_lock = threading.Lock()
+_active = 0
+_queued = 0
+_completed = 0
+
+
+def _tracked(func: Callable, *args, **kwargs):
+    global _active, _queued, _completed
+    with _stats_lock:
+        _queued -= 1
+        _active += 1
+    session = current_session()
+    if session is not None:
+        register_thread(session)
+    try:
+        return func(*args, **kwargs)
+    finally:
+        if session is not None:
+            unregister_thread(session)
+        with _stats_lock:
+            _active -= 1
+            _completed += 1
+
+
+async def run_io(func: Callable, *args, **kwargs):
+    """Runs a blocking call on the I/O pool and awaits its result."""
+    global _queued
+    ctx = contextvars.copy_context()
+    with _stats_lock:
+        _queued += 1
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _POOL, functools.partial(ctx.run, _tracked, func, *args, **kwargs)
+    )
+
+
+def offload(func: Callable) -> Callable:
+    """Decorator: run a synchronous route handler on the I/O pool."""
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await run_io(func, *args, **kwargs)
+    return wrapper
+
+
+def io_pool_stats() -> dict:
+    with _stats_lock:
+        return {
+            "workers": IO_POOL_SIZE,
+            "active": _active,
+            "queued": _queued,
+            "completed": _completed,
+        }
+
+
+class LoopLagMonitor:
+    def __init__(self, interval: float, window: int = 600):
+        self.interval = interval
+        self._samples = deque(maxlen=window)  # lag in seconds
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self._samples.append(max(0.0, time.perf_counter() - start - self.interval))
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        samples = sorted(self._samples)
+        if not samples:
+            return {"samples": 0}
+
+        def pct(p: float) -> float:
+            return round(samples[min(len(samples) - 1, int(p * len(samples)))] * 1000, 2)
+
+        return {
+            "samples": len(samples),
+            "last_ms": round(self._samples[-1] * 1000, 2),
+            "p50_ms": pct(0.50),
+            "p99_ms": pct(0.99),
+            "max_ms": round(samples[-1] * 1000, 2),
+        }
+
+
+loop_lag = LoopLagMonitor(LOOP_LAG_INTERVAL)
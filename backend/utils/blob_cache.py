@@ -0,0 +1,171 @@
+# backend/utils/blob_cache.py
+
+"""
+Size-bounded on-disk LRU cache for storage objects.
+
+Objects are keyed by storage path. Resume objects are content-addressed
+(older ones carry a uuid prefix) and are never rewritten, so cached bytes
+never go stale and no invalidation is needed. Files are written to a temp
+name and renamed into place, so concurrent readers (threads or worker
+processes) only ever see complete objects; an object evicted while being
+read stays readable through the open handle.
+
+The directory itself is the LRU: a hit touches the file's mtime, and
+after every write the cache stats the directory and deletes the oldest
+files until it is back under its byte budget. That pass holds an flock
+on `<root>/.lock`, so all worker processes share one budget instead of
+each keeping its own. The totals it finds are kept for `stats()`.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: eviction passes are not serialized across processes
+    fcntl = None
+
+from backend.config import BLOB_CACHE_DIR, BLOB_CACHE_MAX_BYTES
+
+logger = logging.getLogger("hirelens")
+
+STALE_TMP_SECONDS = 3600  # leftovers of writers that died mid-write
+
+
+class BlobCache:
+    def __init__(self, root: str, max_bytes: int):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._usage = None  # (entries, bytes) of the whole directory after the last pass
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _name(self, key: str) -> str:
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    def _path(self, name: str) -> Path:
+        return self.root / name[:2] / name
+
+    @staticmethod
+    def _touch(path) -> None:
+        # Explicit nanosecond stamp: the kernel's own mtimes are only as fine
+        # as its clock tick, which would tie objects written back to back
+        now = time.time_ns()
+        os.utime(path, ns=(now, now))
+
+    def _scan(self) -> List[Tuple[float, str, int]]:
+        """(mtime, path, size) of every cached object, removing stale temp files."""
+        found = []
+        if not self.root.exists():
+            return found
+        now = time.time()
+        for sub in os.scandir(self.root):
+            if not sub.is_dir():
+                continue
+            for entry in os.scandir(sub.path):
+                try:
+                    st = entry.stat()
+                    if entry.name.endswith(".tmp"):
+                        if now - st.st_mtime > STALE_TMP_SECONDS:
+                            os.unlink(entry.path)
+                        continue
+                except FileNotFoundError:
+                    continue  # evicted or renamed meanwhile
+                found.append((st.st_mtime, entry.path, st.st_size))
+        return found
+
+    @contextmanager
+    def _directory_lock(self):
+        with self._lock, open(self.root / ".lock", "a") as handle:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_EX)  # released when the file closes
+            yield
+
+    def _evict(self) -> None:
+        with self._directory_lock():
+            found = sorted(self._scan())
+            total = sum(size for _, _, size in found)
+            entries = len(found)
+            for _, path, size in found:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.unlink(path)
+                    self.evictions += 1
+                except FileNotFoundError:
+                    pass
+                total -= size
+                entries -= 1
+            self._usage = (entries, total)
+
+    def get(self, key: str) -> Optional[bytes]:
+        if not self.enabled:
+            return None
+        path = self._path(self._name(key))
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        try:
+            self._touch(path)
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        if not self.enabled or not data or len(data) > self.max_bytes:
+            return
+        name = self._name(key)
+        path = self._path(name)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp, "wb") as f:
+                f.write(data)
+            self._touch(tmp)
+            os.replace(tmp, path)
+            self._evict()
+        except OSError as e:
+            logger.warning(f"Blob cache write failed for {key}: {e}")
+
+    def stats(self) -> dict:
+        """
+        Counters plus the directory's size as of this process's last write
+        (scanned once if it has not written yet), so scrapes stay cheap.
+        """
+        if self._usage is None and self.enabled:
+            found = self._scan()
+            self._usage = (len(found), sum(size for _, _, size in found))
+        entries, size = self._usage or (0, 0)
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": entries,
+                "bytes": size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+blob_cache = BlobCache(BLOB_CACHE_DIR, BLOB_CACHE_MAX_BYTES)
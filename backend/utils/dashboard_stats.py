@@ -0,0 +1,152 @@
+# backend/utils/dashboard_stats.py
+
+"""
+Per-HR dashboard aggregates kept in the `hr_stats` table.
+
+Uploads and rescores apply a small delta (status counts, score sums,
+JD-match sums, skill histogram) once per batch, so the dashboard reads a
+single row instead of scanning every resume. Near-duplicate copies are
+only counted under `duplicates`, matching the dashboard's totals.
+
+Deltas go through the `apply_hr_stats_delta` SQL function (see the
+README), which adds them to the row in a single upsert, so concurrent
+batches for the same HR don't lose updates. An HR without a row reads as
+empty; resumes stored before the table existed are counted by a one-off
+backfill, which also serves for repair:
+
+    python -m backend.utils.dashboard_stats rebuild --all
+    python -m backend.utils.dashboard_stats rebuild --hr-id <hr_id>
+"""
+
+import argparse
+import logging
+from collections import Counter
+from datetime import datetime
+from typing import Iterable, Optional
+
+from backend.supabase_client import supabase
+
+logger = logging.getLogger("hirelens")
+
+STATS_TABLE = "hr_stats"
+DELTA_FUNCTION = "apply_hr_stats_delta"
+COUNTER_FIELDS = ("total", "selected", "rejected", "pending", "duplicates")
+SUM_FIELDS = ("score_sum", "jd_sum")
+SCAN_PAGE = 1000
+
+
+def empty_stats() -> dict:
+    stats = {f: 0 for f in COUNTER_FIELDS}
+    stats.update({f: 0.0 for f in SUM_FIELDS})
+    stats["skill_counts"] = {}
+    return stats
+
+
+def _row_skills(row: dict) -> list:
+    skills = row.get("matched_skills", [])
+    if isinstance(skills, list):
+        return skills
+    if isinstance(skills, str):
+        return [s.strip() for s in skills.split(",") if s.strip()]
+    return []
+
+
+def add_row(stats: dict, row: dict, sign: int = 1) -> dict:
+    """Adds (sign=1) or removes (sign=-1) one resume row's contribution."""
+    if row.get("duplicate_of"):
+        stats["duplicates"] += sign
+        return stats
+
+    status = str(row.get("status", "")).lower()
+    stats["total"] += sign
+    if status in ("selected", "rejected", "pending"):
+        stats[status] += sign
+    stats["score_sum"] += sign * float(row.get("final_score", 0) or 0)
+    stats["jd_sum"] += sign * float(row.get("jd_similarity_score", 0) or 0)
+
+    skills = stats["skill_counts"]
+    for skill in _row_skills(row):
+        skills[skill] = skills.get(skill, 0) + sign
+        if skills[skill] == 0:
+            del skills[skill]
+    return stats
+
+
+def _save(hr_id: str, stats: dict) -> dict:
+    record = {f: stats[f] for f in COUNTER_FIELDS + SUM_FIELDS}
+    record["skill_counts"] = stats["skill_counts"]
+    record["hr_id"] = hr_id
+    record["updated_at"] = datetime.utcnow().isoformat()
+    supabase.table(STATS_TABLE).upsert(record, on_conflict="hr_id").execute()
+    return record
+
+
+def _iter_resumes(hr_id: str) -> Iterable[dict]:
+    # Keyset on id: every row is read exactly once, however the pages are served
+    last_id = None
+    while True:
+        query = (
+            supabase
+            .table("resumes")
+            .select("id,status,final_score,jd_similarity_score,matched_skills,duplicate_of")
+            .eq("hr_id", hr_id)
+        )
+        if last_id is not None:
+            query = query.gt("id", last_id)
+        rows = query.order("id").limit(SCAN_PAGE).execute().data or []
+        yield from rows
+        if len(rows) < SCAN_PAGE:
+            return
+        last_id = rows[-1]["id"]
+
+
+def rebuild_stats(hr_id: str) -> dict:
+    """Recomputes an HR's aggregates from every resume row."""
+    stats = empty_stats()
+    for row in _iter_resumes(hr_id):
+        add_row(stats, row)
+    logger.info(f"Dashboard stats rebuilt for {hr_id}: {stats['total']} resumes")
+    return _save(hr_id, stats)
+
+
+def _load(hr_id: str) -> Optional[dict]:
+    res = supabase.table(STATS_TABLE).select("*").eq("hr_id", hr_id).limit(1).execute()
+    return res.data[0] if res.data else None
+
+
+def get_stats(hr_id: str) -> dict:
+    """Returns the HR's aggregates; empty until their first upload."""
+    return _load(hr_id) or empty_stats()
+
+
+def apply_delta(hr_id: str, delta: dict) -> None:
+    """Adds a batch delta to the HR's row (created on first use) in one statement."""
+    try:
+        supabase.rpc(DELTA_FUNCTION, {"p_hr_id": hr_id, "p_delta": delta}).execute()
+    except Exception as e:
+        logger.error(f"Dashboard stats update failed for {hr_id}: {e}")
+
+
+def top_skills(stats: dict, n: int = 5) -> list:
+    counts = Counter(stats.get("skill_counts") or {})
+    return [{"skill": s, "count": c} for s, c in counts.most_common(n)]
+
+
+def _all_hr_ids() -> list:
+    res = supabase.table("users").select("email").execute()
+    return [r["email"] for r in res.data or [] if r.get("email")]
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="HireLens dashboard aggregates")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rebuild = sub.add_parser("rebuild", help="Recompute aggregates from resume rows")
+    target = rebuild.add_mutually_exclusive_group(required=True)
+    target.add_argument("--hr-id")
+    target.add_argument("--all", action="store_true")
+    args = parser.parse_args()
+
+    if args.command == "rebuild":
+        for hr in ([args.hr_id] if args.hr_id else _all_hr_ids()):
+            rebuild_stats(hr)
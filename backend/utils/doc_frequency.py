@@ -0,0 +1,99 @@
+# backend/utils/doc_frequency.py
+
+import threading
+from typing import Callable, Iterable, Optional
+
+import numpy as np
+
+from backend.config import IDF_SCOPE, IDF_MIN_DOCS
+
+# Size of the hashed feature space shared with nlp_similarity
+HASH_FEATURES = 2 ** 18
+
+GLOBAL_SCOPE = "__global__"
+
+
+class DocumentFrequencyTable:
+    """
+    Document frequencies over hashed feature indices.
+
+    Updated incrementally (one `add` per stored resume) and read at query
+    time, so IDF weights never require refitting a vectorizer.
+    """
+
+    def __init__(self, n_features: int = HASH_FEATURES):
+        self.df = np.zeros(n_features, dtype=np.int32)
+        self.n_docs = 0
+        self.doc_ids = set()  # ids of counted resumes, so catch-up never counts one twice
+        self._lock = threading.Lock()
+
+    def __contains__(self, doc_id) -> bool:
+        return str(doc_id) in self.doc_ids
+
+    def add(self, indices, doc_id=None) -> bool:
+        """Counts one document. Returns False if `doc_id` was already counted."""
+        idx = np.unique(np.asarray(indices, dtype=np.int64))
+        with self._lock:
+            if doc_id is not None:
+                if str(doc_id) in self.doc_ids:
+                    return False
+                self.doc_ids.add(str(doc_id))
+            self.df[idx] += 1
+            self.n_docs += 1
+        return True
+
+    def idf(self, indices) -> np.ndarray:
+        """Smoothed IDF, same formula as sklearn's TfidfTransformer."""
+        df = self.df[np.asarray(indices, dtype=np.int64)]
+        return (np.log((1.0 + self.n_docs) / (1.0 + df)) + 1.0).astype(np.float32)
+
+    @property
+    def ready(self) -> bool:
+        return self.n_docs >= IDF_MIN_DOCS
+
+
+_TABLES = {}
+_TABLES_LOCK = threading.Lock()
+
+
+def df_scope(hr_id: Optional[str]) -> str:
+    if IDF_SCOPE == "global" or not hr_id:
+        return GLOBAL_SCOPE
+    return hr_id
+
+
+def get_df_table(
+    hr_id: Optional[str],
+    loader: Optional[Callable[[], Iterable]] = None,
+) -> DocumentFrequencyTable:
+    """
+    Returns the DF table for an HR (or the global one).
+
+    `loader` is only called when the table is first created in this
+    process and should yield (resume_id, feature indices) of existing
+    documents.
+    """
+    key = df_scope(hr_id)
+    table = _TABLES.get(key)
+    if table is not None:
+        return table
+
+    with _TABLES_LOCK:
+        table = _TABLES.get(key)
+        if table is None:
+            table = DocumentFrequencyTable()
+            if loader is not None:
+                for doc_id, indices in loader():
+                    table.add(indices, doc_id)
+            _TABLES[key] = table
+    return table
+
+
+def loaded_df_table(hr_id: Optional[str]) -> Optional[DocumentFrequencyTable]:
+    """The DF table for an HR if this process has built it, else None."""
+    return _TABLES.get(df_scope(hr_id))
+
+
+def observe_document(hr_id: Optional[str], indices, doc_id=None) -> None:
+    """Counts one newly stored document towards its DF table."""
+    get_df_table(hr_id).add(indices, doc_id)
@@ -1,10 +1,9 @@
-import os
-import smtplib
 import logging
 import asyncio
-import ssl
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import smtplib
+
+from backend.config import SMTP_USERNAME, SMTP_PASSWORD, SENDER_EMAIL
+from backend.utils.notification_queue import transactional_pool, build_message
 
 # Logger (Render compatible)
 logger = logging.getLogger("hirelens")
@@ -14,16 +13,10 @@ def _send_smtp_email_sync(receiver_email: str, otp: int) -> bool:
     """
     Synchronous SMTP email sender (Brevo).
     Runs inside thread executor to avoid blocking asyncio loop.
+    Reuses the dedicated transactional connection (bulk notifications use
+    their own pool); if the server has dropped it, retries once on a fresh one.
     """
 
-    SMTP_HOST = "smtp-relay.brevo.com"
-    SMTP_PORT = 587
-
-    SMTP_USERNAME = os.getenv("SMTP_USERNAME")
-    SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
-    SENDER_EMAIL = os.getenv("SENDER_EMAIL")
-    SENDER_NAME = os.getenv("SENDER_NAME", "HireLens AI")
-
     # ---- Mandatory safety checks ----
     if not SMTP_USERNAME or not SMTP_PASSWORD:
         logger.error("SMTP credentials missing")
@@ -35,27 +28,25 @@ def _send_smtp_email_sync(receiver_email: str, otp: int) -> bool:
 
     try:
         # ---- Build Email ----
-        msg = MIMEMultipart()
-        msg["From"] = f"{SENDER_NAME} <{SENDER_EMAIL}>"
-        msg["To"] = receiver_email
-        msg["Subject"] = "Your OTP Verification Code"
-
         body = (
             f"Your One-Time Password (OTP) is:\n\n"
             f"{otp}\n\n"
             f"This code is valid for 5 minutes.\n"
             f"If you did not request this, please ignore this email."
         )
-
-        msg.attach(MIMEText(body, "plain"))
-
-        # ---- Secure SMTP connection ----
-        context = ssl.create_default_context()
-
-        with smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=10) as server:
-            server.starttls(context=context)
-            server.login(SMTP_USERNAME, SMTP_PASSWORD)
-            server.send_message(msg)
+        msg = build_message(receiver_email, "Your OTP Verification Code", body)
+
+        # ---- Pooled SMTP connection (STARTTLS + login done once per connection) ----
+        # A failed send discards the connection, so the retry opens a new one
+        for attempt in range(2):
+            try:
+                with transactional_pool.connection() as server:
+                    server.send_message(msg)
+                break
+            except smtplib.SMTPServerDisconnected:
+                if attempt:
+                    raise
+                logger.warning("SMTP connection was closed by the server; retrying")
 
         logger.info(f"OTP email sent successfully to {receiver_email}")
         return True
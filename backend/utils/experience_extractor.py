@@ -1,6 +1,7 @@
 # backend/utils/experience_extractor.py
 
 import re
+from datetime import date
 
 # Convert number words to digits
 WORD_TO_NUM = {
@@ -10,60 +11,161 @@ WORD_TO_NUM = {
     "fifteen": 15
 }
 
+MONTH_TO_NUM = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+
+# Sanity cap for merged tenure (guards against stray year pairs)
+MAX_TENURE_YEARS = 50
+
+
 def word_to_number(word: str) -> int:
     return WORD_TO_NUM.get(word.lower(), None)
 
 
+# ---------------- SCANNER PATTERN ---------------- #
+# Compiled once at import. Alternatives are tried left to right at every
+# position, so the most specific forms come first and each phrase in the
+# text is consumed by exactly one of them.
+
+_MONTH_NAME = (
+    r"jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?"
+    r"|aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?"
+)
+_YEAR = r"(?:19|20)\d{2}"
+
+
+def _date_pattern(prefix: str) -> str:
+    return (
+        rf"(?:(?P<{prefix}mon>{_MONTH_NAME})\.?\s*,?\s*(?P<{prefix}y1>{_YEAR})"
+        rf"|(?P<{prefix}num>0?[1-9]|1[0-2])\s*[/.-]\s*(?P<{prefix}y2>{_YEAR})"
+        rf"|(?P<{prefix}y3>{_YEAR}))"
+    )
+
+
+_SCANNER = re.compile(
+    r"\b(?:"
+    # 1️⃣ Employment date ranges "jan 2019 – present", "03/2018 - 06/2020"
+    rf"(?P<drange>{_date_pattern('s_')}\s*(?:-|–|—|to|till|until)\s*"
+    rf"(?:(?P<present>present|current|now|today|ongoing|till date|date)\b|{_date_pattern('e_')}))"
+    # 2️⃣ "X years Y months"
+    r"|(?P<cy>\d+(?:\.\d+)?)\s*(?:years?|yrs?)\s*(?P<cm>\d+)\s*months?"
+    # 3️⃣ Ranges "3-5 years" → max
+    r"|\d+\s*(?:-|–|to)\s*(?P<ry>\d+)\s*(?:years?|yrs?)"
+    # 4️⃣ Integer / decimal years "3 years", "1.5 years"
+    r"|(?P<y>\d+(?:\.\d+)?)\s*(?:years?|yrs?)"
+    # 5️⃣ Months only "6 months"
+    r"|(?P<m>\d+)\s*months?"
+    # 6️⃣ Written number years "five years"
+    rf"|(?P<w>{'|'.join(WORD_TO_NUM.keys())})\s+years?"
+    r")"
+)
+
+# Lines that describe education rather than employment
+_EDUCATION_LINE = re.compile(
+    r"universit|college|school|institute|academy|bachelor|master|degree|diploma"
+    r"|b\.?\s?tech|m\.?\s?tech|b\.?\s?sc|m\.?\s?sc|b\.?\s?e\b|mba|ph\.?\s?d|cgpa|gpa|education"
+)
+
+
+def _month_index(match, prefix: str):
+    """Returns a date group as months since year 0, or None."""
+    mon = match.group(prefix + "mon")
+    if mon:
+        return int(match.group(prefix + "y1")) * 12 + MONTH_TO_NUM[mon[:3]] - 1
+    num = match.group(prefix + "num")
+    if num:
+        return int(match.group(prefix + "y2")) * 12 + int(num) - 1
+    year = match.group(prefix + "y3")
+    if year:
+        return int(year) * 12
+    return None
+
+
+def _is_education_line(text: str, start: int, end: int) -> bool:
+    line_start = text.rfind("\n", 0, start) + 1
+    line_end = text.find("\n", end)
+    if line_end == -1:
+        line_end = len(text)
+    return bool(_EDUCATION_LINE.search(text, line_start, line_end))
+
+
+def merge_intervals(intervals: list) -> int:
+    """
+    Merges overlapping/adjacent (start, end) month intervals and
+    returns the total number of months covered.
+    """
+    total = 0
+    cur_start = cur_end = None
+    for start, end in sorted(intervals):
+        if cur_end is None or start > cur_end:
+            if cur_end is not None:
+                total += cur_end - cur_start
+            cur_start, cur_end = start, end
+        elif end > cur_end:
+            cur_end = end
+    if cur_end is not None:
+        total += cur_end - cur_start
+    return total
+
+
 def extract_experience(text: str) -> float:
     """
-    Advanced experience extractor:
+    Single-pass experience extractor:
     ✔ Detects years + months
     ✔ Converts month → year fraction
     ✔ Detects decimals (1.5 years)
     ✔ Handles ranges (3-5 yrs → returns max)
-    ✔ Handles multiple experiences → returns maximum
     ✔ Detects words (five years)
+    ✔ Parses employment date ranges (Jan 2019 – Present) and merges
+      overlapping intervals into total tenure
+    ✔ Handles multiple experiences → returns maximum
     """
 
+    if not text:
+        return 0
+
     text = text.lower()
     experience_values = []
+    intervals = []
+    today = date.today()
+    now_index = today.year * 12 + today.month - 1
+
+    for match in _SCANNER.finditer(text):
+        if match.group("drange") is not None:
+            if _is_education_line(text, match.start(), match.end()):
+                continue
+            start = _month_index(match, "s_")
+            end = now_index if match.group("present") else _month_index(match, "e_")
+            if start is None or end is None or end > now_index:
+                continue
+            # Year-only endpoints compare like for like ("2016 - 2018" → 2 years)
+            if match.group("s_y3") and match.group("e_y3"):
+                span = end - start
+            else:
+                span = end - start + 1
+            if start <= now_index and span > 0:
+                intervals.append((start, start + span))
+            continue
+
+        if match.group("cy") is not None:
+            experience_values.append(float(match.group("cy")) + int(match.group("cm")) / 12)
+        elif match.group("ry") is not None:
+            experience_values.append(float(match.group("ry")))
+        elif match.group("y") is not None:
+            experience_values.append(float(match.group("y")))
+        elif match.group("m") is not None:
+            experience_values.append(int(match.group("m")) / 12)
+        elif match.group("w") is not None:
+            num = word_to_number(match.group("w"))
+            if num:
+                experience_values.append(float(num))
 
-    # 1️⃣ Detect "X years Y months"
-    combined_pattern = r"(\d+(?:\.\d+)?)\s*years?\s*(\d+)\s*months?"
-    match = re.search(combined_pattern, text)
-    if match:
-        years = float(match.group(1))
-        months = int(match.group(2))
-        experience_values.append(years + (months / 12))
-
-    # 2️⃣ Detect ranges "3–5 years" → pick max
-    range_pattern = r"(\d+)\s*[-to]+\s*(\d+)\s*years?"
-    match = re.search(range_pattern, text)
-    if match:
-        experience_values.append(float(match.group(2)))
-
-    # 3️⃣ Detect decimal years "1.5 years"
-    decimal_pattern = r"(\d+\.\d+)\s*years?"
-    for match in re.findall(decimal_pattern, text):
-        experience_values.append(float(match))
-
-    # 4️⃣ Detect simple integer years "3 years"
-    simple_year_pattern = r"(\d+)\s*years?"
-    for match in re.findall(simple_year_pattern, text):
-        experience_values.append(float(match))
-
-    # 5️⃣ Detect months only "6 months"
-    month_pattern = r"(\d+)\s*months?"
-    for match in re.findall(month_pattern, text):
-        months = int(match)
-        experience_values.append(months / 12)
-
-    # 6️⃣ Detect written number years "five years"
-    word_pattern = r"(" + "|".join(WORD_TO_NUM.keys()) + r")\s+years?"
-    for match in re.findall(word_pattern, text):
-        num = word_to_number(match)
-        if num:
-            experience_values.append(float(num))
+    if intervals:
+        tenure = merge_intervals(intervals) / 12
+        if tenure <= MAX_TENURE_YEARS:
+            experience_values.append(tenure)
 
     if not experience_values:
         return 0
@@ -1,17 +1,27 @@
 # backend/utils/extract_text.py
 
+import importlib
 import io
 import os
-import docx
-import PyPDF2
-import fitz  # PyMuPDF
-import pytesseract
-from PIL import Image
+
+from backend.utils.metrics import OCR_PAGES, stage
+
+# The parsing libraries (PyMuPDF, PyPDF2, pytesseract/PIL, python-docx) are
+# imported on first use to keep app start-up fast; see load_extractors().
+EXTRACTOR_MODULES = ("docx", "fitz", "PyPDF2", "pytesseract", "PIL.Image")
+
+
+def load_extractors() -> None:
+    """Imports every parsing library up front (used by the warm-up hook)."""
+    for name in EXTRACTOR_MODULES:
+        importlib.import_module(name)
 
 
 # ---------------- PDF HELPERS ---------------- #
 
 def extract_pdf_pypdf2(file_path: str) -> str:
+    import PyPDF2
+
     text = ""
     try:
         with open(file_path, "rb") as f:
@@ -29,6 +39,8 @@ def extract_pdf_pypdf2(file_path: str) -> str:
 
 
 def extract_pdf_pymupdf(file_path: str) -> str:
+    import fitz  # PyMuPDF
+
     text = ""
     try:
         doc = fitz.open(file_path)
@@ -45,11 +57,16 @@ def extract_pdf_pymupdf(file_path: str) -> str:
 
 
 def extract_pdf_ocr(file_path: str) -> str:
+    import fitz  # PyMuPDF
+    import pytesseract
+    from PIL import Image
+
     text = ""
     try:
         pdf = fitz.open(file_path)
         for page in pdf:
             try:
+                OCR_PAGES.inc()
                 pix = page.get_pixmap(dpi=300)
                 img = Image.open(io.BytesIO(pix.tobytes("png")))
                 extracted = pytesseract.image_to_string(img)
@@ -72,7 +89,8 @@ def extract_text_from_pdf(file_path: str) -> str:
         if len(text) > 300:
             return text
 
-        return extract_pdf_ocr(file_path)
+        with stage("ocr"):
+            return extract_pdf_ocr(file_path)
     except Exception:
         return ""
 
@@ -80,6 +98,8 @@ def extract_text_from_pdf(file_path: str) -> str:
 # ---------------- DOCX ---------------- #
 
 def extract_text_from_docx(file_path: str) -> str:
+    import docx
+
     try:
         doc = docx.Document(file_path)
         content = []
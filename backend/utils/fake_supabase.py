@@ -0,0 +1,517 @@
+# backend/utils/fake_supabase.py
+
+"""
+In-memory stand-in for the Supabase client, for load tests and local runs
+without a Supabase project (SUPABASE_FAKE=true).
+
+It covers the calls HireLens makes:
+
+- tables: select (column lists, count="exact"), insert, update, upsert,
+  delete, filtered with eq/neq/gt/gte/lt/lte/in_/is_/or_ and shaped with
+  order/limit/range. Filter values are compared after coercing them to the
+  stored value's type, the way PostgREST compares query-string values
+  with typed columns (eq("id", "3") matches id 3). Inserted rows get an
+  increasing integer "id" per table. Like PostgREST's default max-rows,
+  a select returns at most 1000 rows; callers have to page with range().
+- rpc: the SQL functions from the README (apply_hr_stats_delta).
+- storage: from_(bucket).upload/download/list/remove/create_signed_url(s).
+  Uploading to an existing path fails with a 409-style error unless
+  file_options sets upsert, like the real bucket. Signed URLs are not served by anything.
+- auth: sign_up, sign_out and admin.list_users/update_user_by_id.
+
+Everything lives in one process's memory and is lost on exit; the
+pre-fork server runs a single worker when the fake is on. Each call can
+sleep SUPABASE_FAKE_LATENCY_MS first, to stand in for the network round
+trip when measuring how the app behaves under concurrency.
+"""
+
+import copy
+import itertools
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+
+class FakeSupabaseError(Exception):
+    """Raised where the real client would raise an API error."""
+
+
+class FakeResponse:
+    def __init__(self, data: Any, count: Optional[int] = None):
+        self.data = data
+        self.count = count
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+# ---------------- FILTERS ---------------- #
+
+def _coerce(value: Any, like: Any) -> Any:
+    """Converts a filter value to the type of the stored value it is compared with."""
+    if like is None or value is None or type(value) is type(like):
+        return value
+    try:
+        if isinstance(like, bool):
+            return str(value).lower() in ("true", "t", "1")
+        if isinstance(like, int):
+            return float(value) if "." in str(value) else int(value)
+        if isinstance(like, float):
+            return float(value)
+        return str(value)
+    except (TypeError, ValueError):
+        return str(value)
+
+
+def _compare(op: str, stored: Any, value: Any) -> bool:
+    if op == "is":
+        if str(value).lower() == "null":
+            return stored is None
+        return stored is (str(value).lower() == "true")
+    if stored is None:
+        return False  # SQL NULL never equals or orders against anything
+    if op == "in":
+        return any(stored == _coerce(v, stored) for v in value)
+    value = _coerce(value, stored)
+    try:
+        if op == "eq":
+            return stored == value
+        if op == "neq":
+            return stored != value
+        if op == "gt":
+            return stored > value
+        if op == "gte":
+            return stored >= value
+        if op == "lt":
+            return stored < value
+        if op == "lte":
+            return stored <= value
+    except TypeError:
+        return False
+    raise FakeSupabaseError(f"Unsupported filter operator: {op}")
+
+
+def _split_top_level(expr: str) -> List[str]:
+    parts, depth, current = [], 0, []
+    for ch in expr:
+        if ch == "," and depth == 0:
+            parts.append("".join(current))
+            current = []
+            continue
+        depth += ch == "("
+        depth -= ch == ")"
+        current.append(ch)
+    parts.append("".join(current))
+    return [p.strip() for p in parts if p.strip()]
+
+
+def _parse_logic(expr: str, combine: Callable = any) -> Callable[[dict], bool]:
+    """PostgREST logic trees: "a.lt.1,and(b.eq.2,c.lt.3)" for or_()."""
+    checks = []
+    for part in _split_top_level(expr):
+        nested = re.fullmatch(r"(and|or)\((.*)\)", part)
+        if nested:
+            checks.append(_parse_logic(nested.group(2), all if nested.group(1) == "and" else any))
+            continue
+        column, op, value = part.split(".", 2)
+        if op == "in":
+            value = [v.strip().strip('"') for v in value.strip("()").split(",")]
+        elif len(value) > 1 and value[0] == value[-1] == '"':
+            value = value[1:-1]  # quoted to protect reserved characters (,.:())
+        checks.append(lambda row, c=column, o=op, v=value: _compare(o, row.get(c), v))
+    return lambda row: combine(check(row) for check in checks)
+
+
+# ---------------- TABLES ---------------- #
+
+class _Table:
+    def __init__(self):
+        self.rows: List[dict] = []
+        self.ids = itertools.count(1)
+
+
+class FakeQuery:
+    def __init__(self, client: "FakeClient", table: str):
+        self._client = client
+        self._table = table
+        self._op = "select"
+        self._columns = "*"
+        self._count = None
+        self._payload = None
+        self._on_conflict = "id"
+        self._filters: List[Callable[[dict], bool]] = []
+        self._order: List[tuple] = []
+        self._limit: Optional[int] = None
+        self._range: Optional[tuple] = None
+
+    # -- operations --
+    def select(self, columns: str = "*", count: Optional[str] = None, **kwargs) -> "FakeQuery":
+        self._columns, self._count = columns, count
+        return self
+
+    def insert(self, payload, **kwargs) -> "FakeQuery":
+        self._op, self._payload = "insert", payload
+        return self
+
+    def update(self, payload: dict, **kwargs) -> "FakeQuery":
+        self._op, self._payload = "update", payload
+        return self
+
+    def upsert(self, payload, on_conflict: str = "id", **kwargs) -> "FakeQuery":
+        self._op, self._payload, self._on_conflict = "upsert", payload, on_conflict or "id"
+        return self
+
+    def delete(self, **kwargs) -> "FakeQuery":
+        self._op = "delete"
+        return self
+
+    # -- filters --
+    def _filter(self, op: str, column: str, value: Any) -> "FakeQuery":
+        self._filters.append(lambda row: _compare(op, row.get(column), value))
+        return self
+
+    def eq(self, column: str, value: Any) -> "FakeQuery":
+        return self._filter("eq", column, value)
+
+    def neq(self, column: str, value: Any) -> "FakeQuery":
+        return self._filter("neq", column, value)
+
+    def gt(self, column: str, value: Any) -> "FakeQuery":
+        return self._filter("gt", column, value)
+
+    def gte(self, column: str, value: Any) -> "FakeQuery":
+        return self._filter("gte", column, value)
+
+    def lt(self, column: str, value: Any) -> "FakeQuery":
+        return self._filter("lt", column, value)
+
+    def lte(self, column: str, value: Any) -> "FakeQuery":
+        return self._filter("lte", column, value)
+
+    def in_(self, column: str, values) -> "FakeQuery":
+        return self._filter("in", column, list(values))
+
+    def is_(self, column: str, value: Any) -> "FakeQuery":
+        return self._filter("is", column, "null" if value is None else value)
+
+    def or_(self, filters: str, **kwargs) -> "FakeQuery":
+        self._filters.append(_parse_logic(filters))
+        return self
+
+    # -- shaping --
+    def order(self, column: str, desc: bool = False, **kwargs) -> "FakeQuery":
+        self._order.append((column, desc))
+        return self
+
+    def limit(self, size: int, **kwargs) -> "FakeQuery":
+        self._limit = size
+        return self
+
+    def range(self, start: int, end: int, **kwargs) -> "FakeQuery":
+        self._range = (start, end)
+        return self
+
+    # -- execution --
+    def _project(self, row: dict) -> dict:
+        if self._columns.strip() == "*":
+            return copy.deepcopy(row)
+        columns = [c.strip() for c in self._columns.split(",") if c.strip()]
+        return {c: copy.deepcopy(row.get(c)) for c in columns}
+
+    def _matches(self, row: dict) -> bool:
+        return all(check(row) for check in self._filters)
+
+    def execute(self) -> FakeResponse:
+        self._client._delay()
+        with self._client._lock:
+            table = self._client._tables.setdefault(self._table, _Table())
+            return getattr(self, f"_execute_{self._op}")(table)
+
+    def _store(self, table: _Table, item: dict) -> dict:
+        row = copy.deepcopy(item)
+        if row.get("id") is None:
+            row["id"] = next(table.ids)
+        table.rows.append(row)
+        return row
+
+    def _execute_insert(self, table: _Table) -> FakeResponse:
+        items = self._payload if isinstance(self._payload, list) else [self._payload]
+        return FakeResponse([copy.deepcopy(self._store(table, item)) for item in items])
+
+    def _execute_upsert(self, table: _Table) -> FakeResponse:
+        items = self._payload if isinstance(self._payload, list) else [self._payload]
+        keys = [k.strip() for k in self._on_conflict.split(",")]
+        out = []
+        for item in items:
+            existing = next((r for r in table.rows if all(r.get(k) == item.get(k) for k in keys)), None)
+            if existing is None:
+                existing = self._store(table, item)
+            else:
+                existing.update(copy.deepcopy(item))
+            out.append(copy.deepcopy(existing))
+        return FakeResponse(out)
+
+    def _execute_update(self, table: _Table) -> FakeResponse:
+        out = []
+        for row in table.rows:
+            if self._matches(row):
+                row.update(copy.deepcopy(self._payload))
+                out.append(copy.deepcopy(row))
+        return FakeResponse(out)
+
+    def _execute_delete(self, table: _Table) -> FakeResponse:
+        kept, removed = [], []
+        for row in table.rows:
+            (removed if self._matches(row) else kept).append(row)
+        table.rows = kept
+        return FakeResponse(removed)
+
+    def _execute_select(self, table: _Table) -> FakeResponse:
+        rows = [r for r in table.rows if self._matches(r)]
+        for column, desc in reversed(self._order):
+            # NULLs sort last ascending and first descending, as in Postgres
+            present = sorted((r for r in rows if r.get(column) is not None), key=lambda r: r[column], reverse=desc)
+            missing = [r for r in rows if r.get(column) is None]
+            rows = missing + present if desc else present + missing
+        count = len(rows) if self._count else None
+        if self._range is not None:
+            rows = rows[self._range[0]:self._range[1] + 1]
+        if self._limit is not None:
+            rows = rows[:self._limit]
+        rows = rows[:self._client.max_rows]
+        return FakeResponse([self._project(r) for r in rows], count)
+
+
+# ---------------- FUNCTIONS ---------------- #
+
+class FakeRPC:
+    """rpc(fn, params); runs the Python twin of a SQL function from the README."""
+
+    def __init__(self, client: "FakeClient", fn: str, params: dict):
+        self._client = client
+        self._fn = fn
+        self._params = params
+
+    def execute(self) -> FakeResponse:
+        handler = getattr(self, f"_call_{self._fn}", None)
+        if handler is None:
+            raise FakeSupabaseError(f"Could not find the function public.{self._fn}")
+        self._client._delay()
+        with self._client._lock:
+            return FakeResponse(handler(self._client._tables, copy.deepcopy(self._params)))
+
+    @staticmethod
+    def _call_apply_hr_stats_delta(tables: Dict[str, _Table], params: dict) -> None:
+        table = tables.setdefault("hr_stats", _Table())
+        hr_id, delta = params["p_hr_id"], params["p_delta"]
+        row = next((r for r in table.rows if r.get("hr_id") == hr_id), None)
+        if row is None:
+            row = {"hr_id": hr_id, "skill_counts": {}}
+            table.rows.append(row)
+        for field, value in delta.items():
+            if field != "skill_counts":
+                row[field] = (row.get(field) or 0) + value
+        skills = dict(row.get("skill_counts") or {})
+        for skill, count in (delta.get("skill_counts") or {}).items():
+            skills[skill] = skills.get(skill, 0) + count
+        row["skill_counts"] = {skill: count for skill, count in skills.items() if count > 0}
+        row["updated_at"] = _now()
+        return None
+
+
+# ---------------- STORAGE ---------------- #
+
+class FakeBucket:
+    def __init__(self, client: "FakeClient", name: str):
+        self._client = client
+        self.name = name
+        self._objects: Dict[str, dict] = {}
+
+    def upload(self, path: str, file, file_options: Optional[dict] = None) -> dict:
+        self._client._delay()
+        data = file.read() if hasattr(file, "read") else bytes(file)
+        upsert = str((file_options or {}).get("upsert", (file_options or {}).get("x-upsert", "false"))).lower() == "true"
+        with self._client._lock:
+            existing = self._objects.get(path)
+            if existing is not None and not upsert:
+                raise FakeSupabaseError(f"The resource already exists (Duplicate, 409): {path}")
+            now = _now()
+            # An upsert keeps created_at and moves updated_at, as in Supabase
+            created = existing["created_at"] if existing is not None else now
+            self._objects[path] = {"data": data, "created_at": created, "updated_at": now}
+        return {"path": path, "Key": f"{self.name}/{path}"}
+
+    def download(self, path: str) -> bytes:
+        self._client._delay()
+        with self._client._lock:
+            obj = self._objects.get(path)
+        if obj is None:
+            raise FakeSupabaseError(f"Object not found (404): {path}")
+        return obj["data"]
+
+    def remove(self, paths: List[str]) -> List[dict]:
+        self._client._delay()
+        with self._client._lock:
+            return [{"name": p} for p in paths if self._objects.pop(p, None) is not None]
+
+    def list(self, path: Optional[str] = None, options: Optional[dict] = None) -> List[dict]:
+        self._client._delay()
+        options = options or {}
+        prefix = f"{path.strip('/')}/" if path else ""
+        search = options.get("search", "")
+        with self._client._lock:
+            names = sorted(
+                (p[len(prefix):], obj) for p, obj in self._objects.items()
+                if p.startswith(prefix) and "/" not in p[len(prefix):] and search in p[len(prefix):]
+            )
+        offset, limit = options.get("offset", 0), options.get("limit", 100)
+        return [
+            {"name": name, "created_at": obj["created_at"], "updated_at": obj["updated_at"],
+             "metadata": {"size": len(obj["data"])}}
+            for name, obj in names[offset:offset + limit]
+        ]
+
+    def _signed(self, path: str, expires_in: int) -> str:
+        return f"http://fake-supabase.local/storage/v1/object/sign/{self.name}/{path}?token={uuid.uuid4().hex}&expires_in={expires_in}"
+
+    def create_signed_url(self, path: str, expires_in: int, options: Optional[dict] = None) -> dict:
+        self._client._delay()
+        with self._client._lock:
+            if path not in self._objects:
+                raise FakeSupabaseError(f"Object not found (404): {path}")
+        url = self._signed(path, expires_in)
+        return {"signedURL": url, "signedUrl": url}
+
+    def create_signed_urls(self, paths: List[str], expires_in: int, options: Optional[dict] = None) -> List[dict]:
+        self._client._delay()
+        with self._client._lock:
+            known = {p for p in paths if p in self._objects}
+        out = []
+        for path in paths:
+            if path in known:
+                url = self._signed(path, expires_in)
+                out.append({"path": path, "signedURL": url, "signedUrl": url, "error": None})
+            else:
+                out.append({"path": path, "signedURL": None, "signedUrl": None, "error": "Either the object does not exist or you do not have access to it"})
+        return out
+
+
+class FakeStorage:
+    def __init__(self, client: "FakeClient"):
+        self._client = client
+        self._buckets: Dict[str, FakeBucket] = {}
+
+    def from_(self, bucket: str) -> FakeBucket:
+        with self._client._lock:
+            if bucket not in self._buckets:
+                self._buckets[bucket] = FakeBucket(self._client, bucket)
+            return self._buckets[bucket]
+
+
+# ---------------- AUTH ---------------- #
+
+class FakeUser:
+    def __init__(self, email: str, password: str):
+        self.id = str(uuid.uuid4())
+        self.email = email
+        self.password = password
+        self.created_at = _now()
+
+
+class FakeAuthResponse:
+    def __init__(self, user: Optional[FakeUser]):
+        self.user = user
+        self.session = None
+
+
+class FakeAdmin:
+    def __init__(self, auth: "FakeAuth"):
+        self._auth = auth
+
+    def list_users(self, page: int = 1, per_page: int = 50) -> List[FakeUser]:
+        self._auth._client._delay()
+        with self._auth._client._lock:
+            users = list(self._auth._users.values())
+        start = (max(page, 1) - 1) * per_page
+        return users[start:start + per_page]
+
+    def update_user_by_id(self, uid: str, attributes: dict) -> FakeAuthResponse:
+        self._auth._client._delay()
+        with self._auth._client._lock:
+            user = next((u for u in self._auth._users.values() if u.id == uid), None)
+            if user is None:
+                raise FakeSupabaseError(f"User not found: {uid}")
+            if "password" in attributes:
+                user.password = attributes["password"]
+            if "email" in attributes:
+                del self._auth._users[user.email]
+                user.email = attributes["email"]
+                self._auth._users[user.email] = user
+        return FakeAuthResponse(user)
+
+
+class FakeAuth:
+    def __init__(self, client: "FakeClient"):
+        self._client = client
+        self._users: Dict[str, FakeUser] = {}
+        self.admin = FakeAdmin(self)
+
+    def sign_up(self, credentials: dict) -> FakeAuthResponse:
+        self._client._delay()
+        email, password = credentials.get("email"), credentials.get("password")
+        if not email or not password or len(password) < 6:
+            raise FakeSupabaseError("Password should be at least 6 characters")
+        with self._client._lock:
+            if email in self._users:
+                raise FakeSupabaseError("User already registered")
+            user = self._users[email] = FakeUser(email, password)
+        return FakeAuthResponse(user)
+
+    def sign_in_with_password(self, credentials: dict) -> FakeAuthResponse:
+        self._client._delay()
+        with self._client._lock:
+            user = self._users.get(credentials.get("email"))
+        if user is None or user.password != credentials.get("password"):
+            raise FakeSupabaseError("Invalid login credentials")
+        return FakeAuthResponse(user)
+
+    def sign_out(self) -> None:
+        pass
+
+
+# ---------------- CLIENT ---------------- #
+
+class FakeClient:
+    """Drop-in for the `supabase` / `supabase_admin` clients (they share one fake)."""
+
+    def __init__(self, latency_ms: float = 0.0, max_rows: int = 1000):
+        self.latency = max(0.0, latency_ms) / 1000
+        self.max_rows = max_rows
+        self._lock = threading.RLock()
+        self._tables: Dict[str, _Table] = {}
+        self.storage = FakeStorage(self)
+        self.auth = FakeAuth(self)
+
+    def _delay(self) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name)
+
+    from_ = table
+
+    def rpc(self, fn: str, params: Optional[dict] = None) -> FakeRPC:
+        return FakeRPC(self, fn, params or {})
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "tables": {name: len(t.rows) for name, t in self._tables.items()},
+                "objects": {name: len(b._objects) for name, b in self.storage._buckets.items()},
+                "users": len(self.auth._users),
+            }
@@ -0,0 +1,247 @@
+# backend/utils/feature_loaders.py
+
+"""
+Loaders that rebuild in-memory feature structures (DF tables, search
+indexes, duplicate indexes) for an HR after a restart. Persisted vectors are preferred;
+resumes without one are hashed from extracted_text once and saved.
+
+Each worker process builds its own copies, and only the worker that
+handled an upload adds the new resumes to them. `sync_features` catches
+the others up: when an HR's data version has moved since the last check,
+it adds the resumes stored since then to whichever structures are loaded.
+"""
+
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Optional
+
+from backend.supabase_client import supabase
+from backend.config import IDF_SCOPE, IDF_SEED_LIMIT
+from backend.utils.doc_frequency import loaded_df_table
+from backend.utils.nlp_similarity import hash_features
+from backend.utils.vector_store import iter_vectors, load_arrays, save_vector
+from backend.utils.near_duplicates import loaded_duplicate_index, minhash_signature
+from backend.utils.resume_index import loaded_index
+from backend.utils.response_cache import data_version
+
+logger = logging.getLogger("hirelens")
+
+BACKFILL_CHUNK = 200
+SCAN_PAGE = 1000  # PostgREST returns at most 1000 rows per request
+# created_at is stamped before the insert commits, so a catch-up also
+# re-reads this much before its watermark (rows already added are skipped)
+SYNC_OVERLAP = timedelta(minutes=2)
+
+
+def _scored_rows(hr_id: str, columns: str, order: tuple = ("id",), since: Optional[str] = None):
+    """An HR's scored resumes (created at or after `since`), fetched in SCAN_PAGE pages."""
+    start = 0
+    while True:
+        q = (
+            supabase
+            .table("resumes")
+            .select(columns)
+            .eq("hr_id", hr_id)
+            .in_("status", ["Selected", "Rejected"])
+        )
+        if since is not None:
+            q = q.gte("created_at", since)
+        for column in order:
+            q = q.order(column)
+        rows = q.range(start, start + SCAN_PAGE - 1).execute().data or []
+        yield from rows
+        if len(rows) < SCAN_PAGE:
+            return
+        start += SCAN_PAGE
+
+
+def df_seed_loader(hr_id: str):
+    """
+    Seeds a cold DF table from the most recent scored resumes, preferring
+    persisted vectors over re-hashing extracted_text.
+    A bounded sample is enough to estimate IDF; inserts keep it current.
+    """
+    def load():
+        if IDF_SCOPE != "global":
+            seeded = 0
+            for resume_id, arrays in iter_vectors(hr_id, limit=IDF_SEED_LIMIT):
+                seeded += 1
+                yield resume_id, arrays["indices"]
+            if seeded:
+                return
+
+        q = (
+            supabase
+            .table("resumes")
+            .select("id,extracted_text")
+            .in_("status", ["Selected", "Rejected"])
+        )
+        if IDF_SCOPE != "global":
+            q = q.eq("hr_id", hr_id)
+        res = q.order("created_at", desc=True).limit(IDF_SEED_LIMIT).execute()
+        for row in res.data or []:
+            vec = hash_features(row.get("extracted_text") or "")
+            if vec is not None:
+                yield row["id"], vec.indices
+    return load
+
+
+def index_loader(hr_id: str):
+    """
+    Yields (resume_id, indices, values) for an HR's scored resumes.
+    Stored vectors are used as-is; resumes scored before vectors were
+    persisted are hashed once and saved.
+    """
+    def load():
+        seen = set()
+        for resume_id, arrays in iter_vectors(hr_id):
+            seen.add(resume_id)
+            yield resume_id, arrays["indices"], arrays["values"]
+
+        missing = [r["id"] for r in _scored_rows(hr_id, "id") if str(r.get("id")) not in seen]
+        for start in range(0, len(missing), BACKFILL_CHUNK):
+            rows = (
+                supabase
+                .table("resumes")
+                .select("id,extracted_text")
+                .in_("id", missing[start:start + BACKFILL_CHUNK])
+                .execute()
+            )
+            for row in rows.data or []:
+                vec = hash_features(row.get("extracted_text") or "")
+                if vec is None:
+                    continue
+                save_vector(hr_id, row["id"], vec)
+                yield row["id"], vec.indices, vec.data
+    return load
+
+
+def duplicate_loader(hr_id: str):
+    """
+    Yields (resume_id, minhash signature, duplicate_of) for an HR's scored
+    resumes, oldest first, so duplicates keep linking to the earliest copy.
+    """
+    def load():
+        rows = list(_scored_rows(hr_id, "id,duplicate_of", order=("created_at", "id")))
+
+        signatures = {}
+        missing = []
+        for row in rows:
+            arrays = load_arrays(hr_id, row["id"])
+            if arrays is not None and "minhash" in arrays:
+                signatures[str(row["id"])] = arrays["minhash"]
+            else:
+                missing.append(row["id"])
+
+        for start in range(0, len(missing), BACKFILL_CHUNK):
+            chunk = (
+                supabase
+                .table("resumes")
+                .select("id,extracted_text")
+                .in_("id", missing[start:start + BACKFILL_CHUNK])
+                .execute()
+            )
+            for row in chunk.data or []:
+                text = row.get("extracted_text") or ""
+                sig = minhash_signature(text)
+                if sig is None:
+                    continue
+                signatures[str(row["id"])] = sig
+                save_vector(hr_id, row["id"], hash_features(text), minhash=sig)
+
+        for row in rows:
+            yield row["id"], signatures.get(str(row["id"])), row.get("duplicate_of")
+    return load
+
+
+# ---------------- CROSS-WORKER CATCH-UP ---------------- #
+
+_synced = {}  # hr_id -> (data version, created_at watermark)
+_sync_locks = {}
+_sync_locks_guard = threading.Lock()
+
+
+def _hr_lock(hr_id: str) -> threading.Lock:
+    with _sync_locks_guard:
+        return _sync_locks.setdefault(hr_id, threading.Lock())
+
+
+def sync_features(hr_id: str) -> int:
+    """
+    Adds resumes stored by other workers to this process's loaded DF
+    table, search index and duplicate index for the HR. Call before using
+    them; it costs one cached version check when nothing changed.
+    Structures built after the first call load everything themselves.
+    Returns the number of resumes added.
+    """
+    version = data_version(hr_id)
+    with _hr_lock(hr_id):
+        state = _synced.get(hr_id)
+        started = datetime.utcnow()
+        if state is None:
+            _synced[hr_id] = (version, started.isoformat())
+            return 0
+        if state[0] == version:
+            return 0
+
+        targets = {
+            "dup": loaded_duplicate_index(hr_id),
+            "index": loaded_index(hr_id),
+            "df": loaded_df_table(hr_id),
+        }
+        targets = {name: t for name, t in targets.items() if t is not None}
+        added = 0
+        if targets:
+            since = (datetime.fromisoformat(state[1]) - SYNC_OVERLAP).isoformat()
+            rows = [
+                row for row in _scored_rows(hr_id, "id,duplicate_of", order=("created_at", "id"), since=since)
+                if any(row["id"] not in t for t in targets.values())
+            ]
+            added = _add_rows(hr_id, rows, targets)
+        _synced[hr_id] = (version, started.isoformat())
+    if added:
+        logger.info(f"Caught up {added} resumes stored by other workers for {hr_id}")
+    return added
+
+
+def _add_rows(hr_id: str, rows: list, targets: dict) -> int:
+    features = {}  # id -> (indices, values, minhash)
+    missing = []
+    for row in rows:
+        arrays = load_arrays(hr_id, row["id"])
+        if arrays is not None and "minhash" in arrays:
+            features[str(row["id"])] = (arrays["indices"], arrays["values"], arrays["minhash"])
+        else:
+            missing.append(row["id"])
+
+    # The storing worker writes vectors right after the insert; hash the
+    # text of any it has not written yet rather than wait for them
+    for start in range(0, len(missing), BACKFILL_CHUNK):
+        chunk = (
+            supabase
+            .table("resumes")
+            .select("id,extracted_text")
+            .in_("id", missing[start:start + BACKFILL_CHUNK])
+            .execute()
+        )
+        for row in chunk.data or []:
+            text = row.get("extracted_text") or ""
+            vec = hash_features(text)
+            if vec is not None:
+                features[str(row["id"])] = (vec.indices, vec.data, minhash_signature(text))
+
+    added = 0
+    for row in rows:
+        found = features.get(str(row["id"]))
+        if found is None:
+            continue
+        indices, values, sig = found
+        if "dup" in targets:
+            targets["dup"].add(row["id"], sig, row.get("duplicate_of"))
+        if "index" in targets:
+            targets["index"].add(row["id"], indices, values)
+        if "df" in targets:
+            targets["df"].add(indices, row["id"])
+        added += 1
+    return added
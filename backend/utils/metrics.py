@@ -0,0 +1,397 @@
+# backend/utils/metrics.py
+
+"""
+Minimal Prometheus-compatible metrics (counters, gauges, histograms) for
+the pipeline, rendered in the text exposition format at /metrics.
+
+Updating a metric is a dict lookup and a few additions under a per-metric
+lock, cheap enough for every stage of every file. Values that other
+modules already count (cache hit/miss totals, pool sizes) are read only at
+scrape time through `register_collector`.
+
+    with stage("extract_text"):
+        text = extract_text(path)
+
+times the block into `hirelens_stage_seconds{stage=...}` and counts an
+exception in `hirelens_stage_failures_total{stage=...}` before re-raising.
+
+Under the pre-fork server each worker has its own values. When
+`enable_multiprocess(directory)` was called (the server does this before
+forking), every process writes a JSON snapshot to the directory every
+METRICS_FLUSH_INTERVAL seconds and on /metrics, and a scrape served by any
+worker merges them: counters and histograms are summed over all workers,
+including exited ones (the master folds their final snapshot into
+retired.json), gauges over live workers only.
+"""
+
+import bisect
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from backend.config import METRICS_FLUSH_INTERVAL
+from backend.utils.profiler import current_session
+from backend.utils import tracing
+
+logger = logging.getLogger("hirelens")
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+RETIRED_FILE = "retired.json"
+
+_registry: Dict[str, "_Metric"] = {}
+_collectors: List[Callable[[], Iterable[tuple]]] = []
+_multiprocess_dir: Optional[str] = None
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry[name] = self
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(name, "")) for name in self.labels)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            samples = [[list(k), v if not isinstance(v, list) else list(v)] for k, v in self._values.items()]
+        return {"type": self.type, "help": self.help, "labels": list(self.labels), "samples": samples}
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    type = "gauge"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    @contextmanager
+    def track(self, **labels):
+        """Counts the block as in flight while it runs."""
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            # Per-bucket (non-cumulative) counts, then +Inf, sum and count
+            values = self._values.get(key)
+            if values is None:
+                values = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            values[index] += 1
+            values[-2] += value
+            values[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def snapshot(self) -> dict:
+        data = super().snapshot()
+        data["buckets"] = list(self.buckets)
+        return data
+
+
+# ---------------- PIPELINE METRICS ---------------- #
+
+STAGE_SECONDS = Histogram(
+    "hirelens_stage_seconds", "Time spent in each upload/dashboard stage", ("stage",)
+)
+STAGE_FAILURES = Counter(
+    "hirelens_stage_failures_total", "Exceptions raised by each stage", ("stage",)
+)
+UPLOAD_FILES = Counter(
+    "hirelens_upload_files_total", "Resume files processed, by resulting status", ("status",)
+)
+DUPLICATES = Counter("hirelens_duplicate_resumes_total", "Resumes flagged as near-duplicates")
+OCR_PAGES = Counter("hirelens_ocr_pages_total", "PDF pages run through OCR")
+IN_FLIGHT = Gauge("hirelens_in_flight", "Operations currently running", ("kind",))
+HTTP_REQUESTS = Counter(
+    "hirelens_http_requests_total", "HTTP requests", ("method", "route", "status")
+)
+HTTP_SECONDS = Histogram(
+    "hirelens_http_request_seconds", "HTTP request latency (until the response starts)", ("method", "route")
+)
+
+
+@contextmanager
+def stage(name: str, **attributes):
+    """
+    Times a pipeline stage; also a trace span (yielded, so the block can
+    add attributes such as byte sizes).
+    """
+    started = time.perf_counter()
+    try:
+        with tracing.span(name, **attributes) as span:
+            yield span
+    except BaseException:
+        STAGE_FAILURES.inc(stage=name)
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_SECONDS.observe(elapsed, stage=name)
+        session = current_session()
+        if session is not None:
+            session.add_stage(name, elapsed)
+
+
+def timed(name: str):
+    """Decorator form of `stage`."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def register_collector(collector: Callable[[], Iterable[tuple]]) -> None:
+    """
+    Adds a scrape-time source of samples. `collector()` yields
+    (name, type, help, {label: value}, value) tuples.
+    """
+    _collectors.append(collector)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request counts, latency and in-flight requests."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                status["elapsed"] = time.perf_counter() - started
+            await send(message)
+
+        IN_FLIGHT.inc(kind="http_requests")
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            IN_FLIGHT.dec(kind="http_requests")
+            route = scope.get("route")
+            # Route templates, not raw paths, keep label cardinality bounded
+            path = getattr(route, "path", None) or "unmatched"
+            method = scope.get("method", "")
+            HTTP_REQUESTS.inc(method=method, route=path, status=status["code"])
+            HTTP_SECONDS.observe(status.get("elapsed", time.perf_counter() - started), method=method, route=path)
+
+
+# ---------------- COLLECTION & RENDERING ---------------- #
+
+def collect() -> Dict[str, dict]:
+    """This process's metrics as {name: snapshot}."""
+    data = {name: metric.snapshot() for name, metric in list(_registry.items())}
+    for collector in _collectors:
+        try:
+            for name, kind, help, labels, value in collector():
+                entry = data.setdefault(
+                    name, {"type": kind, "help": help, "labels": list(labels), "samples": []}
+                )
+                entry["samples"].append([[str(labels[k]) for k in entry["labels"]], value])
+        except Exception as e:
+            logger.warning(f"Metrics collector failed: {e}")
+    return data
+
+
+def _merge(into: Dict[str, dict], data: Dict[str, dict], include_gauges: bool = True) -> None:
+    for name, entry in data.items():
+        if entry["type"] == "gauge" and not include_gauges:
+            continue
+        target = into.setdefault(name, {**entry, "samples": []})
+        merged = {tuple(k): v for k, v in target["samples"]}
+        for key, value in entry["samples"]:
+            key = tuple(key)
+            current = merged.get(key)
+            if current is None:
+                merged[key] = list(value) if isinstance(value, list) else value
+            elif isinstance(value, list):
+                merged[key] = [a + b for a, b in zip(current, value)]
+            else:
+                merged[key] = current + value
+        target["samples"] = [[list(k), v] for k, v in merged.items()]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_text(data: Dict[str, dict]) -> str:
+    lines = []
+    for name in sorted(data):
+        entry = data[name]
+        lines.append(f"# HELP {name} {entry['help']}")
+        lines.append(f"# TYPE {name} {entry['type']}")
+        names = entry["labels"]
+        for values, value in sorted(entry["samples"], key=lambda s: s[0]):
+            if entry["type"] != "histogram":
+                lines.append(f"{name}{_labels(names, values)} {_format(value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip(entry["buckets"] + ["+Inf"], value[:-2]):
+                cumulative += count
+                le = bound if bound == "+Inf" else _format(float(bound))
+                bucket_labels = _labels(names, values, 'le="' + le + '"')
+                lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{name}_sum{_labels(names, values)} {_format(value[-2])}")
+            lines.append(f"{name}_count{_labels(names, values)} {value[-1]}")
+    return "\n".join(lines) + "\n"
+
+
+# ---------------- MULTI-PROCESS ---------------- #
+
+def enable_multiprocess(directory: str) -> None:
+    """Shares metrics between pre-forked workers through `directory` (call before forking)."""
+    global _multiprocess_dir
+    os.makedirs(directory, exist_ok=True)
+    for name in os.listdir(directory):
+        if name.endswith(".json"):
+            os.unlink(os.path.join(directory, name))
+    _multiprocess_dir = directory
+
+
+def _write_json(path: str, data) -> None:
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def _read_json(path: str) -> Optional[dict]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def flush() -> None:
+    """Writes this process's snapshot (no-op outside multi-process mode)."""
+    if _multiprocess_dir is None:
+        return
+    try:
+        _write_json(os.path.join(_multiprocess_dir, f"{os.getpid()}.json"), collect())
+    except OSError as e:
+        logger.warning(f"Metrics flush failed: {e}")
+
+
+def start_flusher() -> None:
+    """Starts the periodic snapshot thread in a worker process."""
+    if _multiprocess_dir is None:
+        return
+
+    def run():
+        while True:
+            time.sleep(METRICS_FLUSH_INTERVAL)
+            flush()
+
+    threading.Thread(target=run, name="metrics-flush", daemon=True).start()
+
+
+def retire(pid: int) -> None:
+    """Folds an exited worker's counters into retired.json (called by the master)."""
+    if _multiprocess_dir is None:
+        return
+    path = os.path.join(_multiprocess_dir, f"{pid}.json")
+    data = _read_json(path)
+    if data is None:
+        return
+    retired_path = os.path.join(_multiprocess_dir, RETIRED_FILE)
+    retired = _read_json(retired_path) or {}
+    _merge(retired, data, include_gauges=False)
+    _write_json(retired_path, retired)
+    os.unlink(path)
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+        return True
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+
+
+def render() -> str:
+    """The /metrics body: this process, or all workers in multi-process mode."""
+    if _multiprocess_dir is None:
+        return render_text(collect())
+
+    flush()
+    merged = {}
+    for name in sorted(os.listdir(_multiprocess_dir)):
+        if not name.endswith(".json"):
+            continue
+        data = _read_json(os.path.join(_multiprocess_dir, name))
+        if data is None:
+            continue
+        if name == RETIRED_FILE:
+            _merge(merged, data, include_gauges=False)
+        else:
+            _merge(merged, data, include_gauges=_alive(int(name[:-5])))
+    return render_text(merged)
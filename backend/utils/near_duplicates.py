@@ -0,0 +1,146 @@
+# backend/utils/near_duplicates.py
+
+"""
+Near-duplicate resume detection with MinHash signatures and LSH banding.
+
+Signatures are computed from word 3-gram shingles of the normalised text,
+so the same resume re-exported as PDF/DOCX or lightly edited still lands
+in a shared LSH bucket. Lookups only compare against records that share a
+bucket, which keeps insert-time checks sublinear in the number of resumes.
+"""
+
+import re
+import threading
+import zlib
+from typing import Callable, Iterable, Optional
+
+import numpy as np
+
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS  # 16 bands x 8 rows → candidate threshold ≈ 0.7
+SHINGLE_SIZE = 3
+DUPLICATE_THRESHOLD = 0.8  # estimated Jaccard similarity to flag a duplicate
+
+_PRIME = np.uint64((1 << 31) - 1)
+_rng = np.random.default_rng(20240611)  # fixed seed: signatures are persisted
+_A = _rng.integers(1, int(_PRIME), size=NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, int(_PRIME), size=NUM_PERM, dtype=np.uint64)
+
+
+def _normalize(text: str) -> str:
+    text = text.lower()
+    text = re.sub(r"[^\w\s]", " ", text)
+    text = re.sub(r"\s+", " ", text)
+    return text.strip()
+
+
+def _shingles(text: str) -> np.ndarray:
+    words = _normalize(text).split()
+    if len(words) < SHINGLE_SIZE:
+        grams = words
+    else:
+        grams = (" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1))
+    hashes = {zlib.crc32(g.encode("utf-8")) for g in grams}
+    return np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+
+
+def minhash_signature(text: str) -> Optional[np.ndarray]:
+    """Returns a NUM_PERM uint32 MinHash signature, or None for empty text."""
+    if not text:
+        return None
+    x = _shingles(text)
+    if len(x) == 0:
+        return None
+    x %= _PRIME
+    hashed = (_A[:, None] * x[None, :] + _B[:, None]) % _PRIME
+    return hashed.min(axis=1).astype(np.uint32)
+
+
+def estimated_similarity(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+    return float(np.count_nonzero(sig_a == sig_b)) / len(sig_a)
+
+
+class DuplicateIndex:
+    """
+    LSH index of MinHash signatures for one HR.
+    Records keep insertion order so a duplicate links to the earliest copy.
+    """
+
+    def __init__(self):
+        self._buckets = {}  # (band, band bytes) -> [record ids]
+        self._records = {}  # record id -> (order, signature, canonical id)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, record_id) -> bool:
+        return str(record_id) in self._records
+
+    def _band_keys(self, sig: np.ndarray):
+        for band in range(BANDS):
+            yield band, sig[band * ROWS:(band + 1) * ROWS].tobytes()
+
+    def find_duplicate(self, sig: np.ndarray) -> Optional[str]:
+        """
+        Returns the id of the earliest record this signature duplicates,
+        or None.
+        """
+        if sig is None:
+            return None
+        with self._lock:
+            candidates = set()
+            for key in self._band_keys(sig):
+                candidates.update(self._buckets.get(key, ()))
+
+            best = None
+            for record_id in candidates:
+                order, other, canonical = self._records[record_id]
+                if estimated_similarity(sig, other) < DUPLICATE_THRESHOLD:
+                    continue
+                root_order = self._records[canonical][0] if canonical in self._records else order
+                if best is None or root_order < best[0]:
+                    best = (root_order, canonical)
+            return best[1] if best else None
+
+    def add(self, record_id, sig: np.ndarray, duplicate_of=None) -> None:
+        if sig is None or record_id is None:
+            return
+        record_id = str(record_id)
+        canonical = str(duplicate_of) if duplicate_of else record_id
+        with self._lock:
+            if record_id in self._records:
+                return
+            self._records[record_id] = (len(self._records), sig, canonical)
+            for key in self._band_keys(sig):
+                self._buckets.setdefault(key, []).append(record_id)
+
+
+_INDEXES = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def get_duplicate_index(hr_id: str, loader: Optional[Callable[[], Iterable]] = None) -> DuplicateIndex:
+    """
+    Returns the HR's duplicate index, building it on first use.
+    `loader` should yield (record_id, signature, duplicate_of), oldest first.
+    """
+    index = _INDEXES.get(hr_id)
+    if index is not None:
+        return index
+
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(hr_id)
+        if index is None:
+            index = DuplicateIndex()
+            if loader is not None:
+                for record_id, sig, duplicate_of in loader():
+                    index.add(record_id, sig, duplicate_of)
+            _INDEXES[hr_id] = index
+    return index
+
+
+def loaded_duplicate_index(hr_id: str) -> Optional[DuplicateIndex]:
+    """The HR's duplicate index if this process has built it, else None."""
+    return _INDEXES.get(hr_id)
@@ -1,7 +1,8 @@
-from typing import Tuple
-from sklearn.feature_extraction.text import HashingVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from typing import Optional, Tuple
 import re
+import threading
+
+from backend.utils.doc_frequency import HASH_FEATURES, get_df_table
 
 def _clean_text(text: str) -> str:
     """Standardizes text: lowercase, removes special chars, collapses spaces."""
@@ -12,38 +13,88 @@ def _clean_text(text: str) -> str:
     text = re.sub(r"\s+", " ", text)
     return text.strip()
 
-_VECT = HashingVectorizer(
-    n_features=2**18,
-    alternate_sign=False,
-    ngram_range=(1, 2),
-    norm='l2'
-)
-
-def jd_resume_similarity(job_desc: str, resume_text: str) -> Tuple[float, float]:
-    """
-    Computes cosine similarity between Job Description and Resume using TF-IDF.
-    
-    Refactored for stability on small corpora (2 docs):
-    - Removed max_df=0.95 (caused vocabulary collapse when terms appeared in both docs)
-    - Added sublinear_tf=True (log scaling) to dampen effect of repeated terms in long resumes
-    - Added defensive checks for minimal text length
-    """
-    job = _clean_text(job_desc)
-    res = _clean_text(resume_text)
-    
-    # 1. Defensive Check: Ensure texts are not empty or too short to be meaningful
-    if not job or len(job) < 10 or not res or len(res) < 10:
-        return 0.0, 0.0
+# sklearn is imported on first use; it dominates app import time otherwise
+_VECT = None
+_VECT_LOCK = threading.Lock()
+
+def _vectorizer():
+    global _VECT
+    if _VECT is None:
+        with _VECT_LOCK:
+            if _VECT is None:
+                from sklearn.feature_extraction.text import HashingVectorizer
+                _VECT = HashingVectorizer(
+                    n_features=HASH_FEATURES,
+                    alternate_sign=False,
+                    ngram_range=(1, 2),
+                    norm='l2'
+                )
+    return _VECT
+
+def hash_features(text: str):
+    """
+    Hashes text into an L2-normalised sparse row (1 x HASH_FEATURES).
+    Returns None when the text is too short to be meaningful.
+    """
+    cleaned = _clean_text(text)
+    if not cleaned or len(cleaned) < 10:
+        return None
 
     # Trim extremely long resumes to reduce processing time
-    if len(res) > 12000:
-        res = res[:12000]
+    if len(cleaned) > 12000:
+        cleaned = cleaned[:12000]
+
+    return _vectorizer().transform([cleaned])
+
+def _apply_idf(vec, table):
+    from sklearn.preprocessing import normalize
+
+    weighted = vec.copy()
+    weighted.data = weighted.data * table.idf(weighted.indices)
+    return normalize(weighted, norm="l2", copy=False)
+
+def query_vector(job_desc: str, hr_id: Optional[str] = None):
+    """
+    Hashed JD vector with the HR's IDF weights applied (query-side only),
+    for ranking stored resume vectors. None if the JD is too short.
+    """
+    vec = hash_features(job_desc)
+    if vec is None or hr_id is None:
+        return vec
+    table = get_df_table(hr_id)
+    return _apply_idf(vec, table) if table.ready else vec
+
+def vector_similarity(v_job, v_res, hr_id: Optional[str] = None) -> Tuple[float, float]:
+    """
+    Cosine similarity between two hashed vectors.
+
+    When `hr_id` is given and its document-frequency table has seen enough
+    resumes, both vectors are IDF-weighted at query time so boilerplate
+    terms count less than rare, specific ones.
+    """
+    if v_job is None or v_res is None:
+        return 0.0, 0.0
 
     try:
-        v_job = _VECT.transform([job])
-        v_res = _VECT.transform([res])
+        from sklearn.metrics.pairwise import cosine_similarity
+
+        if hr_id is not None:
+            table = get_df_table(hr_id)
+            if table.ready:
+                v_job = _apply_idf(v_job, table)
+                v_res = _apply_idf(v_res, table)
         sim = cosine_similarity(v_job, v_res)[0][0]
         score_0_100 = round(sim * 100, 2)
         return float(sim), float(score_0_100)
     except Exception:
         return 0.0, 0.0
+
+def jd_resume_similarity(job_desc: str, resume_text: str, hr_id: Optional[str] = None) -> Tuple[float, float]:
+    """
+    Computes cosine similarity between Job Description and Resume.
+
+    Uses hashed uni/bi-gram features (no per-pair fitting); IDF weights come
+    from the incrementally maintained DF table for `hr_id`, if any.
+    Returns (0.0, 0.0) for empty or very short texts.
+    """
+    return vector_similarity(hash_features(job_desc), hash_features(resume_text), hr_id)
@@ -0,0 +1,337 @@
+# backend/utils/notification_queue.py
+
+"""
+Queued delivery of candidate notification emails over pooled SMTP.
+
+- A small pool (SMTP_POOL_SIZE) of persistent, authenticated connections
+  is shared by the worker threads; idle connections are checked with NOOP
+  before reuse and replaced when the server has dropped them.
+- Each worker takes up to SMTP_BATCH_SIZE queued messages and sends them
+  over one connection checkout.
+- A token bucket caps throughput at SMTP_RATE_LIMIT messages per second
+  across all workers (relays such as Brevo throttle bursts).
+- Temporary failures (4xx replies, dropped connections) are retried with
+  exponential backoff up to SMTP_MAX_RETRIES; permanent 5xx rejections
+  are dropped and counted.
+- A message can carry an `on_done(sent)` callback, called once it was
+  delivered (True) or given up on (False), including when `abandon()`
+  drops whatever is still queued at shutdown.
+
+OTP and password-reset mail goes through its own single-connection pool
+(`transactional_pool`), so it never waits behind a bulk notification run.
+
+For local testing, point SMTP_HOST/SMTP_PORT at a stand-in server with
+SMTP_STARTTLS=false and no credentials, e.g. `python -m aiosmtpd -n -l localhost:1025`.
+"""
+
+import logging
+import queue
+import random
+import smtplib
+import ssl
+import threading
+import time
+from contextlib import contextmanager
+from email.message import EmailMessage
+from typing import Callable, Optional
+
+from backend.config import (
+    SMTP_HOST, SMTP_PORT, SMTP_STARTTLS, SMTP_USERNAME, SMTP_PASSWORD,
+    SENDER_EMAIL, SENDER_NAME, SMTP_POOL_SIZE, SMTP_BATCH_SIZE,
+    SMTP_RATE_LIMIT, SMTP_MAX_RETRIES,
+)
+
+logger = logging.getLogger("hirelens")
+
+IDLE_CHECK_SECONDS = 30
+RETRY_BASE_SECONDS = 2.0
+RETRY_MAX_SECONDS = 120.0
+
+
+class SMTPConnectionPool:
+    """Bounded pool of logged-in SMTP connections."""
+
+    def __init__(self, host: str, port: int, starttls: bool, username: Optional[str],
+                 password: Optional[str], size: int, connect: Callable = smtplib.SMTP):
+        self.host = host
+        self.port = port
+        self.starttls = starttls
+        self.username = username
+        self.password = password
+        self._connect = connect
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self.opened = 0
+
+    def _open(self):
+        server = self._connect(self.host, self.port, timeout=10)
+        if self.starttls:
+            server.starttls(context=ssl.create_default_context())
+        if self.username and self.password:
+            server.login(self.username, self.password)
+        self.opened += 1
+        return server
+
+    @staticmethod
+    def _close(server) -> None:
+        try:
+            server.quit()
+        except Exception:
+            try:
+                server.close()
+            except Exception:
+                pass
+
+    def _alive(self, server, idle_since: float) -> bool:
+        if time.monotonic() - idle_since < IDLE_CHECK_SECONDS:
+            return True
+        try:
+            return server.noop()[0] == 250
+        except Exception:
+            return False
+
+    @contextmanager
+    def connection(self):
+        """
+        Checks out a connection. If the body raises, the connection is
+        discarded rather than returned to the pool.
+        """
+        self._slots.acquire()
+        server = None
+        try:
+            while server is None:
+                try:
+                    candidate, idle_since = self._idle.get_nowait()
+                except queue.Empty:
+                    server = self._open()
+                    break
+                if self._alive(candidate, idle_since):
+                    server = candidate
+                else:
+                    self._close(candidate)
+            yield server
+        except BaseException:
+            if server is not None:
+                self._close(server)
+                server = None
+            raise
+        finally:
+            if server is not None:
+                self._idle.put((server, time.monotonic()))
+            self._slots.release()
+
+    def close_all(self) -> None:
+        while True:
+            try:
+                server, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._close(server)
+
+
+class RateLimiter:
+    """Token bucket shared by all senders."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class _Outgoing:
+    __slots__ = ("message", "attempts", "not_before", "on_done")
+
+    def __init__(self, message: EmailMessage, on_done: Optional[Callable[[bool], None]] = None):
+        self.message = message
+        self.attempts = 0
+        self.not_before = 0.0
+        self.on_done = on_done
+
+
+class NotificationQueue:
+    def __init__(self, pool: SMTPConnectionPool, workers: int, batch_size: int,
+                 limiter: RateLimiter, max_retries: int):
+        self.pool = pool
+        self.workers = workers
+        self.batch_size = batch_size
+        self.limiter = limiter
+        self.max_retries = max_retries
+        self._queue = queue.Queue()
+        self._threads = []
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self.batches = 0
+
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                t = threading.Thread(target=self._worker, name=f"smtp-{i}", daemon=True)
+                t.start()
+                self._threads.append(t)
+
+    def enqueue(self, message: EmailMessage, on_done: Optional[Callable[[bool], None]] = None) -> None:
+        self._start()
+        self._queue.put(_Outgoing(message, on_done))
+
+    def abandon(self) -> int:
+        """Drops every queued message, reporting each as not sent. Returns the count."""
+        dropped = 0
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            self._queue.task_done()
+            self._done(item, False)
+            dropped += 1
+        if dropped:
+            logger.warning(f"Dropped {dropped} queued emails")
+        return dropped
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Waits until every queued message was sent or given up on."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+    def _count(self, field: str, n: int = 1) -> None:
+        with self._stats_lock:
+            setattr(self, field, getattr(self, field) + n)
+
+    @staticmethod
+    def _done(item: _Outgoing, sent: bool) -> None:
+        if item.on_done is None:
+            return
+        try:
+            item.on_done(sent)
+        except Exception as e:
+            logger.error(f"Email delivery callback failed for {item.message['To']}: {e}")
+
+    def _take_batch(self) -> list:
+        batch = [self._queue.get()]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _retry(self, item: _Outgoing, error: Exception) -> None:
+        item.attempts += 1
+        if item.attempts > self.max_retries:
+            logger.error(f"Giving up on email to {item.message['To']}: {error}")
+            self._count("failed")
+            self._done(item, False)
+            return
+        delay = min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2 ** (item.attempts - 1))
+        item.not_before = time.monotonic() + delay * random.uniform(0.8, 1.2)
+        self._count("retried")
+        self._queue.put(item)
+
+    def _worker(self) -> None:
+        while True:
+            batch = self._take_batch()
+            now = time.monotonic()
+            ready = [m for m in batch if m.not_before <= now]
+            for item in batch:
+                if item.not_before > now:
+                    self._queue.put(item)  # still backing off
+            if not ready:
+                for _ in batch:
+                    self._queue.task_done()
+                time.sleep(min(1.0, min(m.not_before for m in batch) - now))
+                continue
+
+            self._send_batch(ready)
+            for _ in batch:
+                self._queue.task_done()
+
+    def _send_batch(self, batch: list) -> None:
+        self._count("batches")
+        remaining = list(batch)
+        try:
+            with self.pool.connection() as server:
+                while remaining:
+                    item = remaining[0]
+                    self.limiter.acquire()
+                    try:
+                        server.send_message(item.message)
+                        self._count("sent")
+                        self._done(item, True)
+                    except smtplib.SMTPRecipientsRefused as e:
+                        codes = [code for code, _ in e.recipients.values()]
+                        if all(400 <= code < 500 for code in codes):
+                            self._retry(item, e)
+                        else:
+                            logger.warning(f"Recipient refused {item.message['To']}: {e.recipients}")
+                            self._count("failed")
+                            self._done(item, False)
+                    except smtplib.SMTPResponseException as e:
+                        if 400 <= e.smtp_code < 500:
+                            self._retry(item, e)
+                        else:
+                            logger.warning(f"Email to {item.message['To']} rejected: {e}")
+                            self._count("failed")
+                            self._done(item, False)
+                    remaining.pop(0)
+        except Exception as e:
+            # Connection-level failure: the pool drops the connection; retry what is left
+            logger.warning(f"SMTP batch interrupted: {e}")
+            for item in remaining:
+                self._retry(item, e)
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "queued": self._queue.qsize(),
+                "sent": self.sent,
+                "failed": self.failed,
+                "retried": self.retried,
+                "batches": self.batches,
+                "connections_opened": self.pool.opened,
+            }
+
+
+def build_message(to: str, subject: str, body: str) -> EmailMessage:
+    msg = EmailMessage()
+    msg["From"] = f"{SENDER_NAME} <{SENDER_EMAIL}>"
+    msg["To"] = to
+    msg["Subject"] = subject
+    msg.set_content(body)
+    return msg
+
+
+smtp_pool = SMTPConnectionPool(
+    SMTP_HOST, SMTP_PORT, SMTP_STARTTLS, SMTP_USERNAME, SMTP_PASSWORD, SMTP_POOL_SIZE
+)
+# Kept apart from the bulk pool: its workers hold their slots for whole batches
+transactional_pool = SMTPConnectionPool(
+    SMTP_HOST, SMTP_PORT, SMTP_STARTTLS, SMTP_USERNAME, SMTP_PASSWORD, 1
+)
+notifications = NotificationQueue(
+    smtp_pool, SMTP_POOL_SIZE, SMTP_BATCH_SIZE, RateLimiter(SMTP_RATE_LIMIT), SMTP_MAX_RETRIES
+)
@@ -0,0 +1,338 @@
+# backend/utils/profiler.py
+
+"""
+On-demand request profiling.
+
+Profiling is switched on at runtime (POST /debug/profiling) for a fraction
+of requests and/or for specific hr_ids, for a limited time. The settings
+live in PROFILE_DIR/settings.json, so one call reaches every worker; each
+worker re-checks the file's mtime at most once a second. While profiling
+is off, a request costs one clock comparison.
+
+A profiled request gets a `ProfileSession` in a context variable. It
+collects:
+
+- stack samples: a sampler thread reads `sys._current_frames()` every
+  PROFILER_INTERVAL_MS for the threads working on the request (run_io
+  registers I/O pool threads while they run a call for it) and counts
+  folded stacks ("outer;inner;leaf"), the input format of flame graph
+  tools such as speedscope or flamegraph.pl;
+- per-stage timings from `metrics.stage`.
+
+Requests that end up slower than the threshold are written to PROFILE_DIR
+as JSON (newest PROFILE_MAX_FILES are kept) and listed under
+/debug/profiles.
+
+Requests for an hr_id that is only known from a form body are matched
+when the route calls `tag_hr(hr_id)`; sampling starts from that point.
+"""
+
+import contextvars
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from typing import List, Optional
+from urllib.parse import parse_qs
+
+from backend.config import PROFILE_DIR, PROFILE_MAX_FILES, PROFILER_INTERVAL_MS
+
+logger = logging.getLogger("hirelens")
+
+SETTINGS_FILE = "settings.json"
+SETTINGS_CHECK_SECONDS = 1.0
+MAX_STACK_DEPTH = 128
+
+_current: contextvars.ContextVar = contextvars.ContextVar("profile_session", default=None)
+
+
+class ProfileSession:
+    def __init__(self, method: str, path: str, hr_id: Optional[str], active: bool, threshold_ms: float):
+        self.id = uuid.uuid4().hex[:16]
+        self.method = method
+        self.path = path
+        self.hr_id = hr_id
+        self.active = active
+        self.threshold_ms = threshold_ms
+        self.started = time.perf_counter()
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        self.threads = set()
+        self.stacks = Counter()
+        self.samples = 0
+        self.stages = {}  # name -> [count, seconds]
+        self._lock = threading.Lock()
+
+    def add_stage(self, name: str, seconds: float) -> None:
+        with self._lock:
+            entry = self.stages.setdefault(name, [0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+
+    def add_stack(self, stack: str) -> None:
+        with self._lock:
+            self.stacks[stack] += 1
+            self.samples += 1
+
+    def report(self, duration: float) -> dict:
+        with self._lock:
+            return {
+                "id": self.id,
+                "method": self.method,
+                "path": self.path,
+                "hr_id": self.hr_id,
+                "started_at": self.started_at,
+                "duration_ms": round(duration * 1000, 1),
+                "interval_ms": PROFILER_INTERVAL_MS,
+                "samples": self.samples,
+                "stages": [
+                    {"stage": name, "count": count, "ms": round(seconds * 1000, 1)}
+                    for name, (count, seconds) in sorted(self.stages.items(), key=lambda s: -s[1][1])
+                ],
+                "stacks": dict(self.stacks.most_common()),
+            }
+
+
+def current_session() -> Optional[ProfileSession]:
+    return _current.get()
+
+
+def tag_hr(hr_id: str) -> None:
+    """Starts sampling the current request if profiling targets this hr_id."""
+    session = _current.get()
+    if session is not None and not session.active and hr_id in _settings.hr_ids:
+        session.hr_id = hr_id
+        session.active = True
+
+
+def register_thread(session: ProfileSession) -> None:
+    session.threads.add(threading.get_ident())
+
+
+def unregister_thread(session: ProfileSession) -> None:
+    session.threads.discard(threading.get_ident())
+
+
+# ---------------- SETTINGS ---------------- #
+
+class _Settings:
+    def __init__(self):
+        self.sample_rate = 0.0
+        self.hr_ids = frozenset()
+        self.threshold_ms = 1000.0
+        self.until = 0.0  # wall clock
+        self._mtime = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return (self.sample_rate > 0 or bool(self.hr_ids)) and time.time() < self.until
+
+    def as_dict(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "hr_ids": sorted(self.hr_ids),
+            "threshold_ms": self.threshold_ms,
+            "until": datetime.fromtimestamp(self.until, timezone.utc).isoformat() if self.until else None,
+        }
+
+    def refresh(self) -> None:
+        now = time.monotonic()
+        if now - self._checked < SETTINGS_CHECK_SECONDS:
+            return
+        with self._lock:
+            if now - self._checked < SETTINGS_CHECK_SECONDS:
+                return
+            self._checked = now
+            path = os.path.join(PROFILE_DIR, SETTINGS_FILE)
+            try:
+                mtime = os.stat(path).st_mtime
+            except FileNotFoundError:
+                mtime = None
+            if mtime == self._mtime:
+                return
+            self._mtime = mtime
+            data = {}
+            if mtime is not None:
+                try:
+                    with open(path) as f:
+                        data = json.load(f)
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Unreadable profiler settings: {e}")
+            self.sample_rate = float(data.get("sample_rate", 0.0))
+            self.hr_ids = frozenset(data.get("hr_ids", []))
+            self.threshold_ms = float(data.get("threshold_ms", 1000.0))
+            self.until = float(data.get("until", 0.0))
+
+
+_settings = _Settings()
+
+
+def get_settings() -> dict:
+    _settings._checked = 0.0
+    _settings.refresh()
+    return _settings.as_dict()
+
+
+def configure(sample_rate: float, hr_ids: List[str], threshold_ms: float, duration_s: float) -> dict:
+    """Turns profiling on (or off, with rate 0 and no hr_ids) for every worker."""
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    data = {
+        "sample_rate": max(0.0, min(1.0, sample_rate)),
+        "hr_ids": sorted(set(hr_ids)),
+        "threshold_ms": max(0.0, threshold_ms),
+        "until": time.time() + max(0.0, duration_s),
+    }
+    path = os.path.join(PROFILE_DIR, SETTINGS_FILE)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+    return get_settings()
+
+
+# ---------------- SAMPLER ---------------- #
+
+_sessions = set()
+_sessions_lock = threading.Lock()
+_sampler: Optional[threading.Thread] = None
+
+
+def _folded(frame) -> str:
+    parts = []
+    while frame is not None and len(parts) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        parts.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(parts))
+
+
+def _sample_loop() -> None:
+    global _sampler
+    interval = PROFILER_INTERVAL_MS / 1000
+    while True:
+        time.sleep(interval)
+        with _sessions_lock:
+            sessions = [s for s in _sessions if s.active and s.threads]
+            if not _sessions:
+                _sampler = None
+                return
+        if not sessions:
+            continue
+        frames = sys._current_frames()
+        for session in sessions:
+            for ident in list(session.threads):
+                frame = frames.get(ident)
+                if frame is not None:
+                    session.add_stack(_folded(frame))
+
+
+def _track(session: ProfileSession) -> None:
+    global _sampler
+    with _sessions_lock:
+        _sessions.add(session)
+        if _sampler is None:
+            _sampler = threading.Thread(target=_sample_loop, name="profiler", daemon=True)
+            _sampler.start()
+
+
+def _untrack(session: ProfileSession) -> None:
+    with _sessions_lock:
+        _sessions.discard(session)
+
+
+# ---------------- STORAGE ---------------- #
+
+def _save(report: dict) -> None:
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    path = os.path.join(PROFILE_DIR, f"{report['id']}.json")
+    with open(path, "w") as f:
+        json.dump(report, f)
+    saved = sorted(
+        (e for e in os.scandir(PROFILE_DIR) if e.name.endswith(".json") and e.name != SETTINGS_FILE),
+        key=lambda e: e.stat().st_mtime,
+    )
+    for entry in saved[:-PROFILE_MAX_FILES]:
+        try:
+            os.unlink(entry.path)
+        except FileNotFoundError:
+            pass
+    logger.info(f"Saved profile {report['id']} for {report['method']} {report['path']} ({report['duration_ms']} ms)")
+
+
+def list_profiles() -> List[dict]:
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+    profiles = []
+    for entry in os.scandir(PROFILE_DIR):
+        if not entry.name.endswith(".json") or entry.name == SETTINGS_FILE:
+            continue
+        try:
+            with open(entry.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        profiles.append({k: data.get(k) for k in ("id", "method", "path", "hr_id", "started_at", "duration_ms", "samples")})
+    return sorted(profiles, key=lambda p: p["started_at"] or "", reverse=True)
+
+
+def load_profile(profile_id: str) -> Optional[dict]:
+    if not profile_id.isalnum():
+        return None
+    try:
+        with open(os.path.join(PROFILE_DIR, f"{profile_id}.json")) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def folded_text(profile: dict) -> str:
+    return "".join(f"{stack} {count}\n" for stack, count in profile.get("stacks", {}).items())
+
+
+# ---------------- MIDDLEWARE ---------------- #
+
+class ProfilerMiddleware:
+    """Starts a ProfileSession for requests selected by the runtime settings."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        _settings.refresh()
+        if not _settings.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        hr_id = (query.get("hr_id") or [None])[0]
+        sampled = random.random() < _settings.sample_rate
+        targeted = hr_id is not None and hr_id in _settings.hr_ids
+        session = ProfileSession(
+            scope.get("method", ""), scope.get("path", ""), hr_id,
+            active=sampled or targeted, threshold_ms=_settings.threshold_ms,
+        )
+        # The event-loop thread is shared by all requests, so it is not sampled
+        token = _current.set(session)
+        _track(session)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _untrack(session)
+            _current.reset(token)
+            duration = time.perf_counter() - session.started
+            if session.active and duration * 1000 >= session.threshold_ms:
+                try:
+                    _save(session.report(duration))
+                except OSError as e:
+                    logger.warning(f"Could not save profile: {e}")
@@ -0,0 +1,149 @@
+# backend/utils/response_cache.py
+
+"""
+Versioned response cache for dashboard endpoints.
+
+Responses are keyed by (endpoint, hr_id, query params, data version).
+The data version combines a local counter, bumped by uploads/rescores in
+this process, with the HR's `hr_stats.updated_at`, re-read at most every
+DATA_VERSION_TTL seconds so changes made by other workers are picked up.
+Every response carries a strong ETag hashed from its body, so all workers
+agree on it; a matching If-None-Match gets a 304 (served from the cache
+without rebuilding the body when the entry is there). Memory is bounded
+by entry count and bytes.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from backend.config import RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_MAX_BYTES, DATA_VERSION_TTL
+from backend.supabase_client import supabase
+from backend.utils.metrics import stage
+
+
+class ResponseCache:
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (etag, body)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, etag: str, body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old[1])
+            self._entries[key] = (etag, body)
+            self._bytes += len(body)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.evictions += 1
+
+    def record_not_modified(self) -> None:
+        with self._lock:
+            self.not_modified += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "not_modified": self.not_modified,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+_CACHE = ResponseCache(RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_MAX_BYTES)
+
+_local_versions = {}  # hr_id -> int
+_shared_versions = {}  # hr_id -> (hr_stats.updated_at, checked_at)
+_versions_lock = threading.Lock()
+
+
+def bump_version(hr_id: str) -> None:
+    """Marks an HR's dashboard data as changed (call after uploads/rescores)."""
+    with _versions_lock:
+        _local_versions[hr_id] = _local_versions.get(hr_id, 0) + 1
+        _shared_versions.pop(hr_id, None)
+
+
+def data_version(hr_id: str) -> str:
+    now = time.monotonic()
+    with _versions_lock:
+        local = _local_versions.get(hr_id, 0)
+        shared = _shared_versions.get(hr_id)
+    if shared is None or now - shared[1] > DATA_VERSION_TTL:
+        with stage("data_version"):
+            res = supabase.table("hr_stats").select("updated_at").eq("hr_id", hr_id).limit(1).execute()
+        updated_at = res.data[0].get("updated_at") if res.data else None
+        shared = (str(updated_at), now)
+        with _versions_lock:
+            _shared_versions[hr_id] = shared
+    return f"{local}:{shared[0]}"
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    return header.strip() == "*" or etag in [t.strip() for t in header.split(",")]
+
+
+def cached_json(request: Request, hr_id: str, builder: Callable[[], object], variant=None) -> Response:
+    """
+    Serves a JSON dashboard response from the cache, building it with
+    `builder()` on a miss. Answers 304 when the client's ETag is current.
+    `variant` is added to the key for responses that also depend on time.
+    """
+    params = sorted((k, v) for k, v in request.query_params.multi_items())
+    version = data_version(hr_id)
+    key = (request.url.path, hr_id, tuple(params), version, variant)
+
+    entry = _CACHE.get(key)
+    if entry is None:
+        body = json.dumps(jsonable_encoder(builder()), separators=(",", ":")).encode("utf-8")
+        # Hashing the body (not the key, whose counter is per process) gives
+        # every worker the same ETag for the same data
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        _CACHE.put(key, etag, body)
+    else:
+        etag, body = entry
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if _etag_matches(request, etag):
+        _CACHE.record_not_modified()
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def cache_stats() -> dict:
+    return _CACHE.stats()
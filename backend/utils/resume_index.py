@@ -0,0 +1,168 @@
+# backend/utils/resume_index.py
+
+"""
+In-memory sparse inverted index over hashed resume features, one per HR.
+
+Postings are compact typed arrays (int32 doc slot + float32 weight, 8 bytes
+per posting), so 100k resumes at ~600 features each take ~0.5 GB.
+Documents are appended incrementally; a query touches only the postings of
+its own features and accumulates scores with numpy.
+"""
+
+import threading
+from array import array
+from typing import Callable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Query features present in more than this fraction of documents carry
+# almost no signal but dominate query cost, so they are skipped.
+MAX_POSTINGS_FRACTION = 0.5
+
+
+class InvertedIndex:
+    def __init__(self):
+        self._postings = {}  # feature -> (array('i') slots, array('f') weights)
+        self.doc_ids: List[str] = []  # slot -> resume id
+        self._slots = {}  # resume id -> slot
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+
+    def __contains__(self, resume_id) -> bool:
+        return str(resume_id) in self._slots
+
+    def add(self, resume_id, indices, values) -> bool:
+        """Appends one document. Returns False if it was already indexed."""
+        resume_id = str(resume_id)
+        with self._lock:
+            if resume_id in self._slots:
+                return False
+            slot = len(self.doc_ids)
+            self.doc_ids.append(resume_id)
+            self._slots[resume_id] = slot
+            for feature, weight in zip(np.asarray(indices).tolist(), np.asarray(values).tolist()):
+                posting = self._postings.get(feature)
+                if posting is None:
+                    posting = (array("i"), array("f"))
+                    self._postings[feature] = posting
+                posting[0].append(slot)
+                posting[1].append(weight)
+        return True
+
+    def extend(self, docs: Iterable) -> int:
+        """
+        Bulk-adds (resume_id, indices, values) documents. Postings are
+        grouped by feature with numpy, which is much faster than `add`
+        when loading a whole tenant at once. Returns the number added.
+        """
+        slots, features, weights = [], [], []
+        added = 0
+        with self._lock:
+            for resume_id, indices, values in docs:
+                resume_id = str(resume_id)
+                if resume_id in self._slots:
+                    continue
+                slot = len(self.doc_ids)
+                self.doc_ids.append(resume_id)
+                self._slots[resume_id] = slot
+                added += 1
+                indices = np.asarray(indices, dtype=np.int32)
+                slots.append(np.full(len(indices), slot, dtype=np.int32))
+                features.append(indices)
+                weights.append(np.asarray(values, dtype=np.float32))
+
+            if not slots:
+                return 0
+
+            slots = np.concatenate(slots)
+            features = np.concatenate(features)
+            weights = np.concatenate(weights)
+            order = np.argsort(features, kind="stable")
+            slots, features, weights = slots[order], features[order], weights[order]
+            bounds = np.flatnonzero(np.diff(features)) + 1
+            starts = np.concatenate(([0], bounds))
+            ends = np.concatenate((bounds, [len(features)]))
+
+            for start, end in zip(starts.tolist(), ends.tolist()):
+                feature = int(features[start])
+                posting = self._postings.get(feature)
+                if posting is None:
+                    posting = (array("i"), array("f"))
+                    self._postings[feature] = posting
+                posting[0].frombytes(slots[start:end].tobytes())
+                posting[1].frombytes(weights[start:end].tobytes())
+            return added
+
+    def search(self, query_indices, query_weights, k: int = 20) -> List[Tuple[str, float]]:
+        """
+        Returns up to k (resume_id, score) pairs, best first.
+        Scores are dot products of the query weights with the stored
+        (L2-normalised) document weights.
+        """
+        with self._lock:
+            n_docs = len(self.doc_ids)
+            if n_docs == 0 or k <= 0:
+                return []
+
+            postings = []
+            for feature, weight in zip(np.asarray(query_indices).tolist(), np.asarray(query_weights).tolist()):
+                posting = self._postings.get(feature)
+                if posting is not None:
+                    postings.append((posting, weight))
+
+            max_len = MAX_POSTINGS_FRACTION * n_docs
+            selective = [p for p in postings if len(p[0][0]) <= max_len]
+            if selective:
+                postings = selective
+
+            scores = np.zeros(n_docs, dtype=np.float32)
+            for (slots, weights), q_weight in postings:
+                ids = np.frombuffer(slots, dtype=np.int32)
+                scores[ids] += q_weight * np.frombuffer(weights, dtype=np.float32)
+
+            candidates = np.flatnonzero(scores)
+            if len(candidates) > k:
+                top = np.argpartition(scores[candidates], -k)[-k:]
+                candidates = candidates[top]
+            order = candidates[np.argsort(-scores[candidates], kind="stable")]
+            return [(self.doc_ids[i], float(scores[i])) for i in order]
+
+
+_INDEXES = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def get_index(hr_id: str, loader: Optional[Callable[[], Iterable]] = None) -> InvertedIndex:
+    """
+    Returns the HR's index, building it on first use in this process.
+    `loader` should yield (resume_id, indices, values) for stored resumes.
+    """
+    index = _INDEXES.get(hr_id)
+    if index is not None:
+        return index
+
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(hr_id)
+        if index is None:
+            index = InvertedIndex()
+            if loader is not None:
+                index.extend(loader())
+            _INDEXES[hr_id] = index
+    return index
+
+
+def loaded_index(hr_id: str) -> Optional[InvertedIndex]:
+    """The HR's index if this process has built it, else None."""
+    return _INDEXES.get(hr_id)
+
+
+def index_if_loaded(hr_id: str, resume_id, vec) -> None:
+    """
+    Adds a newly scored resume to the HR's index when it is already in
+    memory. An unloaded index picks the resume up from the vector store.
+    """
+    index = _INDEXES.get(hr_id)
+    if index is not None and vec is not None and resume_id is not None:
+        index.add(resume_id, vec.indices, vec.data)
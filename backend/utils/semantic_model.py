@@ -0,0 +1,176 @@
+# backend/utils/semantic_model.py
+
+"""
+Optional CPU-only latent semantic (LSA) similarity.
+
+A TruncatedSVD projection over the hashed feature space is trained offline
+and saved as a single .npy matrix of shape (HASH_FEATURES, k), with IDF
+weights folded into its rows. At runtime the matrix is memory-mapped
+read-only, so every worker process shares one copy through the page cache,
+and projecting a sparse resume vector only touches the rows of its own
+features.
+
+Train:
+    python -m backend.utils.semantic_model train --input resumes_dir/ --out models/lsa.npy
+"""
+
+import argparse
+import logging
+import os
+import threading
+from typing import List, Optional
+
+import numpy as np
+
+from backend.config import SEMANTIC_MODEL_PATH, SEMANTIC_BLEND
+
+logger = logging.getLogger("hirelens")
+
+DEFAULT_COMPONENTS = 100
+
+_MODEL = None
+_MODEL_LOADED = False
+_MODEL_LOCK = threading.Lock()
+
+
+def load_semantic_model(path: Optional[str] = None) -> Optional[np.ndarray]:
+    """
+    Memory-maps the projection matrix. Returns None when semantic mode is
+    off or the artifact is missing.
+    """
+    global _MODEL, _MODEL_LOADED
+    if _MODEL_LOADED and path is None:
+        return _MODEL
+
+    with _MODEL_LOCK:
+        if _MODEL_LOADED and path is None:
+            return _MODEL
+        model_path = path or SEMANTIC_MODEL_PATH
+        model = None
+        if model_path and os.path.exists(model_path):
+            try:
+                model = np.load(model_path, mmap_mode="r")
+                logger.info(f"Semantic model mapped: {model_path} {model.shape}")
+            except Exception as e:
+                logger.error(f"Semantic model load failed: {e}")
+        elif model_path:
+            logger.warning(f"Semantic model not found at {model_path}")
+        _MODEL, _MODEL_LOADED = model, True
+        return model
+
+
+def semantic_enabled() -> bool:
+    return SEMANTIC_BLEND > 0 and load_semantic_model() is not None
+
+
+def project(vectors) -> np.ndarray:
+    """
+    Projects a batch of hashed rows (sparse, n x HASH_FEATURES) into the
+    latent space; rows are L2-normalised.
+    """
+    model = load_semantic_model()
+    vectors = vectors.tocsr()
+    # Gather only the mapped rows for features present in the batch
+    rows = np.asarray(model[vectors.indices], dtype=np.float32)
+    rows *= vectors.data.astype(np.float32)[:, None]
+    dense = np.zeros((vectors.shape[0], model.shape[1]), dtype=np.float32)
+    for i in range(vectors.shape[0]):
+        start, end = vectors.indptr[i], vectors.indptr[i + 1]
+        if end > start:
+            dense[i] = rows[start:end].sum(axis=0)
+    norms = np.linalg.norm(dense, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return dense / norms
+
+
+def semantic_scores(job_vec, resume_vecs: List) -> List[float]:
+    """
+    Batched semantic similarity (0-100) of each resume vector to the JD.
+    Entries for missing vectors, or all entries when semantic mode is off,
+    are 0.0.
+    """
+    scores = [0.0] * len(resume_vecs)
+    present = [i for i, v in enumerate(resume_vecs) if v is not None]
+    if job_vec is None or not present or not semantic_enabled():
+        return scores
+
+    try:
+        from scipy.sparse import vstack
+
+        latent = project(vstack([job_vec] + [resume_vecs[i] for i in present]).tocsr())
+        sims = np.clip(latent[1:] @ latent[0], 0.0, 1.0)
+        for i, sim in zip(present, sims.tolist()):
+            scores[i] = round(sim * 100, 2)
+    except Exception as e:
+        logger.error(f"Semantic scoring failed: {e}")
+    return scores
+
+
+def blend_jd_score(jd_similarity_score: float, semantic_score: float) -> float:
+    """Mixes the lexical JD score with the semantic one by SEMANTIC_BLEND."""
+    if not semantic_enabled():
+        return jd_similarity_score
+    return round((1 - SEMANTIC_BLEND) * jd_similarity_score + SEMANTIC_BLEND * semantic_score, 2)
+
+
+# ---------------- OFFLINE TRAINING ---------------- #
+
+def train_semantic_model(texts: List[str], out_path: str, n_components: int = DEFAULT_COMPONENTS) -> str:
+    """
+    Fits TruncatedSVD on IDF-weighted hashed features of `texts` and saves
+    the (HASH_FEATURES, k) projection with IDF folded in.
+    """
+    from scipy.sparse import vstack
+    from sklearn.decomposition import TruncatedSVD
+    from backend.utils.doc_frequency import DocumentFrequencyTable
+    from backend.utils.nlp_similarity import hash_features
+
+    rows = [v for v in (hash_features(t) for t in texts) if v is not None]
+    if len(rows) <= n_components:
+        raise ValueError(f"Need more than {n_components} documents, got {len(rows)}")
+
+    matrix = vstack(rows).tocsr()
+    table = DocumentFrequencyTable()
+    for row in rows:
+        table.add(row.indices)
+    idf = table.idf(np.arange(matrix.shape[1]))
+    weighted = matrix.multiply(idf).tocsr()
+
+    svd = TruncatedSVD(n_components=n_components, algorithm="randomized", random_state=42)
+    svd.fit(weighted)
+
+    projection = np.ascontiguousarray((svd.components_.T * idf[:, None]).astype(np.float32))
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    np.save(out_path, projection)
+    logger.info(
+        f"Semantic model saved to {out_path}: {projection.shape}, "
+        f"explained variance {svd.explained_variance_ratio_.sum():.3f}"
+    )
+    return out_path
+
+
+def _read_corpus(paths: List[str]) -> List[str]:
+    from backend.utils.extract_text import extract_text
+
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(os.path.join(root, n) for n in sorted(names))
+        else:
+            files.append(path)
+    return [t for t in (extract_text(f) for f in files) if t]
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="HireLens semantic (LSA) model")
+    sub = parser.add_subparsers(dest="command", required=True)
+    train = sub.add_parser("train", help="Train a projection from resume/JD files")
+    train.add_argument("--input", nargs="+", required=True, help="Files or directories (.pdf/.docx/.txt)")
+    train.add_argument("--out", required=True, help="Output .npy path")
+    train.add_argument("--components", type=int, default=DEFAULT_COMPONENTS)
+    args = parser.parse_args()
+
+    if args.command == "train":
+        train_semantic_model(_read_corpus(args.input), args.out, args.components)
@@ -0,0 +1,77 @@
+# backend/utils/signed_urls.py
+
+"""
+Signed download links, issued lazily when results are read.
+
+URLs are created in one batch per page of results and cached per process
+until half of their lifetime has passed, so repeated dashboard reads don't
+sign again and a handed-out link always has at least SIGNED_URL_TTL / 4
+left. `url_epoch()` changes every SIGNED_URL_TTL / 4 seconds; cached
+responses that embed URLs include it in their key so they never outlive
+the links inside them.
+"""
+
+import threading
+import time
+from typing import Dict, Iterable, List
+
+from backend.config import SIGNED_URL_TTL
+from backend.utils.supabase_storage import create_signed_urls
+
+MAX_CACHED_URLS = 50000
+
+_urls = {}  # storage path -> (url, expires_at)
+_lock = threading.Lock()
+_hits = 0
+_misses = 0
+
+
+def url_epoch() -> int:
+    return int(time.time() // max(1, SIGNED_URL_TTL // 4))
+
+
+def signed_urls_for(paths: Iterable[str]) -> Dict[str, str]:
+    """Returns {path: signed url}, signing cache misses in a single batch."""
+    global _hits, _misses
+    now = time.time()
+    refresh_after = SIGNED_URL_TTL / 2
+    result, missing = {}, []
+    with _lock:
+        for path in dict.fromkeys(p for p in paths if p):
+            cached = _urls.get(path)
+            if cached and cached[1] - now > refresh_after:
+                result[path] = cached[0]
+            else:
+                missing.append(path)
+        _hits += len(result)
+        _misses += len(missing)
+
+    if missing:
+        fresh = create_signed_urls(missing, SIGNED_URL_TTL)
+        expires_at = now + SIGNED_URL_TTL
+        with _lock:
+            if len(_urls) + len(fresh) > MAX_CACHED_URLS:
+                for path in [p for p, (_, exp) in _urls.items() if exp - now <= refresh_after]:
+                    del _urls[path]
+                if len(_urls) + len(fresh) > MAX_CACHED_URLS:
+                    _urls.clear()
+            for path, url in fresh.items():
+                _urls[path] = (url, expires_at)
+        result.update(fresh)
+    return result
+
+
+def attach_signed_urls(rows: List[dict], path_field: str = "resume_storage_path",
+                       url_field: str = "resume_file") -> List[dict]:
+    """Fills `url_field` on each row from its storage path (in place)."""
+    urls = signed_urls_for(row.get(path_field) for row in rows)
+    for row in rows:
+        path = row.get(path_field)
+        if path:
+            row[url_field] = urls.get(path)
+    return rows
+
+
+def signed_url_stats() -> dict:
+    with _lock:
+        return {"entries": len(_urls), "hits": _hits, "misses": _misses}
@@ -0,0 +1,191 @@
+# backend/utils/static_pages.py
+
+"""
+In-memory serving of the frontend HTML pages.
+
+Every page in the frontend directory is read once at startup together with
+gzip (and, when the optional `brotli` package is installed, brotli)
+variants and a strong ETag per encoding. Requests are answered from memory
+with `Cache-Control: no-cache`, so browsers revalidate and get a bodiless
+304 when their copy is current; no disk I/O happens on the request path.
+
+Pages containing `{{placeholder}}` markers are templates: the markers are
+filled per request (HTML-escaped) and the result is compressed on the fly.
+
+With STATIC_PAGES_WATCH=true (development), a page is re-read when its
+file's mtime changes, checked at most once per WATCH_INTERVAL seconds.
+"""
+
+import gzip
+import hashlib
+import html
+import logging
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from fastapi import Request
+from fastapi.responses import HTMLResponse, Response
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+logger = logging.getLogger("hirelens")
+
+WATCH_INTERVAL = 1.0
+PLACEHOLDER = re.compile(r"\{\{(\w+)\}\}")
+NOT_FOUND = "<h2>Page not found</h2>"
+
+
+class _Page:
+    __slots__ = ("bodies", "etags", "mtime", "template")
+
+    def __init__(self, raw: bytes, mtime: float):
+        self.mtime = mtime
+        text = raw.decode("utf-8")
+        self.template = text if PLACEHOLDER.search(text) else None
+        self.bodies = {"identity": raw}
+        if self.template is None:
+            self.bodies.update(_compress(raw))
+        digest = hashlib.sha256(raw).hexdigest()[:32]
+        self.etags = {
+            encoding: f'"{digest}"' if encoding == "identity" else f'"{digest}-{encoding}"'
+            for encoding in ("identity", "gzip", "br")
+        }
+
+
+def _compress(raw: bytes) -> Dict[str, bytes]:
+    variants = {"gzip": gzip.compress(raw, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants["br"] = brotli.compress(raw, quality=11)
+    return variants
+
+
+def _accepted(header: str) -> Dict[str, float]:
+    accepted = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+    return accepted
+
+
+def _choose_encoding(request: Request, available) -> str:
+    accepted = _accepted(request.headers.get("accept-encoding", ""))
+    for encoding in ("br", "gzip"):
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if encoding in available and q > 0:
+            return encoding
+    return "identity"
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [t.strip() for t in header.split(",")]
+    return any(t.removeprefix("W/") == etag for t in candidates)
+
+
+class StaticPages:
+    def __init__(self, root: Path, watch: bool = False):
+        self.root = Path(root)
+        self.watch = watch
+        self._pages: Dict[str, _Page] = {}
+        self._checked = 0.0
+        self._lock = threading.Lock()
+        self.not_modified = 0
+        self.served = 0
+
+    def load(self) -> None:
+        pages = {}
+        for path in sorted(self.root.glob("*.html")):
+            pages[path.name] = _Page(path.read_bytes(), path.stat().st_mtime)
+        self._pages = pages
+        self._checked = time.monotonic()
+        logger.info(f"Preloaded {len(pages)} pages (brotli {'on' if brotli else 'off'})")
+
+    def _refresh(self) -> None:
+        now = time.monotonic()
+        if now - self._checked < WATCH_INTERVAL:
+            return
+        with self._lock:
+            if now - self._checked < WATCH_INTERVAL:
+                return
+            self._checked = now
+            pages = dict(self._pages)
+            changed = False
+            for path in self.root.glob("*.html"):
+                mtime = path.stat().st_mtime
+                page = pages.get(path.name)
+                if page is None or page.mtime != mtime:
+                    pages[path.name] = _Page(path.read_bytes(), mtime)
+                    logger.info(f"Reloaded {path.name}")
+                    changed = True
+            for name in list(pages):
+                if not (self.root / name).exists():
+                    del pages[name]
+                    changed = True
+            if changed:
+                self._pages = pages
+
+    def _page(self, name: str) -> Optional[_Page]:
+        if self.watch:
+            self._refresh()
+        return self._pages.get(name)
+
+    def response(self, request: Request, name: str, context: Optional[Dict[str, str]] = None) -> Response:
+        page = self._page(name)
+        if page is None:
+            return HTMLResponse(NOT_FOUND, status_code=404)
+        if page.template is not None:
+            return self._render(request, page, context or {})
+
+        encoding = _choose_encoding(request, page.bodies)
+        return self._respond(request, page.bodies[encoding], page.etags[encoding], encoding)
+
+    def _render(self, request: Request, page: _Page, context: Dict[str, str]) -> Response:
+        body = PLACEHOLDER.sub(
+            lambda m: html.escape(str(context.get(m.group(1), ""))), page.template
+        ).encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        encoding = _choose_encoding(request, ("gzip",))
+        if encoding == "gzip":
+            body = gzip.compress(body, compresslevel=6, mtime=0)
+            return self._respond(request, body, f'"{digest}-gzip"', encoding)
+        return self._respond(request, body, f'"{digest}"', encoding)
+
+    def _respond(self, request: Request, body: bytes, etag: str, encoding: str) -> Response:
+        headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+        if _not_modified(request, etag):
+            self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        self.served += 1
+        return Response(body, media_type="text/html; charset=utf-8", headers=headers)
+
+    def stats(self) -> dict:
+        pages = self._pages
+        return {
+            "pages": len(pages),
+            "bytes": sum(sum(len(b) for b in p.bodies.values()) for p in pages.values()),
+            "brotli": brotli is not None,
+            "watch": self.watch,
+            "served": self.served,
+            "not_modified": self.not_modified,
+        }
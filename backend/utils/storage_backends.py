@@ -0,0 +1,243 @@
+# backend/utils/storage_backends.py
+
+"""
+Storage backends for resume objects.
+
+`supabase_storage` talks to whichever backend STORAGE_BACKEND selects:
+
+- "supabase" (default): the Supabase Storage bucket.
+- "local": files under LOCAL_STORAGE_DIR, for on-prem deployments and for
+  benchmarks that should run at local-disk latency. Signed URLs point at
+  the app's own /files route and carry an HMAC-SHA256 signature over the
+  path and expiry, verified by `verify_signature`. STORAGE_SIGNING_KEY
+  is required; the app refuses to start without it.
+"""
+
+import hashlib
+import hmac
+import logging
+import os
+import threading
+from abc import ABC, abstractmethod
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import quote
+
+from backend.config import (
+    STORAGE_BACKEND, LOCAL_STORAGE_DIR, STORAGE_SIGNING_KEY,
+)
+
+logger = logging.getLogger("hirelens")
+
+BUCKET_NAME = "resumes"
+
+
+class ObjectExistsError(Exception):
+    """Raised by `upload` when an object already exists at the path."""
+
+
+class StorageBackend(ABC):
+    name = "base"
+    # Whether downloads are worth keeping in the local blob cache
+    cache_downloads = True
+
+    @abstractmethod
+    def upload(self, path: str, data: bytes, overwrite: bool = False) -> None:
+        """Stores an object; raises ObjectExistsError if one exists and not `overwrite`."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def download(self, path: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def signed_urls(self, paths: List[str], expires_in: int) -> Dict[str, str]:
+        """Returns {path: url}; paths that could not be signed are left out."""
+        raise NotImplementedError
+
+    def signed_url(self, path: str, expires_in: int) -> Optional[str]:
+        return self.signed_urls([path], expires_in).get(path)
+
+    @abstractmethod
+    def delete(self, paths: List[str]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def exists(self, path: str) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def list(self, prefix: str, limit: int, offset: int) -> List[dict]:
+        """Objects directly under `prefix`, as [{"name", "created_at", "updated_at"}] sorted by name."""
+        raise NotImplementedError
+
+
+class SupabaseStorageBackend(StorageBackend):
+    name = "supabase"
+
+    def __init__(self, bucket: str = BUCKET_NAME):
+        self.bucket_name = bucket
+
+    @property
+    def bucket(self):
+        from backend.supabase_client import supabase
+        return supabase.storage.from_(self.bucket_name)
+
+    def upload(self, path: str, data: bytes, overwrite: bool = False) -> None:
+        options = {"content-type": "application/octet-stream"}
+        if overwrite:
+            options["upsert"] = "true"
+        try:
+            response = self.bucket.upload(
+                path=path,
+                file=data,
+                file_options=options
+            )
+        except Exception as e:
+            message = str(e).lower()
+            if "duplicate" in message or "already exists" in message or "409" in message:
+                raise ObjectExistsError(path) from e
+            raise
+        if response is None:
+            raise Exception("Supabase upload returned None")
+
+    def download(self, path: str) -> Optional[bytes]:
+        return self.bucket.download(path)
+
+    def signed_urls(self, paths: List[str], expires_in: int) -> Dict[str, str]:
+        urls = {}
+        for item in self.bucket.create_signed_urls(list(paths), expires_in) or []:
+            url = item.get("signedURL") or item.get("signedUrl")
+            if item.get("path") and url and not item.get("error"):
+                urls[item["path"]] = url
+        return urls
+
+    def signed_url(self, path: str, expires_in: int) -> Optional[str]:
+        response = self.bucket.create_signed_url(path, expires_in)
+        if not response or "signedURL" not in response:
+            return None
+        return response["signedURL"]
+
+    def delete(self, paths: List[str]) -> None:
+        self.bucket.remove(list(paths))
+
+    def exists(self, path: str) -> bool:
+        folder, _, name = path.rpartition("/")
+        items = self.bucket.list(folder, {"limit": 1, "search": name}) or []
+        return any(item.get("name") == name for item in items)
+
+    def list(self, prefix: str, limit: int, offset: int) -> List[dict]:
+        items = self.bucket.list(prefix, {"limit": limit, "offset": offset, "sortBy": {"column": "name", "order": "asc"}})
+        return [
+            {"name": i["name"], "created_at": i.get("created_at"), "updated_at": i.get("updated_at") or i.get("created_at")}
+            for i in items or []
+        ]
+
+
+class LocalStorageBackend(StorageBackend):
+    name = "local"
+    cache_downloads = False  # already on local disk
+
+    def __init__(self, root: str, signing_key: bytes, url_prefix: str = "/files"):
+        self.root = Path(root).resolve()
+        self.signing_key = signing_key
+        self.url_prefix = url_prefix
+
+    def resolve(self, path: str) -> Path:
+        """Maps an object path to its file, refusing paths outside the root."""
+        target = (self.root / path).resolve()
+        if target == self.root or self.root not in target.parents:
+            raise ValueError(f"Invalid object path: {path}")
+        return target
+
+    def upload(self, path: str, data: bytes, overwrite: bool = False) -> None:
+        target = self.resolve(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f"{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(data)
+        if overwrite:
+            os.replace(tmp, target)
+            return
+        try:
+            # Hard link fails if the target exists, so existing objects are never replaced
+            os.link(tmp, target)
+        except FileExistsError:
+            raise ObjectExistsError(path)
+        finally:
+            os.unlink(tmp)
+
+    def download(self, path: str) -> Optional[bytes]:
+        try:
+            return self.resolve(path).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def sign(self, path: str, expires: int) -> str:
+        message = f"{path}\n{expires}".encode("utf-8")
+        return hmac.new(self.signing_key, message, hashlib.sha256).hexdigest()
+
+    def verify_signature(self, path: str, expires: int, signature: str) -> bool:
+        if expires < time.time():
+            return False
+        return hmac.compare_digest(self.sign(path, expires), signature or "")
+
+    def signed_urls(self, paths: List[str], expires_in: int) -> Dict[str, str]:
+        expires = int(time.time()) + int(expires_in)
+        return {
+            p: f"{self.url_prefix}/{quote(p)}?expires={expires}&signature={self.sign(p, expires)}"
+            for p in paths
+        }
+
+    def delete(self, paths: List[str]) -> None:
+        for path in paths:
+            try:
+                self.resolve(path).unlink()
+            except FileNotFoundError:
+                pass
+
+    def exists(self, path: str) -> bool:
+        return self.resolve(path).is_file()
+
+    def list(self, prefix: str, limit: int, offset: int) -> List[dict]:
+        folder = self.root / prefix
+        if not folder.is_dir():
+            return []
+        entries = sorted(
+            (e for e in os.scandir(folder) if e.is_file() and not e.name.endswith(".tmp")),
+            key=lambda e: e.name,
+        )
+        items = []
+        for e in entries[offset:offset + limit]:
+            modified = datetime.fromtimestamp(e.stat().st_mtime, timezone.utc).isoformat()
+            items.append({"name": e.name, "created_at": modified, "updated_at": modified})
+        return items
+
+
+def _signing_key() -> bytes:
+    # A dedicated key: reusing another secret would let anyone holding a
+    # file link probe it offline, and rotating one would break the other
+    if not STORAGE_SIGNING_KEY:
+        raise RuntimeError("STORAGE_SIGNING_KEY must be set when STORAGE_BACKEND=local")
+    return STORAGE_SIGNING_KEY.encode("utf-8")
+
+
+_BACKEND = None
+_BACKEND_LOCK = threading.Lock()
+
+
+def get_storage() -> StorageBackend:
+    global _BACKEND
+    if _BACKEND is None:
+        with _BACKEND_LOCK:
+            if _BACKEND is None:
+                if STORAGE_BACKEND == "local":
+                    _BACKEND = LocalStorageBackend(LOCAL_STORAGE_DIR, _signing_key())
+                elif STORAGE_BACKEND == "supabase":
+                    _BACKEND = SupabaseStorageBackend()
+                else:
+                    raise ValueError(f"Unknown STORAGE_BACKEND: {STORAGE_BACKEND}")
+                logger.info(f"Storage backend: {_BACKEND.name}")
+    return _BACKEND
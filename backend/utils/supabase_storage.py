@@ -1,14 +1,24 @@
 from backend.supabase_client import supabase
-import uuid
+from backend.utils.blob_cache import blob_cache
+from backend.utils.storage_backends import get_storage, ObjectExistsError
+from datetime import datetime, timedelta, timezone
+import argparse
+import hashlib
 import os
 import re
 import unicodedata
-from typing import Optional
+from typing import Dict, List, Optional
 import logging
 
-BUCKET_NAME = "resumes"
+CAS_PREFIX = "cas"  # objects live at cas/<sha256 of bytes><ext>
+REF_CHUNK = 100
+LIST_PAGE = 1000
 logger = logging.getLogger("hirelens")
 
+# Resume object storage. Objects go to the backend chosen by STORAGE_BACKEND
+# (see storage_backends) and are shared by every resume row with the same
+# bytes; objects no row references any more are removed by the `gc` sweep.
+
 # ---------------------------
 # Upload Resume to Bucket
 # ---------------------------
@@ -27,9 +37,19 @@ def _sanitize_filename(file_name: str) -> str:
         ext = ""
     return f"{base}{ext}"
 
+def content_key(file_bytes: bytes, file_name: str) -> str:
+    """
+    Content-addressed object key: identical bytes always map to the same
+    object, whatever the file is called or which HR uploads it.
+    """
+    digest = hashlib.sha256(file_bytes).hexdigest()
+    ext = os.path.splitext(_sanitize_filename(file_name))[1]
+    return f"{CAS_PREFIX}/{digest}{ext}"
+
 def upload_resume(file_bytes: bytes, file_name: str) -> Optional[str]:
     """
-    Uploads resume to Supabase Storage bucket safely.
+    Uploads resume to the storage backend safely, under its content key.
+    The upload is skipped when a resume row already references the object.
 
     Returns:
         file_path (str) if successful
@@ -43,25 +63,115 @@ def upload_resume(file_bytes: bytes, file_name: str) -> Optional[str]:
         raise ValueError("File name is required")
 
     try:
-        safe_name = _sanitize_filename(file_name)
-        unique_name = f"{uuid.uuid4()}_{safe_name}"
+        key = content_key(file_bytes, file_name)
+        if resume_ref_count(key) > 0:
+            return key
 
-        response = supabase.storage.from_(BUCKET_NAME).upload(
-            path=unique_name,
-            file=file_bytes,
-            file_options={"content-type": "application/octet-stream"}
-        )
+        try:
+            get_storage().upload(key, file_bytes)
+        except ObjectExistsError:
+            # Same bytes uploaded before but not referenced yet (same batch, or
+            # an old orphan). Rewriting it moves its updated_at, so a running
+            # gc sweep keeps it, and restores it if the sweep already deleted it
+            get_storage().upload(key, file_bytes, overwrite=True)
 
-        if response is None:
-            raise Exception("Supabase upload returned None")
-
-        return unique_name
+        return key
 
     except Exception as e:
         logger.error(f"Upload failed: {e}")
         return None
 
 
+# ---------------------------
+# References
+# ---------------------------
+def resume_ref_count(file_path: str) -> int:
+    """Number of resume rows (across all HRs) that reference a stored object."""
+    res = (
+        supabase
+        .table("resumes")
+        .select("id", count="exact")
+        .eq("resume_storage_path", file_path)
+        .limit(1)
+        .execute()
+    )
+    if res.count is not None:
+        return int(res.count)
+    return len(res.data or [])
+
+def _referenced(file_paths: List[str]) -> set:
+    referenced = set()
+    for start in range(0, len(file_paths), REF_CHUNK):
+        chunk = file_paths[start:start + REF_CHUNK]
+        # One popular object can fill a whole page, so page until it runs short
+        offset = 0
+        while True:
+            res = (
+                supabase
+                .table("resumes")
+                .select("id,resume_storage_path")
+                .in_("resume_storage_path", chunk)
+                .order("id")
+                .range(offset, offset + LIST_PAGE - 1)
+                .execute()
+            )
+            rows = res.data or []
+            referenced.update(r["resume_storage_path"] for r in rows)
+            if len(rows) < LIST_PAGE:
+                break
+            offset += LIST_PAGE
+    return referenced
+
+def _untouched_since(storage, cutoff: datetime) -> List[str]:
+    """Content-addressed objects last written before `cutoff`."""
+    paths = []
+    offset = 0
+    while True:
+        items = storage.list(CAS_PREFIX, LIST_PAGE, offset)
+        for item in items:
+            modified = item.get("updated_at") or item.get("created_at")
+            try:
+                modified_at = datetime.fromisoformat(str(modified).replace("Z", "+00:00"))
+            except ValueError:
+                continue
+            if modified_at.tzinfo is None:
+                modified_at = modified_at.replace(tzinfo=timezone.utc)
+            if modified_at < cutoff:
+                paths.append(f"{CAS_PREFIX}/{item['name']}")
+        if len(items) < LIST_PAGE:
+            break
+        offset += LIST_PAGE
+    return paths
+
+def sweep_unreferenced(grace_seconds: int = 24 * 3600, dry_run: bool = False) -> List[str]:
+    """
+    Removes content-addressed objects no resume row references, e.g. left
+    by uploads whose insert failed. Objects written within `grace_seconds`
+    are kept, since their rows may still be on the way; uploading the same
+    bytes again rewrites an object, so it counts as recent.
+    """
+    storage = get_storage()
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=grace_seconds)
+    candidates = _untouched_since(storage, cutoff)
+    referenced = _referenced(candidates)
+    orphans = [p for p in candidates if p not in referenced]
+    if orphans and not dry_run:
+        # Uploads may have rewritten or referenced some orphans while the
+        # sweep ran, so check both again right before deleting
+        still_stale = set(_untouched_since(storage, cutoff))
+        deleted = []
+        for start in range(0, len(orphans), REF_CHUNK):
+            chunk = [p for p in orphans[start:start + REF_CHUNK] if p in still_stale]
+            referenced = _referenced(chunk)
+            chunk = [p for p in chunk if p not in referenced]
+            if chunk:
+                storage.delete(chunk)
+                deleted.extend(chunk)
+        orphans = deleted
+    logger.info(f"Storage sweep: {len(candidates)} checked, {len(orphans)} unreferenced")
+    return orphans
+
+
 # ---------------------------
 # Generate Signed URL
 # ---------------------------
@@ -74,27 +184,56 @@ def get_signed_url(file_path: str, expires_in: int = 3600) -> Optional[str]:
         raise ValueError("File path required")
 
     try:
-        response = supabase.storage.from_(BUCKET_NAME).create_signed_url(
-            file_path, expires_in
-        )
+        url = get_storage().signed_url(file_path, expires_in)
 
-        if not response or "signedURL" not in response:
+        if not url:
             raise Exception("Signed URL generation failed")
 
-        return response["signedURL"]
+        return url
 
     except Exception as e:
         logger.error(f"Signed URL error: {e}")
         return None
 
+def create_signed_urls(file_paths: List[str], expires_in: int = 3600) -> Dict[str, str]:
+    """
+    Signs several paths in one storage round-trip.
+    Returns {path: signed url}; paths that failed are left out.
+    """
+    if not file_paths:
+        return {}
+    try:
+        return get_storage().signed_urls(list(file_paths), expires_in)
+    except Exception as e:
+        logger.error(f"Signed URL batch error: {e}")
+        return {}
+
 def download_bytes(file_path: str) -> Optional[bytes]:
+    """
+    Returns a stored object's bytes, served from the local blob cache
+    when possible (objects are never rewritten, so cached copies stay valid).
+    """
     if not file_path:
         return None
+    storage = get_storage()
+    if not storage.cache_downloads:
+        try:
+            return storage.download(file_path)
+        except Exception as e:
+            logger.error(f"Download failed: {e}")
+            return None
+
+    cached = blob_cache.get(file_path)
+    if cached is not None:
+        return cached
     try:
-        return supabase.storage.from_(BUCKET_NAME).download(file_path)
+        data = storage.download(file_path)
     except Exception as e:
         logger.error(f"Download failed: {e}")
         return None
+    if data:
+        blob_cache.put(file_path, data)
+    return data
 
 
 # ---------------------------
@@ -102,16 +241,30 @@ def download_bytes(file_path: str) -> Optional[bytes]:
 # ---------------------------
 def delete_resume(file_path: str) -> bool:
     """
-    Deletes file from Supabase bucket safely.
+    Deletes file from the storage backend safely.
     """
 
     if not file_path:
         return False
 
     try:
-        supabase.storage.from_(BUCKET_NAME).remove([file_path])
+        get_storage().delete([file_path])
         return True
 
     except Exception as e:
         logger.error(f"Delete failed: {e}")
         return False
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="HireLens resume storage")
+    sub = parser.add_subparsers(dest="command", required=True)
+    gc = sub.add_parser("gc", help="Delete stored objects no resume row references")
+    gc.add_argument("--grace-hours", type=float, default=24)
+    gc.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    if args.command == "gc":
+        for path in sweep_unreferenced(int(args.grace_hours * 3600), dry_run=args.dry_run):
+            print(path)
@@ -0,0 +1,452 @@
+# backend/utils/tracing.py
+
+"""
+Lightweight trace spans for the resume pipeline.
+
+Each HTTP request gets a root span whose trace id doubles as the request
+id (taken from an incoming W3C `traceparent` or a 32-hex `X-Request-ID`
+header when present, and returned in `X-Request-ID`; other request ids
+are recorded as the root span's `request_id` attribute). Every `metrics.stage` block is
+a child span, and uploads add one span per file, so a batch upload
+becomes a tree like:
+
+    POST /upload/resumes
+      resume.file {file_index=0, file_name=..., bytes=...}
+        storage_upload {bytes=...}
+        extract_text {chars=...}
+        ...
+      semantic
+      resume.insert {file_index=0}
+        db_insert
+      ...
+
+The current span lives in a context variable, so it follows work onto
+the I/O pool (run_io copies the context) and the ZIP prefetch threads.
+Log records from the "hirelens" logger carry the trace id.
+
+Finished spans are batched by a background thread and exported according
+to TRACE_EXPORT:
+
+- "jsonl": one JSON object per span appended to TRACE_FILE;
+- "otlp": OTLP/HTTP JSON posted to TRACE_OTLP_ENDPOINT (e.g. a local
+  OpenTelemetry Collector on :4318);
+- "" (default): tracing is off and spans cost one flag check.
+
+Per-trace breakdowns can be rebuilt from a JSON-lines file later:
+
+    python -m backend.utils.tracing summarize traces.jsonl [--trace ID]
+"""
+
+import argparse
+import contextvars
+import json
+import logging
+import os
+import queue
+import random
+import re
+import threading
+import time
+import urllib.request
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from backend.config import (
+    TRACE_EXPORT, TRACE_FILE, TRACE_OTLP_ENDPOINT, TRACE_SAMPLE_RATE, TRACE_SERVICE_NAME,
+)
+
+logger = logging.getLogger("hirelens")
+
+BATCH_SIZE = 512
+FLUSH_SECONDS = 1.0
+MAX_QUEUED = 50000
+TRACEPARENT = re.compile(r"^[0-9a-f]{2}-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+TRACE_ID = re.compile(r"^[0-9a-f]{32}$")
+ZERO_TRACE_ID, ZERO_SPAN_ID = "0" * 32, "0" * 16
+REQUEST_ID = re.compile(r"^[0-9A-Za-z_.:-]{1,64}$")
+
+_current: contextvars.ContextVar = contextvars.ContextVar("trace_span", default=None)
+
+
+def _new_id(nbytes: int) -> str:
+    return f"{random.getrandbits(nbytes * 8):0{nbytes * 2}x}"
+
+
+class Span:
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "attributes",
+                 "start_ns", "end_ns", "error", "_token")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: dict):
+        self.trace_id = trace_id
+        self.span_id = _new_id(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.error = None
+        self._token = None
+
+    def set(self, **attributes) -> None:
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class _NoopSpan:
+    trace_id = None
+
+    def set(self, **attributes) -> None:
+        pass
+
+
+# Also marks the context of a request that was not sampled
+NOOP_SPAN = _NoopSpan()
+
+
+def enabled() -> bool:
+    return _exporter is not None
+
+
+def current_trace_id() -> Optional[str]:
+    current = _current.get()
+    return current.trace_id if current is not None else None
+
+
+def start_span(name: str, trace_id: Optional[str] = None, parent_id: Optional[str] = None, **attributes):
+    """Opens a span as the current one; finish it with `end_span`."""
+    parent = _current.get()
+    if parent is not None:
+        trace_id, parent_id = parent.trace_id, parent.span_id
+    elif trace_id is None:
+        trace_id = _new_id(16)
+    span = Span(name, trace_id, parent_id, attributes)
+    span._token = _current.set(span)
+    return span
+
+
+def end_span(span: Span, error: Optional[BaseException] = None) -> None:
+    span.end_ns = time.time_ns()
+    if error is not None:
+        span.error = f"{type(error).__name__}: {error}"
+    _current.reset(span._token)
+    _exporter.submit(span)
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """
+    Child span of the current one (or a new trace). Yields the span so the
+    block can add attributes; yields a no-op when tracing is off or the
+    current request is not sampled.
+    """
+    if _exporter is None:
+        yield NOOP_SPAN
+        return
+    parent = _current.get()
+    if parent is NOOP_SPAN or (parent is None and random.random() >= TRACE_SAMPLE_RATE):
+        yield NOOP_SPAN
+        return
+    current = start_span(name, **attributes)
+    try:
+        yield current
+    except BaseException as e:
+        end_span(current, e)
+        raise
+    end_span(current)
+
+
+# ---------------- EXPORT ---------------- #
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_payload(spans: List[dict]) -> dict:
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [
+                {"key": "service.name", "value": {"stringValue": TRACE_SERVICE_NAME}},
+                {"key": "process.pid", "value": {"intValue": str(os.getpid())}},
+            ]},
+            "scopeSpans": [{
+                "scope": {"name": "hirelens"},
+                "spans": [
+                    {
+                        "traceId": s["trace_id"],
+                        "spanId": s["span_id"],
+                        **({"parentSpanId": s["parent_id"]} if s["parent_id"] else {}),
+                        "name": s["name"],
+                        "kind": 2 if s["parent_id"] is None else 1,  # SERVER for roots, else INTERNAL
+                        "startTimeUnixNano": str(s["start_ns"]),
+                        "endTimeUnixNano": str(s["start_ns"] + int(s["duration_ms"] * 1e6)),
+                        "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in s["attributes"].items()],
+                        "status": {"code": 2, "message": s["error"]} if s["error"] else {"code": 1},
+                    }
+                    for s in spans
+                ],
+            }],
+        }]
+    }
+
+
+class _Exporter:
+    def __init__(self, mode: str):
+        self.mode = mode
+        self.exported = 0
+        self.dropped = 0
+        self._reset()
+        # Forked workers get a fresh queue and start their own export thread
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self) -> None:
+        self._queue = queue.Queue(maxsize=MAX_QUEUED)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, span: Span) -> None:
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="trace-export", daemon=True)
+                self._thread.start()
+
+    def _drain(self, block: bool) -> List[dict]:
+        batch = []
+        try:
+            if block:
+                batch.append(self._queue.get(timeout=FLUSH_SECONDS).to_dict())
+            while len(batch) < BATCH_SIZE:
+                batch.append(self._queue.get_nowait().to_dict())
+        except queue.Empty:
+            pass
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._drain(block=True)
+            if batch:
+                self._export(batch)
+
+    def flush(self) -> None:
+        while True:
+            batch = self._drain(block=False)
+            if not batch:
+                return
+            self._export(batch)
+
+    def _export(self, batch: List[dict]) -> None:
+        try:
+            if self.mode == "jsonl":
+                data = "".join(json.dumps(s, separators=(",", ":")) + "\n" for s in batch).encode("utf-8")
+                # One O_APPEND write per batch keeps lines from different workers intact
+                fd = os.open(TRACE_FILE, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+                try:
+                    os.write(fd, data)
+                finally:
+                    os.close(fd)
+            else:
+                request = urllib.request.Request(
+                    TRACE_OTLP_ENDPOINT,
+                    data=json.dumps(_otlp_payload(batch)).encode("utf-8"),
+                    headers={"Content-Type": "application/json"},
+                    method="POST",
+                )
+                urllib.request.urlopen(request, timeout=5).close()
+            self.exported += len(batch)
+        except Exception as e:
+            self.dropped += len(batch)
+            logger.warning(f"Trace export failed ({len(batch)} spans dropped): {e}")
+
+
+def _make_exporter() -> Optional[_Exporter]:
+    if TRACE_EXPORT in ("", "off", "none"):
+        return None
+    if TRACE_EXPORT not in ("jsonl", "otlp"):
+        raise ValueError(f"Unknown TRACE_EXPORT: {TRACE_EXPORT}")
+    return _Exporter(TRACE_EXPORT)
+
+
+_exporter = _make_exporter()
+
+
+def flush() -> None:
+    if _exporter is not None:
+        _exporter.flush()
+
+
+def trace_stats() -> dict:
+    if _exporter is None:
+        return {"mode": "off"}
+    return {
+        "mode": _exporter.mode,
+        "queued": _exporter._queue.qsize(),
+        "exported": _exporter.exported,
+        "dropped": _exporter.dropped,
+    }
+
+
+# ---------------- REQUESTS & LOGS ---------------- #
+
+def _incoming_ids(headers: Dict[bytes, bytes]):
+    """(trace_id, parent_id, request_id) from the request headers.
+
+    Only ids OTLP accepts (32 hex chars, not all zeros) are reused as the
+    trace id; any other X-Request-ID is returned as request_id and kept on
+    the root span, while the trace gets a fresh id.
+    """
+    traceparent = headers.get(b"traceparent", b"").decode("latin-1").strip().lower()
+    match = TRACEPARENT.match(traceparent)
+    if match and match.group(1) != ZERO_TRACE_ID and match.group(2) != ZERO_SPAN_ID:
+        return match.group(1), match.group(2), None
+    request_id = headers.get(b"x-request-id", b"").decode("latin-1").strip()
+    if TRACE_ID.match(request_id.lower()) and request_id.lower() != ZERO_TRACE_ID:
+        return request_id.lower(), None, None
+    if REQUEST_ID.match(request_id):
+        return None, None, request_id
+    return None, None, None
+
+
+class TracingMiddleware:
+    """Root span per HTTP request; echoes the trace id as X-Request-ID."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or _exporter is None:
+            await self.app(scope, receive, send)
+            return
+
+        trace_id, parent_id, incoming_request_id = _incoming_ids(dict(scope.get("headers") or []))
+        if trace_id is None and incoming_request_id is None and random.random() >= TRACE_SAMPLE_RATE:
+            token = _current.set(NOOP_SPAN)
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                _current.reset(token)
+            return
+
+        root = start_span(
+            f"{scope.get('method', '')} {scope.get('path', '')}",
+            trace_id=trace_id, parent_id=parent_id,
+            method=scope.get("method", ""), path=scope.get("path", ""),
+        )
+        if incoming_request_id:
+            root.set(request_id=incoming_request_id)
+        request_id = root.trace_id.encode("latin-1")
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                root.set(status=message["status"])
+                message = {**message, "headers": list(message.get("headers", [])) + [(b"x-request-id", request_id)]}
+            elif message["type"] == "http.response.body":
+                root.attributes["response_bytes"] = root.attributes.get("response_bytes", 0) + len(message.get("body", b""))
+            await send(message)
+
+        error = None
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            route = scope.get("route")
+            if route is not None:
+                root.set(route=route.path)
+            end_span(root, error)
+
+
+class TraceIdFilter(logging.Filter):
+    """Adds `trace_id` to log records ("-" outside a traced request)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.trace_id = current_trace_id() or "-"
+        return True
+
+
+# ---------------- OFFLINE ANALYSIS ---------------- #
+
+def load_spans(path: str) -> List[dict]:
+    spans = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                spans.append(json.loads(line))
+    return spans
+
+
+def summarize(spans: List[dict], trace_id: Optional[str] = None) -> str:
+    """Text breakdown per trace: span tree plus time per stage name."""
+    by_trace = defaultdict(list)
+    for s in spans:
+        by_trace[s["trace_id"]].append(s)
+    traces = [trace_id] if trace_id else sorted(by_trace, key=lambda t: min(s["start_ns"] for s in by_trace[t]))
+
+    lines = []
+    for tid in traces:
+        trace = sorted(by_trace.get(tid, []), key=lambda s: s["start_ns"])
+        if not trace:
+            continue
+        children = defaultdict(list)
+        ids = {s["span_id"] for s in trace}
+        for s in trace:
+            children[s["parent_id"] if s["parent_id"] in ids else None].append(s)
+
+        lines.append(f"trace {tid}")
+
+        def walk(parent, depth):
+            for s in children.get(parent, []):
+                attrs = " ".join(f"{k}={v}" for k, v in s["attributes"].items())
+                flag = f"  ERROR {s['error']}" if s.get("error") else ""
+                lines.append(f"{'  ' * (depth + 1)}{s['name']} {s['duration_ms']:.1f} ms  {attrs}{flag}")
+                walk(s["span_id"], depth + 1)
+
+        walk(None, 0)
+        totals = defaultdict(lambda: [0, 0.0])
+        for s in trace:
+            if s["parent_id"] in ids:
+                totals[s["name"]][0] += 1
+                totals[s["name"]][1] += s["duration_ms"]
+        lines.append("  totals:")
+        for name, (count, ms) in sorted(totals.items(), key=lambda t: -t[1][1]):
+            lines.append(f"    {name:<24} {count:>5} x {ms:>10.1f} ms")
+        lines.append("")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="HireLens trace tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+    summary = sub.add_parser("summarize", help="Per-trace span tree and stage totals from a JSON-lines file")
+    summary.add_argument("file")
+    summary.add_argument("--trace", help="Only this trace (request) id")
+    args = parser.parse_args()
+
+    if args.command == "summarize":
+        print(summarize(load_spans(args.file), args.trace))
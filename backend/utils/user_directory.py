@@ -0,0 +1,139 @@
+# backend/utils/user_directory.py
+
+"""
+Cached email → (users.id, auth_id) directory for the auth routes.
+
+Lookups hit the `users` table by email (one indexed query) and are cached
+per process: known users for USER_CACHE_TTL seconds, unknown emails
+(negative entries) for the shorter USER_NEGATIVE_TTL so a signup on
+another worker is seen quickly. Passwords are never cached; login reads
+the row fresh.
+
+`auth_id` is the Supabase Auth user id, stored at signup, so admin updates
+go straight to `update_user_by_id` instead of listing auth users. Rows
+created before the column existed are filled in by:
+
+    python -m backend.utils.user_directory backfill-auth-ids
+"""
+
+import argparse
+import logging
+import threading
+import time
+from typing import Optional
+
+from backend.config import USER_CACHE_TTL, USER_NEGATIVE_TTL
+from backend.supabase_client import supabase, supabase_admin
+
+logger = logging.getLogger("hirelens")
+
+USERS_TABLE = "users"
+MAX_ENTRIES = 100000
+ADMIN_PAGE = 1000
+
+
+class UserDirectory:
+    def __init__(self, ttl: float, negative_ttl: float):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries = {}  # email -> (record or None, expires_at)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _cached(self, email: str):
+        with self._lock:
+            entry = self._entries.get(email)
+            if entry is not None and entry[1] > time.monotonic():
+                self.hits += 1
+                return True, entry[0]
+            self.misses += 1
+            return False, None
+
+    def remember(self, email: str, record: Optional[dict]) -> None:
+        """Caches a {"id", "auth_id"} record, or None for an unknown email."""
+        ttl = self.ttl if record is not None else self.negative_ttl
+        with self._lock:
+            if len(self._entries) >= MAX_ENTRIES:
+                now = time.monotonic()
+                self._entries = {k: v for k, v in self._entries.items() if v[1] > now}
+                if len(self._entries) >= MAX_ENTRIES:
+                    self._entries.clear()
+            self._entries[email] = (record, time.monotonic() + ttl)
+
+    def forget(self, email: str) -> None:
+        with self._lock:
+            self._entries.pop(email, None)
+
+    def _fetch(self, email: str, columns: str) -> Optional[dict]:
+        res = supabase.table(USERS_TABLE).select(columns).eq("email", email).limit(1).execute()
+        row = res.data[0] if res.data else None
+        self.remember(email, {"id": row.get("id"), "auth_id": row.get("auth_id")} if row else None)
+        return row
+
+    def lookup(self, email: str, fresh: bool = False) -> Optional[dict]:
+        """Returns {"id", "auth_id"} for an email, or None if no account."""
+        if not fresh:
+            found, record = self._cached(email)
+            if found:
+                return record
+        row = self._fetch(email, "id,auth_id")
+        return {"id": row.get("id"), "auth_id": row.get("auth_id")} if row else None
+
+    def credentials(self, email: str) -> Optional[dict]:
+        """Fresh row including the password (never served from cache)."""
+        found, record = self._cached(email)
+        if found and record is None:
+            return None
+        return self._fetch(email, "id,auth_id,password")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+user_directory = UserDirectory(USER_CACHE_TTL, USER_NEGATIVE_TTL)
+
+
+def set_auth_password(auth_id: Optional[str], password: str) -> bool:
+    """Syncs a password to Supabase Auth by id (best effort)."""
+    if not auth_id:
+        return False
+    supabase_admin.auth.admin.update_user_by_id(auth_id, {"password": password})
+    return True
+
+
+def backfill_auth_ids() -> int:
+    """Stores the Auth user id on every users row that lacks one."""
+    updated = 0
+    page = 1
+    while True:
+        users = supabase_admin.auth.admin.list_users(page=page, per_page=ADMIN_PAGE) or []
+        for user in users:
+            if not user.email:
+                continue
+            res = (
+                supabase
+                .table(USERS_TABLE)
+                .update({"auth_id": user.id})
+                .eq("email", user.email)
+                .is_("auth_id", "null")
+                .execute()
+            )
+            updated += len(res.data or [])
+        if len(users) < ADMIN_PAGE:
+            break
+        page += 1
+    logger.info(f"Backfilled auth_id on {updated} users")
+    return updated
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="HireLens user directory")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("backfill-auth-ids", help="Store Supabase Auth ids on users rows")
+    args = parser.parse_args()
+
+    if args.command == "backfill-auth-ids":
+        backfill_auth_ids()
@@ -0,0 +1,86 @@
+# backend/utils/warmup.py
+
+"""
+Start-up timing and warm-up of the lazily imported dependencies.
+
+scikit-learn (with scipy) and the document parsers are imported on first
+use, so the app can answer /health shortly after the process starts. The
+warm-up loads them ahead of the first upload: in a background thread after
+start-up when WARMUP_ON_STARTUP is set, or on demand via POST /warmup.
+
+`startup_report()` (shown in /health) gives the app import and ready times,
+per-step warm-up durations and which heavy modules are currently loaded.
+"""
+
+import logging
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("hirelens")
+
+HEAVY_MODULES = ("sklearn", "scipy", "fitz", "PyPDF2", "pytesseract", "PIL", "docx")
+
+_lock = threading.Lock()
+_timings: Dict[str, float] = {}  # name -> milliseconds
+_steps: Dict[str, float] = {}
+_state = "cold"
+_error: Optional[str] = None
+
+
+def record(name: str, started: float) -> None:
+    """Records the time since `started` (a perf_counter value) under `name`."""
+    _timings[name] = round((time.perf_counter() - started) * 1000, 1)
+
+
+def _warmup_steps() -> List[Tuple[str, Callable[[], object]]]:
+    from backend.utils.extract_text import load_extractors
+    from backend.utils.nlp_similarity import hash_features, vector_similarity
+    from backend.utils.semantic_model import load_semantic_model
+
+    def nlp():
+        vec = hash_features("warm up the hashed uni and bigram vectorizer")
+        vector_similarity(vec, vec)
+
+    return [
+        ("nlp", nlp),
+        ("extractors", load_extractors),
+        ("semantic_model", load_semantic_model),
+    ]
+
+
+def warm_up() -> dict:
+    """Loads the heavy dependencies once; concurrent callers wait for it."""
+    global _state, _error
+    with _lock:
+        if _state == "warm":
+            return startup_report()
+        _state = "warming"
+        started = time.perf_counter()
+        try:
+            for name, step in _warmup_steps():
+                step_started = time.perf_counter()
+                step()
+                _steps[name] = round((time.perf_counter() - step_started) * 1000, 1)
+            _state = "warm"
+            _error = None
+        except Exception as e:
+            _state = "failed"
+            _error = str(e)
+            logger.error(f"Warm-up failed: {e}")
+        record("warmup", started)
+    logger.info(f"Warm-up {_state} in {_timings['warmup']} ms")
+    return startup_report()
+
+
+def start_background_warmup() -> None:
+    threading.Thread(target=warm_up, name="warmup", daemon=True).start()
+
+
+def startup_report() -> dict:
+    return {
+        **{f"{name}_ms": ms for name, ms in _timings.items()},
+        "warmup": {"state": _state, "steps_ms": dict(_steps), "error": _error},
+        "loaded": {name: name in sys.modules for name in HEAVY_MODULES},
+    }
@@ -0,0 +1,279 @@
+"""
+Per-stage benchmarks on a synthetic resume corpus.
+
+Generates a deterministic corpus (tests/synthetic_resumes.py), then times:
+
+- extract_text, separately for each file format
+- extract_experience, calculate_skill_score and jd_resume_similarity on
+  the extracted texts
+- pipeline: the per-upload work without the database, i.e. extract_zip
+  and then, for every file, the same analysis steps the upload route runs
+  (text, skills, hashed JD similarity, experience, MinHash)
+
+For each benchmark it reports calls, throughput and p50/p95/p99 latency.
+Results can be saved as a baseline and compared on later runs:
+
+    python -m tests.benchmark --save-baseline
+    python -m tests.benchmark                       # compares with the baseline
+    python -m tests.benchmark --only extract_text --count 100 --repeat 5
+    python -m tests.benchmark --max-regression 20   # exit 1 if any p50 is 20% slower
+
+Scanned PDFs go through OCR, which needs the tesseract binary; without it
+they come back empty (shown in the chars column).
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Callable, List, Optional
+
+from tests.synthetic_resumes import build_zips, generate_corpus, job_description, required_skills
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE = os.path.join(BASE_DIR, "tests", "benchmark_baseline.json")
+BENCHMARKS = ("extract_text", "extract_experience", "calculate_skill_score", "jd_resume_similarity", "pipeline")
+
+
+# ---------------- TIMING ---------------- #
+
+def _pct(samples: List[float], p: float) -> float:
+    return round(samples[min(len(samples) - 1, int(p * len(samples)))] * 1000, 3)
+
+
+def summarize(name: str, samples: List[float], items: int = 0, unit: str = "calls", **extra) -> dict:
+    """Latency percentiles (ms) and throughput (`unit` per second) for one benchmark."""
+    ordered = sorted(samples)
+    total = sum(ordered)
+    count = items or len(ordered)
+    return {
+        "name": name,
+        "calls": len(ordered),
+        "unit": unit,
+        "throughput": round(count / total, 2) if total else 0.0,
+        "mean_ms": round(total / len(ordered) * 1000, 3),
+        "p50_ms": _pct(ordered, 0.50),
+        "p95_ms": _pct(ordered, 0.95),
+        "p99_ms": _pct(ordered, 0.99),
+        "max_ms": round(ordered[-1] * 1000, 3),
+        **extra,
+    }
+
+
+def time_calls(fn: Callable, args_list: List[tuple], repeat: int) -> List[float]:
+    """One untimed warm-up pass (imports, caches), then `repeat` timed passes."""
+    for args in args_list:
+        fn(*args)
+    samples = []
+    gc.collect()
+    for _ in range(repeat):
+        for args in args_list:
+            started = time.perf_counter()
+            fn(*args)
+            samples.append(time.perf_counter() - started)
+    return samples
+
+
+# ---------------- BENCHMARKS ---------------- #
+
+def bench_extract_text(corpus_dir: str, manifest: List[dict], repeat: int) -> List[dict]:
+    from backend.utils.extract_text import extract_text
+
+    by_format = defaultdict(list)
+    for entry in manifest:
+        by_format[entry["format"]].append(os.path.join(corpus_dir, entry["file"]))
+
+    results = []
+    for fmt in sorted(by_format):
+        paths = by_format[fmt]
+        samples = time_calls(extract_text, [(p,) for p in paths], repeat)
+        chars = sum(len(extract_text(p)) for p in paths) // len(paths)
+        results.append(summarize(f"extract_text[{fmt}]", samples, unit="files", files=len(paths), chars=chars))
+    return results
+
+
+def bench_text_stage(name: str, texts: List[str], family: str, repeat: int) -> List[dict]:
+    if name == "extract_experience":
+        from backend.utils.experience_extractor import extract_experience
+        fn, args = extract_experience, [(t,) for t in texts]
+    elif name == "calculate_skill_score":
+        from backend.utils.skill_matcher import calculate_skill_score
+        skills = required_skills(family)
+        fn, args = calculate_skill_score, [(t, skills) for t in texts]
+    else:
+        from backend.utils.nlp_similarity import jd_resume_similarity
+        jd = job_description(family)
+        fn, args = jd_resume_similarity, [(jd, t) for t in texts]
+    return [summarize(name, time_calls(fn, args, repeat), unit="resumes")]
+
+
+def _analyze_file(path: str, job_vec, skills: List[str]) -> None:
+    # Mirrors the per-file steps of upload_routes._process_files
+    from backend.utils.experience_extractor import extract_experience
+    from backend.utils.extract_text import extract_text
+    from backend.utils.near_duplicates import minhash_signature
+    from backend.utils.nlp_similarity import hash_features, vector_similarity
+    from backend.utils.skill_matcher import calculate_skill_score
+
+    text = extract_text(path)
+    if not text:
+        return
+    calculate_skill_score(text, skills)
+    vector_similarity(job_vec, hash_features(text))
+    extract_experience(text)
+    minhash_signature(text)
+
+
+def bench_pipeline(zips: List[str], family: str, repeat: int) -> List[dict]:
+    from backend.utils.file_handler import TEMP_FOLDER, extract_zip
+    from backend.utils.nlp_similarity import hash_features
+
+    job_vec = hash_features(job_description(family))
+    skills = required_skills(family)
+    payloads = []
+    for path in zips:
+        with open(path, "rb") as f:
+            payloads.append(f.read())
+
+    file_samples, batch_samples = [], []
+    files = 0
+    for run in range(repeat + 1):  # run 0 warms up
+        for data in payloads:
+            started = time.perf_counter()
+            paths = extract_zip(data)
+            for path in paths:
+                file_started = time.perf_counter()
+                _analyze_file(path, job_vec, skills)
+                if run:
+                    file_samples.append(time.perf_counter() - file_started)
+            elapsed = time.perf_counter() - started
+            shutil.rmtree(os.path.join(TEMP_FOLDER, os.path.relpath(paths[0], TEMP_FOLDER).split(os.sep)[0]),
+                          ignore_errors=True)
+            if run:
+                batch_samples.append(elapsed)
+                files += len(paths)
+    return [
+        summarize("pipeline[file]", file_samples, unit="files"),
+        summarize("pipeline[zip]", batch_samples, items=files, unit="files", zips=len(payloads)),
+    ]
+
+
+def run(args) -> dict:
+    selected = args.only.split(",") if args.only else list(BENCHMARKS)
+    unknown = set(selected) - set(BENCHMARKS)
+    if unknown:
+        raise SystemExit(f"Unknown benchmark(s): {', '.join(sorted(unknown))}; choose from {', '.join(BENCHMARKS)}")
+
+    corpus_dir = args.corpus or tempfile.mkdtemp(prefix="hirelens_bench_")
+    try:
+        started = time.perf_counter()
+        manifest = generate_corpus(corpus_dir, args.count, args.seed)
+        print(f"Corpus: {len(manifest)} resumes (seed {args.seed}) in {corpus_dir}, "
+              f"generated in {time.perf_counter() - started:.1f}s\n")
+
+        results = []
+        if "extract_text" in selected:
+            results += bench_extract_text(corpus_dir, manifest, args.repeat)
+
+        text_stages = [name for name in selected if name in BENCHMARKS[1:4]]
+        if text_stages:
+            from backend.utils.extract_text import extract_text
+            texts = [t for t in (extract_text(os.path.join(corpus_dir, e["file"])) for e in manifest) if t]
+            for name in text_stages:
+                results += bench_text_stage(name, texts, args.family, args.repeat)
+
+        if "pipeline" in selected:
+            zips = build_zips(corpus_dir, manifest, args.zip_size)
+            results += bench_pipeline(zips, args.family, args.repeat)
+    finally:
+        if not args.corpus:
+            shutil.rmtree(corpus_dir, ignore_errors=True)
+
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}, {os.cpu_count()} CPUs",
+        "params": {"count": args.count, "seed": args.seed, "repeat": args.repeat,
+                   "family": args.family, "zip_size": args.zip_size},
+        "results": results,
+    }
+
+
+# ---------------- REPORTING ---------------- #
+
+def _change(new: float, old: Optional[float]) -> str:
+    if not old:
+        return ""
+    return f"{(new - old) / old * 100:+.0f}%"
+
+
+def report(run_data: dict, baseline: Optional[dict]) -> None:
+    """Prints the results table, with changes against the baseline when there is one."""
+    base = {r["name"]: r for r in (baseline or {}).get("results", [])}
+    header = f"{'benchmark':<30} {'calls':>6} {'throughput':>16} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    if baseline:
+        header += f" {'p50 vs base':>12} {'thru vs base':>13}"
+    print(header)
+    print("-" * len(header))
+    for r in run_data["results"]:
+        line = (f"{r['name']:<30} {r['calls']:>6} {r['throughput']:>10.1f} {r['unit'] + '/s':<5}"
+                f" {r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} {r['p99_ms']:>9.2f}")
+        old = base.get(r["name"])
+        if old:
+            line += f" {_change(r['p50_ms'], old['p50_ms']):>12} {_change(r['throughput'], old['throughput']):>13}"
+        if "chars" in r:
+            line += f"  ({r['chars']} chars/file)"
+        print(line)
+    if baseline:
+        print(f"\nBaseline from {baseline.get('created_at', '?')} ({baseline.get('machine', '?')})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="HireLens per-stage benchmarks")
+    parser.add_argument("--count", type=int, default=60, help="resumes in the synthetic corpus")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=3, help="timed passes over the corpus")
+    parser.add_argument("--family", default="data", help="job description/skills to score against")
+    parser.add_argument("--zip-size", type=int, default=20, help="resumes per ZIP in the pipeline benchmark")
+    parser.add_argument("--only", default="", help=f"comma-separated subset of: {', '.join(BENCHMARKS)}")
+    parser.add_argument("--corpus", help="keep the generated corpus in this directory")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--json", help="also write this run's results to a file")
+    parser.add_argument("--max-regression", type=float, default=0.0,
+                        help="exit 1 if any p50 is more than this many percent slower than the baseline")
+    args = parser.parse_args()
+
+    baseline = None
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("params") != {"count": args.count, "seed": args.seed, "repeat": args.repeat,
+                                      "family": args.family, "zip_size": args.zip_size}:
+            print(f"Note: baseline was recorded with {baseline.get('params')}\n")
+
+    data = run(args)
+    report(data, baseline)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(data, f, indent=1)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(data, f, indent=1)
+        print(f"\nSaved baseline to {args.baseline}")
+
+    if baseline and args.max_regression:
+        base = {r["name"]: r["p50_ms"] for r in baseline["results"]}
+        slower = [r["name"] for r in data["results"]
+                  if base.get(r["name"]) and r["p50_ms"] > base[r["name"]] * (1 + args.max_regression / 100)]
+        if slower:
+            print(f"\nRegressed by more than {args.max_regression:.0f}%: {', '.join(slower)}")
+            sys.exit(1)
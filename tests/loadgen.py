@@ -0,0 +1,282 @@
+"""
+Async load generator for the HireLens API.
+
+Virtual users each sign up, log in and save job criteria, then loop over a
+weighted mix of scenarios until the run ends:
+
+- upload:    POST /upload/resumes with a ZIP of synthetic resumes
+- dashboard: GET /dashboard/summary, /dashboard/analytics, /dashboard/top-resumes
+- auth:      POST /auth/login
+
+Latency percentiles, throughput and errors are reported per endpoint.
+Run it against a server started with the in-memory Supabase stand-in, or
+let it start one:
+
+    python -m tests.loadgen --spawn --users 20 --duration 30
+    SUPABASE_FAKE=true python -m backend.server &
+    python -m tests.loadgen --url http://localhost:8000 --mix upload=1,dashboard=6,auth=2
+
+--spawn starts `python -m backend.server` on a free port with
+SUPABASE_FAKE=true (plus SUPABASE_FAKE_LATENCY_MS from --db-latency-ms)
+and stops it afterwards. Pointing --url at a deployment backed by a real
+Supabase project writes real rows and files.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import httpx
+
+from tests.synthetic_resumes import build_zips, generate_corpus, job_description, required_skills
+
+SCENARIOS = ("upload", "dashboard", "auth")
+DEFAULT_MIX = "upload=1,dashboard=6,auth=2"
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        self.recording = False
+
+    async def call(self, client: httpx.AsyncClient, name: str, method: str, url: str,
+                   ok=(200,), **kwargs) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError as e:
+            if self.recording:
+                self.errors[name] += 1
+                self.statuses[name][type(e).__name__] += 1
+            return None
+        elapsed = time.perf_counter() - started
+        if self.recording:
+            self.latencies[name].append(elapsed)
+            self.statuses[name][response.status_code] += 1
+            if response.status_code not in ok:
+                self.errors[name] += 1
+        return response
+
+
+# ---------------- SCENARIOS ---------------- #
+
+class VirtualUser:
+    def __init__(self, n: int, client: httpx.AsyncClient, recorder: Recorder, zips: List[bytes], family: str):
+        self.email = f"load-{os.getpid()}-{n}@example.com"
+        self.password = f"pw-{n}-loadtest"
+        self.client = client
+        self.recorder = recorder
+        self.zips = zips
+        self.family = family
+        self.rng = random.Random(n)
+
+    async def setup(self) -> None:
+        call = self.recorder.call
+        await call(self.client, "POST /auth/signup", "POST", "/auth/signup",
+                   data={"email": self.email, "password": self.password})
+        await call(self.client, "POST /criteria/save", "POST", "/criteria/save", data={
+            "hr_id": self.email,
+            "job_desc": job_description(self.family),
+            "min_exp": 1,
+            "skills": ",".join(required_skills(self.family)),
+            "department": "Load test",
+            "min_score": 40,
+        })
+
+    async def upload(self) -> None:
+        data = self.rng.choice(self.zips)
+        await self.recorder.call(self.client, "POST /upload/resumes", "POST", "/upload/resumes",
+                                 data={"hr_id": self.email},
+                                 files={"zip_file": ("resumes.zip", data, "application/zip")})
+
+    async def dashboard(self) -> None:
+        params = {"hr_id": self.email}
+        for path in ("/dashboard/summary", "/dashboard/analytics", "/dashboard/top-resumes"):
+            await self.recorder.call(self.client, f"GET {path}", "GET", path, params=params)
+
+    async def auth(self) -> None:
+        # A successful login answers with a redirect to /input
+        await self.recorder.call(self.client, "POST /auth/login", "POST", "/auth/login", ok=(302,),
+                                 data={"email": self.email, "password": self.password})
+
+
+async def _user_loop(user: VirtualUser, mix: Dict[str, float], deadline: float, think: float) -> None:
+    names = sorted(mix)
+    weights = [mix[name] for name in names]
+    while time.monotonic() < deadline:
+        await getattr(user, user.rng.choices(names, weights=weights)[0])()
+        if think:
+            await asyncio.sleep(user.rng.uniform(0, 2 * think))
+
+
+async def run_load(url: str, users: int, duration: float, ramp_up: float, mix: Dict[str, float],
+                   zips: List[bytes], family: str, think: float, timeout: float) -> dict:
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+    async with httpx.AsyncClient(base_url=url, timeout=timeout, limits=limits, follow_redirects=False) as client:
+        await client.post("/warmup")
+        virtual = [VirtualUser(n, client, recorder, zips, family) for n in range(users)]
+        await asyncio.gather(*(user.setup() for user in virtual))
+
+        recorder.recording = True
+        started = time.monotonic()
+        deadline = started + duration
+
+        async def start(user: VirtualUser, delay: float):
+            await asyncio.sleep(delay)
+            await _user_loop(user, mix, deadline, think)
+
+        await asyncio.gather(*(start(user, ramp_up * n / users) for n, user in enumerate(virtual)))
+        elapsed = time.monotonic() - started
+    return _summary(recorder, elapsed, users)
+
+
+# ---------------- REPORTING ---------------- #
+
+def _pct(samples: List[float], p: float) -> float:
+    return round(samples[min(len(samples) - 1, int(p * len(samples)))] * 1000, 1)
+
+
+def _summary(recorder: Recorder, elapsed: float, users: int) -> dict:
+    endpoints = []
+    every = []
+    for name in sorted(set(recorder.latencies) | set(recorder.errors)):
+        samples = sorted(recorder.latencies.get(name, []))
+        every.extend(samples)
+        row = {"endpoint": name, "requests": len(samples), "errors": recorder.errors.get(name, 0),
+               "rps": round(len(samples) / elapsed, 2),
+               "statuses": {str(k): v for k, v in recorder.statuses[name].items()}}
+        if samples:
+            row.update(p50_ms=_pct(samples, 0.5), p95_ms=_pct(samples, 0.95),
+                       p99_ms=_pct(samples, 0.99), max_ms=round(samples[-1] * 1000, 1))
+        endpoints.append(row)
+    every.sort()
+    total = {"endpoint": "ALL", "requests": len(every), "errors": sum(recorder.errors.values()),
+             "rps": round(len(every) / elapsed, 2)}
+    if every:
+        total.update(p50_ms=_pct(every, 0.5), p95_ms=_pct(every, 0.95),
+                     p99_ms=_pct(every, 0.99), max_ms=round(every[-1] * 1000, 1))
+    return {"duration_s": round(elapsed, 1), "users": users, "endpoints": endpoints, "total": total}
+
+
+def print_summary(summary: dict) -> None:
+    header = f"{'endpoint':<28} {'reqs':>7} {'errors':>6} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}"
+    print(f"\n{summary['users']} users for {summary['duration_s']}s\n")
+    print(header)
+    print("-" * len(header))
+    for row in summary["endpoints"] + [summary["total"]]:
+        if row["endpoint"] == "ALL":
+            print("-" * len(header))
+        print(f"{row['endpoint']:<28} {row['requests']:>7} {row['errors']:>6} {row['rps']:>8.2f}"
+              f" {row.get('p50_ms', 0):>9.1f} {row.get('p95_ms', 0):>9.1f}"
+              f" {row.get('p99_ms', 0):>9.1f} {row.get('max_ms', 0):>9.1f}")
+    failing = {r["endpoint"]: r["statuses"] for r in summary["endpoints"] if r["errors"]}
+    for endpoint, statuses in failing.items():
+        print(f"  {endpoint}: {statuses}")
+
+
+# ---------------- SETUP ---------------- #
+
+def parse_mix(text: str) -> Dict[str, float]:
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.strip().partition("=")
+        if name not in SCENARIOS:
+            raise SystemExit(f"Unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+        mix[name] = float(weight or 1)
+    return {name: weight for name, weight in mix.items() if weight > 0}
+
+
+def make_zips(count: int, zip_size: int, seed: int) -> List[bytes]:
+    folder = tempfile.mkdtemp(prefix="hirelens_load_")
+    try:
+        # Scanned PDFs are left out: OCR would dominate every upload
+        manifest = generate_corpus(folder, count * zip_size, seed, mix={"txt": 1, "pdf": 2, "docx": 2})
+        zips = []
+        for path in build_zips(folder, manifest, zip_size):
+            with open(path, "rb") as f:
+                zips.append(f.read())
+        return zips
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def spawn_server(workers: int, db_latency_ms: float) -> tuple:
+    port = _free_port()
+    env = {
+        **os.environ,
+        "SUPABASE_FAKE": "true",
+        "SUPABASE_FAKE_LATENCY_MS": str(db_latency_ms),
+        "HOST": "127.0.0.1",
+        "PORT": str(port),
+        "WEB_CONCURRENCY": str(workers),
+    }
+    log = tempfile.NamedTemporaryFile(prefix="hirelens_server_", suffix=".log", delete=False)
+    print(f"Server log: {log.name}")
+    process = subprocess.Popen([sys.executable, "-m", "backend.server"], env=env, stdout=log, stderr=subprocess.STDOUT)
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"Server exited with code {process.returncode}; see {log.name}")
+        try:
+            if httpx.get(f"{url}/health", timeout=1).status_code == 200:
+                return process, url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise SystemExit("Server did not become healthy within 60s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="HireLens API load generator")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--spawn", action="store_true", help="start a local server with SUPABASE_FAKE=true")
+    parser.add_argument("--workers", type=int, default=1, help="server processes with --spawn")
+    parser.add_argument("--db-latency-ms", type=float, default=0.0, help="simulated Supabase round trip with --spawn")
+    parser.add_argument("--users", type=int, default=10, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of measured load")
+    parser.add_argument("--ramp-up", type=float, default=2.0, help="seconds over which users start")
+    parser.add_argument("--think", type=float, default=0.0, help="mean pause between a user's actions (s)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"scenario weights (default {DEFAULT_MIX})")
+    parser.add_argument("--zips", type=int, default=4, help="distinct upload ZIPs to rotate through")
+    parser.add_argument("--zip-size", type=int, default=10, help="resumes per upload ZIP")
+    parser.add_argument("--family", default="data", help="job description/skills for the criteria")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--timeout", type=float, default=120.0, help="per-request timeout (s)")
+    parser.add_argument("--json", help="also write the results to a file")
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    zips = make_zips(args.zips, args.zip_size, args.seed) if "upload" in mix else []
+    server, url = spawn_server(args.workers, args.db_latency_ms) if args.spawn else (None, args.url)
+    try:
+        summary = asyncio.run(run_load(url, args.users, args.duration, args.ramp_up, mix,
+                                       zips, args.family, args.think, args.timeout))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=60)
+    print_summary(summary)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summary, f, indent=1)
@@ -0,0 +1,409 @@
+"""
+Deterministic synthetic resumes for tests and benchmarks.
+
+The same seed always produces the same people, jobs and skills, so
+benchmark runs on different machines (or before/after a change) read the
+same text. Formats:
+
+- txt:     plain text
+- pdf:     text PDF (PyMuPDF)
+- scanned: image-only PDF, a rendered page per image, so extraction
+           falls back to OCR
+- docx:    Word document with the skills and job history in tables
+
+Usage (from the repo root):
+
+    python -m tests.synthetic_resumes out_dir --count 200 --seed 7
+    python -m tests.synthetic_resumes out_dir --count 500 --zip-size 50 --formats pdf,docx
+
+A manifest.json next to the files lists every resume with its format,
+role family, skills and job dates.
+"""
+
+import argparse
+import io
+import json
+import os
+import random
+import textwrap
+import zipfile
+from datetime import datetime
+from typing import Dict, List, Optional
+
+FORMATS = ("txt", "pdf", "docx", "scanned")
+DEFAULT_MIX = {"txt": 0.25, "pdf": 0.35, "docx": 0.3, "scanned": 0.1}
+ZIP_DATE = (2024, 1, 1, 0, 0, 0)
+DOC_DATE = datetime(2024, 1, 1)
+
+FIRST_NAMES = [
+    "Aarav", "Aditi", "Akash", "Ananya", "Arjun", "Bhavna", "Daniel", "Deepa", "Emma", "Farhan",
+    "Gaurav", "Hannah", "Isha", "Jyoti", "Karan", "Kavya", "Liam", "Megha", "Mohit", "Neha",
+    "Nikhil", "Olivia", "Pooja", "Priya", "Rahul", "Riya", "Rohan", "Sana", "Sneha", "Tanvi",
+    "Varun", "Vikram", "Zara", "Lucas", "Mei", "Omar", "Sofia", "Tariq", "Yuki", "Noah",
+]
+LAST_NAMES = [
+    "Agarwal", "Bansal", "Chopra", "Das", "Gola", "Gupta", "Iyer", "Jain", "Kapoor", "Khan",
+    "Kumar", "Mehta", "Menon", "Nair", "Patel", "Rao", "Reddy", "Shah", "Sharma", "Singh",
+    "Verma", "Wadhwani", "Brown", "Chen", "Garcia", "Kim", "Martin", "Nguyen", "Okafor", "Silva",
+]
+COMPANIES = [
+    "Acme Retail", "Northwind Finance", "Globex Analytics", "Initech", "Umbrella Health",
+    "Stark Logistics", "Wayne Media", "Hooli", "Vandelay Imports", "Cyberdyne Systems",
+    "Tata Consultancy Services", "Infosys", "Wipro", "Zomato", "Flipkart", "Razorpay",
+    "Swiggy", "Freshworks", "Zoho", "Paytm", "Accenture", "Deloitte", "Capgemini", "Mu Sigma",
+]
+UNIVERSITIES = [
+    "Delhi University", "IIT Bombay", "IIT Delhi", "NIT Trichy", "BITS Pilani", "Anna University",
+    "Pune University", "University of Mumbai", "VIT Vellore", "Manipal University",
+]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+# Role family -> titles, skills and achievement templates ({skill} is filled in)
+FAMILIES = {
+    "data": {
+        "titles": ["Data Analyst", "Senior Data Analyst", "Business Intelligence Analyst", "Analytics Engineer"],
+        "skills": ["Python", "SQL", "Excel", "Power BI", "Tableau", "Pandas", "Statistics",
+                   "Data Analysis", "Data Visualization", "Machine Learning", "PostgreSQL", "Looker"],
+        "bullets": [
+            "Built {skill} dashboards used by regional managers for weekly revenue reviews",
+            "Wrote {skill} models for churn, basket size and promotion uplift",
+            "Automated month-end reporting with {skill}, saving two days per close",
+            "Cleaned and joined sales, marketing and finance data sets using {skill}",
+            "Presented A/B test results and {skill} analyses to product leadership",
+            "Migrated legacy spreadsheets into a {skill} warehouse with documented metrics",
+        ],
+        "summary": "Data analyst with hands-on experience turning raw data into decisions using {skills}.",
+        "jd": "We are hiring a Data Analyst to build dashboards and reports, write SQL and Python "
+              "analyses, and partner with business teams. Experience with Excel, Power BI or Tableau, "
+              "statistics and communicating insights to stakeholders is required.",
+    },
+    "backend": {
+        "titles": ["Backend Engineer", "Software Engineer", "Senior Software Engineer", "Platform Engineer"],
+        "skills": ["Python", "Java", "Go", "SQL", "PostgreSQL", "Docker", "Kubernetes", "AWS",
+                   "REST APIs", "Redis", "Kafka", "FastAPI", "Microservices", "Git"],
+        "bullets": [
+            "Designed {skill} services handling 20k requests per second at p99 under 80 ms",
+            "Led the migration of a monolith to {skill} based microservices",
+            "Introduced {skill} caching that cut database load by 40 percent",
+            "Owned on-call and incident reviews for the {skill} payments platform",
+            "Built CI pipelines with {skill} and reduced deploy time from 40 to 8 minutes",
+            "Mentored three junior engineers on {skill} and code review practices",
+        ],
+        "summary": "Backend engineer building reliable, observable services with {skills}.",
+        "jd": "We are looking for a Backend Engineer to design and operate REST APIs and microservices "
+              "in Python or Go, with PostgreSQL, Redis and Kafka, deployed on Docker and Kubernetes in AWS.",
+    },
+    "frontend": {
+        "titles": ["Frontend Developer", "UI Engineer", "Full Stack Developer", "Web Developer"],
+        "skills": ["JavaScript", "TypeScript", "React", "HTML", "CSS", "Next.js", "Redux",
+                   "Node.js", "Figma", "Jest", "Accessibility", "GraphQL"],
+        "bullets": [
+            "Rebuilt the checkout flow in {skill}, lifting conversion by 6 percent",
+            "Created a shared {skill} component library used by five product teams",
+            "Improved Lighthouse scores from 62 to 95 by optimising {skill} bundles",
+            "Wrote {skill} tests that brought front-end coverage above 80 percent",
+            "Worked with designers in {skill} to ship a responsive dashboard",
+        ],
+        "summary": "Frontend developer focused on fast, accessible interfaces with {skills}.",
+        "jd": "Frontend Developer needed to build responsive web applications in React and TypeScript, "
+              "with strong JavaScript, HTML and CSS, testing with Jest and attention to accessibility.",
+    },
+    "ml": {
+        "titles": ["Machine Learning Engineer", "Data Scientist", "NLP Engineer", "Applied Scientist"],
+        "skills": ["Python", "Machine Learning", "Deep Learning", "Natural Language Processing",
+                   "PyTorch", "TensorFlow", "Scikit-learn", "SQL", "Statistics", "MLOps", "Spark"],
+        "bullets": [
+            "Trained {skill} models for demand forecasting with 12 percent lower error",
+            "Shipped a {skill} ranking model serving 5 million predictions a day",
+            "Built feature pipelines in {skill} with automated drift monitoring",
+            "Fine-tuned {skill} models for resume and job description matching",
+            "Set up {skill} experiment tracking and reproducible training jobs",
+        ],
+        "summary": "Machine learning engineer taking models from notebooks to production with {skills}.",
+        "jd": "Machine Learning Engineer to train and deploy models in Python with PyTorch or TensorFlow, "
+              "including NLP and deep learning, with solid statistics, SQL and MLOps practices.",
+    },
+}
+
+
+# ---------------- PROFILES ---------------- #
+
+def _rng(seed: int, index: int) -> random.Random:
+    # Per-resume stream: resume i is the same whatever --count is
+    return random.Random(f"hirelens:{seed}:{index}")
+
+
+def make_profile(seed: int, index: int, as_of_year: int = 2024) -> dict:
+    rng = _rng(seed, index)
+    family = rng.choice(sorted(FAMILIES))
+    spec = FAMILIES[family]
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    skills = rng.sample(spec["skills"], rng.randint(4, min(9, len(spec["skills"]))))
+
+    jobs = []
+    end_year, end_month = as_of_year, rng.randint(1, 12)
+    for n in range(rng.choice([1, 1, 2, 2, 3, 3, 4, 5])):
+        months = rng.randint(8, 40)
+        start_index = end_year * 12 + end_month - 1 - months
+        start_year, start_month = divmod(start_index, 12)
+        jobs.append({
+            "title": rng.choice(spec["titles"]),
+            "company": rng.choice(COMPANIES),
+            "start": f"{MONTHS[start_month]} {start_year}",
+            "end": "Present" if n == 0 and rng.random() < 0.6 else f"{MONTHS[end_month - 1]} {end_year}",
+            "bullets": [rng.choice(spec["bullets"]).format(skill=rng.choice(skills))
+                        for _ in range(rng.randint(2, 5))],
+        })
+        gap = rng.randint(0, 6)
+        end_index = start_index - gap
+        end_year, end_month = divmod(end_index, 12)
+        end_month += 1
+
+    grad_year = int(jobs[-1]["start"].split()[1]) - rng.randint(0, 2)
+    return {
+        "id": f"r{index:05d}",
+        "name": f"{first} {last}",
+        "email": f"{first.lower()}.{last.lower()}{rng.randint(1, 99)}@example.com",
+        "phone": f"+91 {rng.randint(70000, 99999)} {rng.randint(10000, 99999)}",
+        "family": family,
+        "headline": jobs[0]["title"],
+        "summary": spec["summary"].format(skills=", ".join(skills[:3])),
+        "skills": skills,
+        "jobs": jobs,
+        "education": f"B.Tech, {rng.choice(UNIVERSITIES)} ({grad_year - 4} - {grad_year})",
+    }
+
+
+def job_description(family: str = "data") -> str:
+    return FAMILIES[family]["jd"]
+
+
+def required_skills(family: str = "data", count: int = 5) -> List[str]:
+    return FAMILIES[family]["skills"][:count]
+
+
+def resume_lines(profile: dict) -> List[str]:
+    lines = [
+        profile["name"],
+        profile["headline"],
+        f"{profile['email']} | {profile['phone']}",
+        "",
+        "SUMMARY",
+        profile["summary"],
+        "",
+        "SKILLS",
+        ", ".join(profile["skills"]),
+        "",
+        "EXPERIENCE",
+    ]
+    for job in profile["jobs"]:
+        lines.append(f"{job['title']}, {job['company']} ({job['start']} - {job['end']})")
+        lines.extend(f"- {bullet}" for bullet in job["bullets"])
+        lines.append("")
+    lines += ["EDUCATION", profile["education"]]
+    return lines
+
+
+def resume_text(profile: dict) -> str:
+    return "\n".join(resume_lines(profile)) + "\n"
+
+
+# ---------------- WRITERS ---------------- #
+
+def _wrapped(profile: dict, width: int) -> List[str]:
+    out = []
+    for line in resume_lines(profile):
+        out.extend(textwrap.wrap(line, width) or [""])
+    return out
+
+
+def write_txt(profile: dict, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(resume_text(profile))
+
+
+def write_pdf(profile: dict, path: str) -> None:
+    import fitz  # PyMuPDF
+
+    doc = fitz.open()
+    lines = _wrapped(profile, 95)
+    per_page = 52
+    for start in range(0, len(lines), per_page):
+        page = doc.new_page(width=612, height=792)
+        y = 60
+        for line in lines[start:start + per_page]:
+            page.insert_text((54, y), line, fontsize=10, fontname="helv")
+            y += 13
+    doc.set_metadata({})
+    doc.save(path, garbage=3, deflate=True, no_new_id=True)
+    doc.close()
+
+
+def write_scanned_pdf(profile: dict, path: str, dpi: int = 150) -> None:
+    """Each page is a slightly skewed greyscale image of the text, as a scanner would produce."""
+    import fitz  # PyMuPDF
+    from PIL import Image, ImageDraw, ImageFont
+
+    rng = random.Random(profile["id"])
+    font = ImageFont.load_default(size=int(dpi * 0.14))
+    width, height = int(8.5 * dpi), int(11 * dpi)
+    line_height = int(dpi * 0.2)
+    lines = _wrapped(profile, 90)
+    per_page = (height - 2 * dpi) // line_height
+
+    doc = fitz.open()
+    for start in range(0, len(lines), per_page):
+        image = Image.new("L", (width, height), 255)
+        draw = ImageDraw.Draw(image)
+        y = dpi
+        for line in lines[start:start + per_page]:
+            draw.text((int(dpi * 0.75), y), line, fill=20, font=font)
+            y += line_height
+        for _ in range(400):  # scanner speckle
+            x, y = rng.randrange(width), rng.randrange(height)
+            draw.point((x, y), fill=rng.randint(120, 200))
+        image = image.rotate(rng.uniform(-0.8, 0.8), fillcolor=255)
+
+        buf = io.BytesIO()
+        image.save(buf, format="PNG")
+        page = doc.new_page(width=612, height=792)
+        page.insert_image(page.rect, stream=buf.getvalue())
+    doc.set_metadata({})
+    doc.save(path, garbage=3, deflate=True, no_new_id=True)
+    doc.close()
+
+
+def write_docx(profile: dict, path: str) -> None:
+    import docx
+
+    doc = docx.Document()
+    doc.core_properties.created = DOC_DATE
+    doc.core_properties.modified = DOC_DATE
+    doc.add_heading(profile["name"], level=0)
+    doc.add_paragraph(f"{profile['headline']}\n{profile['email']} | {profile['phone']}")
+
+    doc.add_heading("Summary", level=1)
+    doc.add_paragraph(profile["summary"])
+
+    doc.add_heading("Skills", level=1)
+    skills = profile["skills"]
+    table = doc.add_table(rows=0, cols=3)
+    for start in range(0, len(skills), 3):
+        cells = table.add_row().cells
+        for cell, skill in zip(cells, skills[start:start + 3]):
+            cell.text = skill
+
+    doc.add_heading("Experience", level=1)
+    history = doc.add_table(rows=1, cols=3)
+    for cell, label in zip(history.rows[0].cells, ("Role", "Company", "Dates")):
+        cell.text = label
+    for job in profile["jobs"]:
+        cells = history.add_row().cells
+        cells[0].text = job["title"]
+        cells[1].text = job["company"]
+        cells[2].text = f"{job['start']} - {job['end']}"
+    for job in profile["jobs"]:
+        doc.add_paragraph(f"{job['title']}, {job['company']}", style="Heading 2")
+        for bullet in job["bullets"]:
+            doc.add_paragraph(bullet, style="List Bullet")
+
+    doc.add_heading("Education", level=1)
+    doc.add_paragraph(profile["education"])
+
+    # python-docx stamps the package parts with the current time; pin them
+    buf = io.BytesIO()
+    doc.save(buf)
+    with zipfile.ZipFile(buf) as src, zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as dst:
+        for item in src.infolist():
+            info = zipfile.ZipInfo(item.filename, date_time=ZIP_DATE)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            dst.writestr(info, src.read(item.filename))
+
+
+WRITERS = {
+    "txt": (".txt", write_txt),
+    "pdf": (".pdf", write_pdf),
+    "scanned": (".pdf", write_scanned_pdf),
+    "docx": (".docx", write_docx),
+}
+
+
+# ---------------- CORPUS ---------------- #
+
+def pick_format(seed: int, index: int, mix: Dict[str, float]) -> str:
+    formats = sorted(mix)
+    return random.Random(f"format:{seed}:{index}").choices(formats, weights=[mix[f] for f in formats])[0]
+
+
+def generate_corpus(out_dir: str, count: int, seed: int = 7, mix: Optional[Dict[str, float]] = None) -> List[dict]:
+    """Writes `count` resumes plus manifest.json to out_dir; returns the manifest entries."""
+    mix = mix or DEFAULT_MIX
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = []
+    for index in range(count):
+        profile = make_profile(seed, index)
+        fmt = pick_format(seed, index, mix)
+        ext, writer = WRITERS[fmt]
+        suffix = "_scan" if fmt == "scanned" else ""
+        name = f"{profile['id']}_{profile['name'].replace(' ', '_')}{suffix}{ext}"
+        path = os.path.join(out_dir, name)
+        writer(profile, path)
+        manifest.append({
+            "file": name,
+            "format": fmt,
+            "bytes": os.path.getsize(path),
+            **{k: profile[k] for k in ("id", "name", "family", "skills")},
+            "jobs": [{k: job[k] for k in ("title", "company", "start", "end")} for job in profile["jobs"]],
+        })
+    with open(os.path.join(out_dir, "manifest.json"), "w") as f:
+        json.dump({"seed": seed, "count": count, "mix": mix, "resumes": manifest}, f, indent=1)
+    return manifest
+
+
+def build_zip(paths: List[str], zip_path: str) -> str:
+    """ZIP with fixed timestamps, so equal inputs give identical archives."""
+    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for path in paths:
+            info = zipfile.ZipInfo(os.path.basename(path), date_time=ZIP_DATE)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            with open(path, "rb") as f:
+                zf.writestr(info, f.read())
+    return zip_path
+
+
+def build_zips(out_dir: str, manifest: List[dict], zip_size: int) -> List[str]:
+    """Splits the corpus into ZIPs of `zip_size` resumes (the upload limit is 50)."""
+    zips = []
+    for n, start in enumerate(range(0, len(manifest), zip_size)):
+        paths = [os.path.join(out_dir, entry["file"]) for entry in manifest[start:start + zip_size]]
+        zips.append(build_zip(paths, os.path.join(out_dir, f"batch_{n:03d}.zip")))
+    return zips
+
+
+def parse_mix(formats: str) -> Dict[str, float]:
+    """"pdf,docx" -> equal weights; "pdf=3,scanned=1" -> given weights."""
+    mix = {}
+    for part in formats.split(","):
+        name, _, weight = part.strip().partition("=")
+        if name not in FORMATS:
+            raise ValueError(f"Unknown format {name!r}; choose from {', '.join(FORMATS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic resume corpus")
+    parser.add_argument("out_dir")
+    parser.add_argument("--count", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--formats", default="", help='e.g. "pdf,docx" or "txt=1,pdf=3,scanned=1" (default: mixed)')
+    parser.add_argument("--zip-size", type=int, default=0, help="also bundle the resumes into ZIPs of this many")
+    args = parser.parse_args()
+
+    entries = generate_corpus(args.out_dir, args.count, args.seed, parse_mix(args.formats) if args.formats else None)
+    by_format = {}
+    for entry in entries:
+        by_format[entry["format"]] = by_format.get(entry["format"], 0) + 1
+    print(f"Wrote {len(entries)} resumes to {args.out_dir}: {by_format}")
+    if args.zip_size:
+        print(f"Wrote {len(build_zips(args.out_dir, entries, args.zip_size))} ZIPs")
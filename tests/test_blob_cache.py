@@ -0,0 +1,30 @@
+import tempfile
+
+from backend.utils.blob_cache import BlobCache
+
+print("\n=========== BLOB CACHE TEST ===========\n")
+
+with tempfile.TemporaryDirectory() as root:
+    cache = BlobCache(root, max_bytes=250)
+
+    print("Miss before put:", cache.get("a_resume.pdf") is None)
+    cache.put("a_resume.pdf", b"a" * 100)
+    cache.put("b_resume.pdf", b"b" * 100)
+    print("Hit after put:", cache.get("a_resume.pdf") == b"a" * 100)
+
+    # Over budget: b is the least recently used entry and gets evicted
+    cache.put("c_resume.pdf", b"c" * 100)
+    print("Evicted LRU entry:", cache.get("b_resume.pdf") is None)
+    print("Kept recent entry:", cache.get("a_resume.pdf") is not None)
+
+    # A fresh instance (another worker) sees the same files
+    other = BlobCache(root, max_bytes=250)
+    print("Shared across instances:", other.get("c_resume.pdf") == b"c" * 100)
+
+    # Both instances write under one budget: the directory stays within it
+    other.put("d_resume.pdf", b"d" * 100)
+    cache.put("e_resume.pdf", b"e" * 100)
+    print("Shared budget enforced:", cache.stats()["bytes"] <= 250)
+    print("Newest entries kept:", other.get("d_resume.pdf") is not None and other.get("e_resume.pdf") is not None)
+
+    print("Stats:", cache.stats())
@@ -9,7 +9,10 @@ test_cases = [
     "Total experience is 3-5 years",
     "I have six years experience in software development",
     "Worked for 8 months as intern",
-    "No experience mentioned here"
+    "No experience mentioned here",
+    "Software Engineer, Acme\nJan 2019 – Dec 2021\nDeveloper, Foo\nJun 2016 - Mar 2019",
+    "Analyst 03/2018 - 06/2020\nLead 01/2020 to 12/2021",
+    "B.Tech, XYZ University 2012 - 2016\nIntern 2016 - 2017",
 ]
 
 print("\n======= EXPERIENCE EXTRACTION TEST =======\n")
@@ -0,0 +1,66 @@
+from backend.utils.fake_supabase import FakeClient
+
+print("\n=========== FAKE SUPABASE TEST ===========\n")
+
+db = FakeClient()
+rows = db.table("resumes").insert([
+    {"hr_id": "hr@x.com", "final_score": 81.5, "status": "Selected", "duplicate_of": None},
+    {"hr_id": "hr@x.com", "final_score": 64.0, "status": "Rejected", "duplicate_of": None},
+    {"hr_id": "hr@x.com", "final_score": 81.5, "status": "Selected", "duplicate_of": 1},
+    {"hr_id": "other@x.com", "final_score": 90.0, "status": "Selected", "duplicate_of": None},
+]).execute().data
+print("Inserted ids:", [r["id"] for r in rows])
+
+# Query-string style values are coerced to the column type, as PostgREST does
+print("eq('id', '2'):", [r["id"] for r in db.table("resumes").select("id").eq("id", "2").execute().data])
+
+res = (
+    db.table("resumes")
+    .select("id, final_score", count="exact")
+    .eq("hr_id", "hr@x.com")
+    .in_("status", ["Selected", "SELECTED"])
+    .is_("duplicate_of", "null")
+    .order("final_score", desc=True)
+    .execute()
+)
+print("Selected, not duplicates:", res.data, "count:", res.count)
+
+# Keyset page after (81.5, id 3)
+page = (
+    db.table("resumes").select("id").eq("hr_id", "hr@x.com")
+    .or_("final_score.lt.81.5,and(final_score.eq.81.5,id.lt.3)")
+    .order("final_score", desc=True).order("id", desc=True)
+    .range(0, 9).execute()
+)
+print("Keyset page:", [r["id"] for r in page.data])
+
+db.table("bulk").insert([{"n": n} for n in range(2500)]).execute()
+capped = db.table("bulk").select("n", count="exact").execute()
+print("Unpaged select:", len(capped.data), "of", capped.count)
+print("Third page:", len(db.table("bulk").select("n").order("n").range(2000, 2999).execute().data))
+
+db.table("hr_stats").upsert({"hr_id": "hr@x.com", "total": 3}, on_conflict="hr_id").execute()
+db.table("hr_stats").upsert({"hr_id": "hr@x.com", "total": 4}, on_conflict="hr_id").execute()
+print("Upserted stats:", db.table("hr_stats").select("hr_id,total").execute().data)
+
+# Concurrent deltas through the RPC all land
+from concurrent.futures import ThreadPoolExecutor
+delta = {"total": 1, "selected": 1, "score_sum": 0.5, "skill_counts": {"python": 1, "sql": -1}}
+with ThreadPoolExecutor(8) as pool:
+    list(pool.map(lambda _: db.rpc("apply_hr_stats_delta", {"p_hr_id": "new@x.com", "p_delta": delta}).execute(), range(40)))
+print("RPC stats:", db.table("hr_stats").select("total,selected,score_sum,skill_counts").eq("hr_id", "new@x.com").execute().data)
+
+bucket = db.storage.from_("resumes")
+bucket.upload("cas/a.txt", b"hello")
+try:
+    bucket.upload("cas/a.txt", b"hello")
+except Exception as e:
+    print("Second upload:", e)
+print("Download:", bucket.download("cas/a.txt"))
+print("Signed:", [(u["path"], bool(u["signedURL"])) for u in bucket.create_signed_urls(["cas/a.txt", "cas/missing.txt"], 60)])
+print("List:", [i["name"] for i in bucket.list("cas")])
+
+user = db.auth.sign_up({"email": "hr@x.com", "password": "secret123"}).user
+db.auth.admin.update_user_by_id(user.id, {"password": "changed123"})
+print("Auth users:", [(u.email, u.password) for u in db.auth.admin.list_users()])
+print("Stats:", db.stats())
@@ -0,0 +1,63 @@
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from backend import config
+
+config.SUPABASE_FAKE = True  # in-memory client, no Supabase project needed
+
+from backend.supabase_client import supabase
+from backend.utils import response_cache, vector_store
+from backend.utils.dashboard_stats import apply_delta, empty_stats
+from backend.utils.doc_frequency import get_df_table
+from backend.utils.feature_loaders import df_seed_loader, duplicate_loader, index_loader, sync_features
+from backend.utils.near_duplicates import get_duplicate_index, minhash_signature
+from backend.utils.nlp_similarity import hash_features
+from backend.utils.resume_index import get_index
+
+print("\n=========== CROSS-WORKER FEATURE SYNC TEST ===========\n")
+
+vector_store.STORE_ROOT = Path(tempfile.mkdtemp(prefix="hirelens_vectors_"))
+HR = "sync@x.com"
+TEXTS = [
+    "Data analyst with python, sql and power bi dashboards for retail sales reporting and forecasting",
+    "Backend engineer building kubernetes and terraform pipelines on aws with go and postgres",
+    "Machine learning engineer, python, deep learning, nlp, pytorch and model deployment at scale",
+]
+
+
+def store(text: str, created_at: datetime, save: bool = True):
+    """What the worker handling an upload does: insert, save the vector, bump the stats."""
+    row = supabase.table("resumes").insert({
+        "hr_id": HR, "status": "Selected", "extracted_text": text, "duplicate_of": None,
+        "created_at": created_at.isoformat(),
+    }).execute().data[0]
+    if save:
+        vector_store.save_vector(HR, row["id"], hash_features(text), minhash=minhash_signature(text))
+    delta = empty_stats()
+    delta["total"] = 1
+    apply_delta(HR, delta)
+    return row["id"]
+
+
+for text in TEXTS[:2]:
+    store(text, datetime.utcnow() - timedelta(days=1))
+
+# This worker loads its structures
+sync_features(HR)
+dup_index = get_duplicate_index(HR, loader=duplicate_loader(HR))
+index = get_index(HR, loader=index_loader(HR))
+df = get_df_table(HR, loader=df_seed_loader(HR))
+print("Loaded:", len(dup_index), len(index), df.n_docs)
+
+# Another worker stores a resume (and a copy of an old one, vector not saved yet)
+store(TEXTS[2], datetime.utcnow())
+store(TEXTS[0] + " ", datetime.utcnow(), save=False)
+response_cache._shared_versions.clear()  # as if DATA_VERSION_TTL had passed
+
+print("Caught up:", sync_features(HR))
+print("Sizes after catch-up:", len(dup_index), len(index), df.n_docs)
+print("Copy of an old resume found:", dup_index.find_duplicate(minhash_signature(TEXTS[0])) is not None)
+q = hash_features("machine learning engineer nlp pytorch")
+print("New resume searchable:", index.search(q.indices, q.data, k=1)[0][0])
+print("Nothing new on the next call:", sync_features(HR))
@@ -0,0 +1,30 @@
+from backend.utils.nlp_similarity import jd_resume_similarity, hash_features
+from backend.utils.doc_frequency import observe_document
+
+jd = "Looking for a team player responsible for kubernetes and terraform deployments"
+resume = "Responsible team member, worked in a team, responsible for reporting and team meetings"
+resume_k8s = "Ran kubernetes clusters and terraform pipelines for deployments"
+
+corpus = [
+    "Responsible for managing a team of analysts",
+    "Team lead responsible for quarterly reporting",
+    "Worked with the team on customer support and reporting",
+    "Responsible for team onboarding and documentation",
+    "Data analyst in a cross functional team using excel",
+    "Team player responsible for sales reporting",
+    "Managed a team responsible for payroll",
+    "Responsible for building team dashboards in power bi",
+    "Supported the team with sql reporting",
+    "Responsible for vendor management across the team",
+]
+
+print("\n=========== JD SIMILARITY TEST ===========\n")
+
+print("Without IDF (boilerplate):", jd_resume_similarity(jd, resume))
+print("Without IDF (kubernetes):  ", jd_resume_similarity(jd, resume_k8s))
+
+for doc in corpus:
+    observe_document("demo-hr", hash_features(doc).indices)
+
+print("With IDF (boilerplate):   ", jd_resume_similarity(jd, resume, hr_id="demo-hr"))
+print("With IDF (kubernetes):    ", jd_resume_similarity(jd, resume_k8s, hr_id="demo-hr"))
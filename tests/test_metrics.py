@@ -0,0 +1,31 @@
+import os
+import tempfile
+
+from backend.utils import metrics
+
+print("\n=========== METRICS TEST ===========\n")
+
+for _ in range(3):
+    with metrics.stage("unit_stage"):
+        pass
+try:
+    with metrics.stage("unit_failing"):
+        raise ValueError("boom")
+except ValueError:
+    pass
+
+text = metrics.render()
+print('Stage count recorded:', 'hirelens_stage_seconds_count{stage="unit_stage"} 3' in text)
+print('Failure counted:', 'hirelens_stage_failures_total{stage="unit_failing"} 1' in text)
+print('Buckets cumulative:', 'hirelens_stage_seconds_bucket{stage="unit_stage",le="+Inf"} 3' in text)
+
+# Two workers' snapshots (one exited) are summed into one exposition
+with tempfile.TemporaryDirectory() as root:
+    metrics.enable_multiprocess(root)
+    metrics.flush()
+    other = metrics.collect()
+    metrics._write_json(os.path.join(root, "999999.json"), other)
+    metrics.retire(999999)
+    merged = metrics.render()
+    print('Counters summed across workers:', 'hirelens_stage_seconds_count{stage="unit_stage"} 6' in merged)
+    metrics._multiprocess_dir = None
@@ -0,0 +1,42 @@
+from backend.utils.near_duplicates import DuplicateIndex, minhash_signature, estimated_similarity
+
+original = """
+Jyoti Gola - Data Analyst
+Experienced data analyst with 5 years of experience in Python, SQL, Excel and Power BI.
+Built reporting dashboards for sales and finance teams, automated weekly KPI reports,
+and migrated legacy spreadsheets into a PostgreSQL warehouse.
+
+Experience
+Senior Data Analyst, Acme Retail (Jan 2021 - Present)
+- Owned the weekly revenue dashboard used by regional managers
+- Wrote SQL models for churn, basket size and promotion uplift
+- Trained two junior analysts on Power BI and data modelling
+Data Analyst, Northwind Finance (Jun 2018 - Dec 2020)
+- Automated month-end reconciliation in Python, saving two days per close
+- Built Excel and Power BI reports for the CFO office
+
+Education
+B.Sc. Statistics, Delhi University
+"""
+
+# Same resume re-exported with small edits and different punctuation
+edited = original.replace("5 years", "five years").replace(" - ", " | ") + "\nLinkedIn: linkedin.com/in/jyoti"
+
+different = """
+Backend engineer with experience in Go, Kubernetes and Terraform.
+Designed event-driven services and on-call runbooks for a payments platform.
+"""
+
+print("\n=========== NEAR DUPLICATE TEST ===========\n")
+
+sig_a = minhash_signature(original)
+sig_b = minhash_signature(edited)
+sig_c = minhash_signature(different)
+
+print("Original vs edited:   ", estimated_similarity(sig_a, sig_b))
+print("Original vs different:", estimated_similarity(sig_a, sig_c))
+
+index = DuplicateIndex()
+index.add("1", sig_a)
+print("Edited duplicate of:   ", index.find_duplicate(sig_b))
+print("Different duplicate of:", index.find_duplicate(sig_c))
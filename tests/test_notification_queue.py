@@ -0,0 +1,65 @@
+import smtplib
+
+import backend.utils.notification_queue as nq
+from backend.utils.notification_queue import (
+    SMTPConnectionPool, NotificationQueue, RateLimiter, build_message
+)
+
+print("\n=========== NOTIFICATION QUEUE TEST ===========\n")
+
+delivered = []
+connections = []
+
+
+class StandInSMTP:
+    """In-process SMTP stand-in: first connection drops after 3 messages,
+    and one recipient gets a temporary 451 on the first attempt."""
+
+    busy_seen = False
+
+    def __init__(self, host, port, timeout=None):
+        self.number = len(connections)
+        self.sent = 0
+        self.logins = 0
+        connections.append(self)
+
+    def starttls(self, context=None):
+        pass
+
+    def login(self, username, password):
+        self.logins += 1
+
+    def noop(self):
+        return (250, b"OK")
+
+    def send_message(self, msg):
+        if self.number == 0 and self.sent == 3:
+            raise smtplib.SMTPServerDisconnected("connection dropped")
+        if msg["To"] == "busy@example.com" and not StandInSMTP.busy_seen:
+            StandInSMTP.busy_seen = True
+            raise smtplib.SMTPResponseException(451, b"try again later")
+        self.sent += 1
+        delivered.append(msg["To"])
+
+    def quit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+pool = SMTPConnectionPool("localhost", 1025, False, "user", "pass", size=2, connect=StandInSMTP)
+queue = NotificationQueue(pool, workers=2, batch_size=10, limiter=RateLimiter(200), max_retries=3)
+nq.RETRY_BASE_SECONDS = 0.05  # keep backoff short for the test
+
+recipients = [f"candidate{i}@example.com" for i in range(20)] + ["busy@example.com"]
+outcomes = {}
+for to in recipients:
+    queue.enqueue(build_message(to, "Status update", "Hello"), on_done=lambda sent, to=to: outcomes.__setitem__(to, sent))
+
+print("Flushed:", queue.flush(timeout=10))
+print("All delivered once:", sorted(delivered) == sorted(recipients))
+print("Each reported sent once:", len(outcomes) == len(recipients) and all(outcomes.values()))
+print("Connections opened:", pool.opened)
+print("Logins per connection:", [c.logins for c in connections])
+print("Stats:", queue.stats())
@@ -0,0 +1,49 @@
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from backend import config
+
+config.SUPABASE_FAKE = True  # in-memory client, no Supabase project needed
+
+from backend.utils import response_cache
+from backend.utils.dashboard_stats import apply_delta, empty_stats
+
+print("\n=========== RESPONSE CACHE TEST ===========\n")
+
+app = FastAPI()
+builds = []
+
+
+@app.get("/summary")
+def summary(request: Request, hr_id: str):
+    def build():
+        builds.append(hr_id)
+        return {"total": response_cache.supabase.table("hr_stats").select("total").eq("hr_id", hr_id).execute().data}
+    return response_cache.cached_json(request, hr_id, build)
+
+
+client = TestClient(app)
+HR = "cache@x.com"
+
+first = client.get("/summary", params={"hr_id": HR})
+etag = first.headers["etag"]
+print("First:", first.status_code, first.json())
+
+again = client.get("/summary", params={"hr_id": HR}, headers={"If-None-Match": etag})
+print("Revalidated without rebuilding:", again.status_code == 304 and len(builds) == 1)
+
+# The ETag depends on the body only, so another worker (empty cache, its
+# own version counter) hands out the same one
+response_cache._CACHE = response_cache.ResponseCache(100, 1 << 20)
+response_cache.bump_version(HR)
+other = client.get("/summary", params={"hr_id": HR})
+print("Same ETag after rebuild:", other.headers["etag"] == etag)
+
+# An upload changes the stats and bumps the version: the old ETag is stale
+delta = empty_stats()
+delta["total"] = 2
+apply_delta(HR, delta)
+response_cache.bump_version(HR)
+after = client.get("/summary", params={"hr_id": HR}, headers={"If-None-Match": etag})
+print("After upload:", after.status_code, after.json(), "new ETag:", after.headers["etag"] != etag)
+print("Cache stats:", response_cache.cache_stats())
@@ -0,0 +1,22 @@
+from backend.utils.nlp_similarity import hash_features
+from backend.utils.resume_index import InvertedIndex
+
+resumes = {
+    "r1": "Data analyst with python, sql and power bi dashboards",
+    "r2": "Backend engineer building kubernetes and terraform pipelines",
+    "r3": "Machine learning engineer, python, deep learning, nlp",
+    "r4": "Sales executive handling key accounts and reporting",
+}
+
+jd = "Hiring a machine learning engineer with python and nlp experience"
+
+print("\n=========== RESUME INDEX SEARCH TEST ===========\n")
+
+index = InvertedIndex()
+for resume_id, text in resumes.items():
+    vec = hash_features(text)
+    index.add(resume_id, vec.indices, vec.data)
+
+q = hash_features(jd)
+for resume_id, score in index.search(q.indices, q.data, k=3):
+    print(f"{resume_id}: {round(score * 100, 2)}")
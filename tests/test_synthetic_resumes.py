@@ -0,0 +1,33 @@
+import hashlib
+import os
+import tempfile
+
+from backend.utils.experience_extractor import extract_experience
+from backend.utils.extract_text import extract_text
+from backend.utils.skill_matcher import calculate_skill_score
+from tests.synthetic_resumes import build_zips, generate_corpus
+
+print("\n=========== SYNTHETIC RESUME CORPUS TEST ===========\n")
+
+mix = {"txt": 1, "pdf": 1, "docx": 1}
+
+
+def digests(folder):
+    return {
+        name: hashlib.sha256(open(os.path.join(folder, name), "rb").read()).hexdigest()
+        for name in sorted(os.listdir(folder))
+    }
+
+
+with tempfile.TemporaryDirectory() as first, tempfile.TemporaryDirectory() as second:
+    manifest = generate_corpus(first, 9, seed=3, mix=mix)
+    generate_corpus(second, 9, seed=3, mix=mix)
+    build_zips(first, manifest, 5)
+    build_zips(second, manifest, 5)
+    print("Same seed, identical files:", digests(first) == digests(second))
+
+    for entry in manifest:
+        text = extract_text(os.path.join(first, entry["file"]))
+        skills = calculate_skill_score(text, entry["skills"])
+        print(f"{entry['format']:<5} {entry['file']:<32} chars={len(text):<5} "
+              f"experience={extract_experience(text)} skills={skills['score']}%")